@@ -29,8 +29,20 @@ import async_cleverbot as ac
 from discord.ext import commands
 from db.cache import LoadCache, CacheManager
 from utils import i18n
+from utils.timers import TimerScheduler
+from utils.caches import LRUCache, EditTracker, SnipeStore, MutualGuilds
+from utils.prefixes import PrefixResolver
+from utils.logqueue import LogDelivery
+from utils.auditlogs import AuditLogPoller
+from utils.templates import WelcomeTemplates
+from utils.guildsettings import GuildSettings
+from utils.guildconfig import GuildConfig, GuildConfigs
+from utils.cachekeys import migrate_keys
+from utils.warmup import CacheWarmup
+from utils.criticalcache import CriticalCache
+from utils.snapshot import CacheSnapshot, CacheShadow
+from utils.buffers import StatusBuffer, NicknameBuffer, CommandUsage
 from cogs.music import Player
-from collections import Counter
 
 if sys.version_info < (3, 5):
     raise Exception('Your python is outdated. Please update to at least 3.5')
@@ -46,8 +58,9 @@ async def run():
     if not hasattr(bot, 'uptime'):
         bot.uptime = datetime.datetime.now()
     try:
-        await LoadCache.start(bot)
         bot.session = aiohttp.ClientSession(loop=bot.loop)
+        bot.warmup.start()
+        bot.timers.start(bot.loop)
         # await bot.start(config.DISCORD_TOKEN)
         await bot.start(config.MAIN_TOKEN)
     except KeyboardInterrupt:
@@ -56,18 +69,7 @@ async def run():
 
 
 async def get_prefix(bot, message):
-    if message.guild:
-        prefix = bot.prefix[message.guild.id]
-    elif not message.guild:
-        prefix = '!'
-    custom_prefix = [prefix]
-    if await bot.is_booster(message.author):
-        boosters_prefix = CacheManager.get(bot, 'boosters', message.author.id) or 'dredd '
-        custom_prefix.append(boosters_prefix)
-    if await bot.is_admin(message.author):
-        custom_prefix.append('d ')
-
-    return commands.when_mentioned_or(*custom_prefix)(bot, message)
+    return await bot.prefixes.resolve(message)
 
 
 class EditingContext(commands.Context):
@@ -77,11 +79,7 @@ class EditingContext(commands.Context):
     async def send(self, content=None, *, tts=False, embed=None, file=None, files=None, delete_after=None, nonce=None, allowed_mentions=discord.AllowedMentions(users=False, roles=False, everyone=False, replied_user=True)):
         if file or files:
             return await super().send(content=content, tts=tts, embed=embed, file=file, files=files, delete_after=delete_after, nonce=nonce, allowed_mentions=allowed_mentions)
-        reply = None
-        try:
-            reply = self.bot.cmd_edits[self.message.id]
-        except KeyError:
-            pass
+        reply = self.bot.cmd_edits.get(self.message.id)
         if reply:
             return await reply.edit(content=content, embed=embed, delete_after=delete_after, allowed_mentions=allowed_mentions)
         reference = self.message.reference
@@ -126,6 +124,7 @@ class Bot(commands.AutoShardedBot):
         )
 
         self.config = config
+        self.timers = TimerScheduler()  # created before the extensions as the cogs register their handlers on load, started in run()
 
         for extension in config.EXTENSIONS:
             try:
@@ -135,9 +134,7 @@ class Bot(commands.AutoShardedBot):
                 print(f'[WARNING] Could not load extension {extension}: {e}')
 
         self.db = kwargs.pop("db")
-        self.cmdUsage = {}
-        self.cmdUsers = {}
-        self.guildUsage = {}
+        self.command_usage = CommandUsage(self)
         self.process = psutil.Process()
 
         self.support = 'https://discord.gg/f3MaASW'
@@ -151,14 +148,29 @@ class Bot(commands.AutoShardedBot):
         self.bot_lists = {'dbots': "[Discord Bot Labs](https://dbots.cc/dredd 'bots.discordlabs.org')", 'dboats': "[Discord Boats](https://discord.boats/bot/667117267405766696/vote 'discord.boats')",
                           'dbl': "[Discord Bot list](https://discord.ly/dredd/upvote 'discordbotlist.com')", 'shitgg': "[Top.GG](https://top.gg/bot/667117267405766696/vote 'top.gg')"}
         self.cleverbot = ac.Cleverbot(config.CB_TOKEN)
-        self.join_counter = Counter()  # counter for anti raid so the bot would ban the user if they try to join more than 5 times in short time span
 
         self.cache = CacheManager
-        self.cmd_edits = {}
+        self.prefixes = PrefixResolver(self)
+        self.cmd_edits = EditTracker(maxsize=1000, max_age=300)
+        self.parsed_contexts = LRUCache(maxsize=1000)  # (message id, content): context, shared by every on_message/on_message_edit listener
         self.dm = {}
         self.dms = {}  # cache for checks if user was already informed about dm logging
         self.updates = {}
-        self.snipes = {}
+        self.snipes = SnipeStore(per_channel=10, max_channels=5000)
+        self.mutuals = MutualGuilds()  # user id: ids of the guilds they share with the bot
+        self.status_buffer = StatusBuffer(self)
+        self.nickname_buffer = NicknameBuffer(self, interval=30)
+        self.log_delivery = LogDelivery(self)
+        self.audit_logs = AuditLogPoller(self)
+        self.welcome_templates = WelcomeTemplates(self)
+        self.guild_settings = GuildSettings(self)
+        self.snapshot = CacheSnapshot(self, getattr(config, 'CACHE_SNAPSHOT', None), max_age=getattr(config, 'CACHE_SNAPSHOT_MAX_AGE', 3600))
+        self.warmup = CacheWarmup(self)
+        self.critical_cache = CriticalCache(self)
+        self.critical_cache.add_loaders(self.warmup, 0)  # commands can be used once these are loaded
+        self.warmup.add(1, 'cache', self.load_cache)
+        self.warmup.add(2, 'guild_settings', self.guild_settings.load)
+        self.before_invoke(self.wait_for_cache)
         self.sr_api = sr_api.Client()
 
         self.guilds_data = {}
@@ -177,37 +189,14 @@ class Bot(commands.AutoShardedBot):
         self.blacklist = {}
         self.check_duration = {}
 
-        # guilds / moderation
-        self.prefix = {}
-        self.moderation = {}
-        self.memberlog = {}
-        self.joinlog = {}
-        self.leavelog = {}
-        self.guildlog = {}
-        self.joinrole = {}
-        self.joinmessage = {}
-        self.leavemessage = {}
-        self.messageedits = {}
-        self.messagedeletes = {}
-        self.antihoist = {}
-        self.automod = {}
-        self.massmention = {}
-        self.masscaps = {}
-        self.invites = {}
-        self.links = {}
-        self.spam = {}
-        self.modlog = {}
-        self.raidmode = {}
+        # guilds / moderation, every per guild setting is a field of the guild's GuildConfig
+        self.guild_configs = GuildConfigs()
+        for name in GuildConfig.__slots__:
+            setattr(self, name, self.guild_configs.field(name))
         self.temp_bans = {}
         self.temp_mutes = {}
-        self.mute_role = {}
-        self.mod_role = {}
-        self.admin_role = {}
-        self.channels_whitelist = {}
-        self.roles_whitelist = {}
         self.guild_disabled = {}
         self.cog_disabled = {}
-        self.case_num = {}
         self.rr = {}
 
         # other
@@ -217,13 +206,76 @@ class Bot(commands.AutoShardedBot):
         self.nicks_op = {}
         self.badges = {}
         self.disabled_commands = {}
-        self.translations = {}
         self.reminders = {}
 
     def get(self, k, default=None):
         return super().get(k.lower(), default)
 
+    async def load_cache(self):
+        snapshot = self.snapshot.read()
+        if snapshot is None:
+            await LoadCache.start(self)
+            migrate_keys(self)
+        else:
+            self.snapshot.restore(snapshot.state)
+            print(f"[SNAPSHOT] Restored the cache from a {'clean' if snapshot.clean else 'unclean'} snapshot taken {snapshot.age:.0f}s ago")
+            # even a clean snapshot misses whatever was changed in the database while the bot was down
+            self.snapshot.stale = True
+            self.loop.create_task(self.reload_cache())
+        self.snapshot.start()
+
+    async def reloadall(self):
+        """ Reloads the whole cache in place, use this instead of LoadCache.reloadall """
+        cache = await LoadCache.reloadall(self)
+        migrate_keys(self)
+        await self.guild_settings.load()  # the old logging tables aren't written to anymore
+        self.dispatch('cache_ready')
+        return cache
+
+    async def reload_cache(self):
+        """ Loads the cache from the database while the bot runs on the snapshot, then swaps it in """
+        await self.warmup.wait()
+        delay = 1
+        while True:
+            base, shadow = self.snapshot.copy(), CacheShadow(self)
+            try:
+                await LoadCache.start(shadow)
+                migrate_keys(shadow)
+                self.guild_settings.apply(await self.guild_settings.fetch(), shadow)
+            except Exception as e:
+                print(f"[SNAPSHOT] Couldn't load the cache from the database, still running on the snapshot, retrying in {delay}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 600)
+                continue
+            break
+        # nothing is awaited from here on, the bot never sees a half swapped cache and no command
+        # changes it in between, the changes made while the shadow loaded are carried over
+        self.snapshot.restore(self.snapshot.merge(base, self.snapshot.capture(shadow)))
+        self.snapshot.stale = False
+        self.dispatch('cache_ready')
+        print("[SNAPSHOT] Replaced the restored snapshot with the cache from the database")
+
+    async def on_cache_ready(self):
+        # prefixes and rank prefixes resolved during the warm-up or before a reload are out of date
+        self.prefixes.invalidate()
+        self.prefixes.invalidate_ranks()
+
+    async def wait_for_cache(self, ctx):
+        # commands of categories that only read the critical caches don't wait for the rest
+        if getattr(ctx.cog, 'needs_cache', True) and not self.warmup.is_ready():
+            await self.warmup.wait()
+
+    async def wait_until_ready(self):
+        await super().wait_until_ready()
+        await self.warmup.wait()
+
     async def close(self):
+        self.timers.cancel()
+        await self.log_delivery.close()
+        await self.status_buffer.close()
+        await self.nickname_buffer.close()
+        await self.command_usage.close()
+        await self.snapshot.close()
         await self.session.close()
         await super().close()
 
@@ -243,15 +295,30 @@ class Bot(commands.AutoShardedBot):
     async def is_blacklisted(self, user):
         return CacheManager.get(self, 'blacklist', user.id)
 
+    async def get_cached_context(self, message):
+        # the cached context is shared and only meant to be inspected, invoking it would mutate it for everyone else
+        key = (message.id, message.content)
+        parsing = self.parsed_contexts.get(key)
+        if parsing is None:
+            parsing = self.loop.create_task(self.get_context(message, cls=EditingContext))
+            self.parsed_contexts[key] = parsing
+        try:
+            return await asyncio.shield(parsing)
+        except Exception:
+            self.parsed_contexts.pop(key, None)
+            raise
+
     async def on_message(self, message):
         if message.author.bot:
             return
+        if not self.warmup.is_ready(*CriticalCache.NAMES):  # commands need the blacklist, prefixes and settings
+            await self.warmup.wait(*CriticalCache.NAMES)
         try:
-            ctx = await self.get_context(message, cls=EditingContext)
+            ctx = await self.get_cached_context(message)
             if message.guild:
                 i18n.current_locale.set(self.translations.get(message.guild.id, 'en_US'))
             if ctx.valid:
-                await self.invoke(ctx)
+                await self.invoke(await self.get_context(message, cls=EditingContext))
         except Exception as e:
             print(e)
             return
@@ -262,15 +329,24 @@ class Bot(commands.AutoShardedBot):
             return
 
         if after.content != before.content:
+            if not self.warmup.is_ready(*CriticalCache.NAMES):
+                await self.warmup.wait(*CriticalCache.NAMES)
             try:
-                ctx = await self.get_context(after, cls=EditingContext)
+                ctx = await self.get_cached_context(after)
                 if after.guild:
                     i18n.current_locale.set(self.translations.get(after.guild.id, 'en_US'))
                 if ctx.valid:
-                    await self.invoke(ctx)
+                    await self.invoke(await self.get_context(after, cls=EditingContext))
             except discord.NotFound:
                 return
 
+    async def on_raw_message_delete(self, payload):
+        self.cmd_edits.discard(payload.message_id)
+
+    async def on_raw_bulk_message_delete(self, payload):
+        for message_id in payload.message_ids:
+            self.cmd_edits.discard(message_id)
+
     @property
     def music_player(self):
         return Player
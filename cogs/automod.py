@@ -545,6 +545,7 @@ class Automod(commands.Cog, name='Automoderation'):
         if not check:
             await self.bot.db.execute("INSERT INTO whitelist(guild_id, type, _id) VALUES($1, $2, $3)", ctx.guild.id, 1, channel.id)
             self.bot.channels_whitelist[ctx.guild.id] = [channel.id]
+            self.bot.dispatch('automod_whitelist_update', ctx.guild)
             await ctx.send(_("{0} Added {1} to the channels whitelist.").format(self.bot.settings['emojis']['misc']['white-mark'], channel.mention))
         elif check:
             if channel.id in check:
@@ -552,6 +553,7 @@ class Automod(commands.Cog, name='Automoderation'):
 
             await self.bot.db.execute("INSERT INTO whitelist(guild_id, type, _id) VALUES($1, $2, $3)", ctx.guild.id, 1, channel.id)
             self.bot.channels_whitelist[ctx.guild.id].append(channel.id)
+            self.bot.dispatch('automod_whitelist_update', ctx.guild)
             await ctx.send(_("{0} Added {1} to the channels whitelist.").format(self.bot.settings['emojis']['misc']['white-mark'], channel.mention))
 
     @whitelist.command(name='add-role', aliases=['addrole', 'arole', 'roleadd'])
@@ -569,13 +571,15 @@ class Automod(commands.Cog, name='Automoderation'):
         if not check:
             await self.bot.db.execute("INSERT INTO whitelist(guild_id, type, _id) VALUES($1, $2, $3)", ctx.guild.id, 2, role.id)
             self.bot.roles_whitelist[ctx.guild.id] = [role.id]
+            self.bot.dispatch('automod_whitelist_update', ctx.guild)
             await ctx.send(_("{0} Added {1} to the roles whitelist.").format(self.bot.settings['emojis']['misc']['white-mark'], role.mention))
         elif check:
             if role.id in check:
                 raise commands.BadArgument(_("Role **{0}** is already added to the whitelist.").format(role))
 
             await self.bot.db.execute("INSERT INTO whitelist(guild_id, type, _id) VALUES($1, $2, $3)", ctx.guild.id, 2, role.id)
-            self.bot.roles_whitelist[ctx.guild.id].append(channel.id)
+            self.bot.roles_whitelist[ctx.guild.id].append(role.id)
+            self.bot.dispatch('automod_whitelist_update', ctx.guild)
             await ctx.send(_("{0} Added {1} to the roles whitelist.").format(self.bot.settings['emojis']['misc']['white-mark'], role.mention))
 
 
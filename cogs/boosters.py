@@ -23,6 +23,7 @@ class Boosters(commands.Cog, aliases=['Donators']):
     def __init__(self, bot):
         self.bot = bot
         self.help_icon = '<:n_:747399776231882812>'
+        self.needs_cache = False  # only reads the critical caches, commands don't wait for the full warm-up
         self.big_icon = 'https://cdn.discordapp.com/emojis/747399776231882812.png?v=1'
 
     @commands.command(brief='Set your own custom prefix')
@@ -36,6 +37,7 @@ class Boosters(commands.Cog, aliases=['Donators']):
 
         await self.bot.db.execute("UPDATE boosters SET prefix = $1 WHERE user_id = $2", prefix, ctx.author.id)
         self.bot.boosters[ctx.author.id] = prefix
+        self.bot.prefixes.invalidate_ranks()
         await ctx.send(f"{self.bot.settings['emojis']['misc']['white-mark']} Set your custom prefix to `{prefix}`.")
 
     @commands.group(brief='Manage your social medias', name='social-media', aliases=['socmedias', 'media', 'socialmedia', 'socialmedias', 'social'], invoke_without_command=True)
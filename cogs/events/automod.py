@@ -15,19 +15,244 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import discord
 import re
+import time
+import string
 import asyncio
 
 from discord.ext import commands
 from datetime import datetime, timezone, timedelta
 from db.cache import CacheManager as cm
 from contextlib import suppress
+from collections import OrderedDict
 
 from utils.checks import CooldownByContent
+from utils.caches import LRUCache
 from utils import default, btime
+from utils.warmup import needs_cache
 
 INVITE = re.compile(r'discord(?:\.com/invite|app\.com/invite|\.gg)/?([a-zA-Z0-9\-]{2,32})')
-CAPS = re.compile(r"[ABCDEFGHIJKLMNOPQRSTUVWXYZ]")
 LINKS = re.compile(r"http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*(),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+")
+# links and invites in one pass, invites inside of links are picked up from the link span
+SCANNER = re.compile(rf"(?P<link>{LINKS.pattern})|discord(?:\.com/invite|app\.com/invite|\.gg)/?(?P<invite>[a-zA-Z0-9\-]{{2,32}})")
+UPPERCASE = str.maketrans('', '', string.ascii_uppercase)
+
+
+class MessageFeatures:
+    """Everything the automod rules need to know about a message, computed once per message."""
+
+    __slots__ = ('config', 'automod', 'current', 'length', 'uppercase', 'links', 'invites', 'mentions')
+
+    def __init__(self, message, config):
+        content = message.content
+        self.config = config  # the guild's GuildConfig
+        self.automod = config.automod
+        self.current = message.created_at.replace(tzinfo=timezone.utc).timestamp()
+        self.length = len(content)
+        self.uppercase = self.length - len(content.translate(UPPERCASE))
+        self.mentions = len(message.mentions)
+        self.links, self.invites = [], []
+        for match in SCANNER.finditer(content):
+            if match.lastgroup == 'link':
+                start, end = match.span()
+                self.links.append((start, end))
+                self.invites.extend(INVITE.findall(content, start, end))
+            else:
+                self.invites.append(match.group('invite'))
+
+    @property
+    def uppercase_ratio(self):
+        return self.uppercase / self.length if self.length else 0.0
+
+
+class InviteResolver:
+    """Resolves invite codes to guild ids without hitting the API for every message.
+
+    Resolved codes are cached for ``ttl`` seconds and invalid ones for ``negative_ttl``,
+    concurrent lookups for the same code share one request and every guild can only
+    make ``rate`` lookups per ``per`` seconds. ``None`` is returned when the code is
+    invalid and ``UNRESOLVED`` when it couldn't be looked up, callers should treat the
+    latter as an invite to another guild.
+    """
+
+    UNRESOLVED = object()
+
+    def __init__(self, bot, *, ttl=3600, negative_ttl=600, rate=2, per=1.0, maxsize=10000):
+        self.bot = bot
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._cache = LRUCache(maxsize=maxsize)  # code: (expires, guild id)
+        self._pending = {}  # code: lookup task
+        self._limits = commands.CooldownMapping.from_cooldown(rate, per, commands.BucketType.guild)
+
+    async def resolve(self, code, message):
+        cached = self._cache.get(code)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        lookup = self._pending.get(code)
+        if lookup is None:
+            if self._limits.get_bucket(message).update_rate_limit():
+                return self.UNRESOLVED
+            lookup = self._pending[code] = self.bot.loop.create_task(self.fetch(code))
+        return await asyncio.shield(lookup)
+
+    async def fetch(self, code):
+        try:
+            invite = await self.bot.fetch_invite(code, with_counts=False)
+        except discord.NotFound:
+            self._cache[code] = (time.monotonic() + self.negative_ttl, None)
+            return None
+        except discord.HTTPException:
+            return self.UNRESOLVED
+        finally:
+            self._pending.pop(code, None)
+
+        guild_id = invite.guild.id if invite.guild else None
+        self._cache[code] = (time.monotonic() + (self.ttl if guild_id else self.negative_ttl), guild_id)
+        return guild_id
+
+
+class GuildExemptions:
+    """Precomputed parts of the automod exemption checks for a guild.
+
+    Dropped whenever the whitelists, the roles or the bot's own roles change and
+    rebuilt on the next message.
+    """
+
+    __slots__ = ('channels', 'roles', 'can_act')
+
+    def __init__(self, bot, guild):
+        self.channels = frozenset(cm.get(bot, 'channels_whitelist', guild.id) or ())
+        self.roles = frozenset(cm.get(bot, 'roles_whitelist', guild.id) or ())
+        permissions = guild.me.guild_permissions
+        self.can_act = permissions.manage_roles and permissions.kick_members and permissions.ban_members
+
+
+class JoinRate:
+    """Join rate of a guild over the last ``window`` seconds.
+
+    Joins are counted in one bucket per second of a ring buffer, a bucket is reset
+    when it gets reused for a newer second, so recording a join and reading the
+    rate costs the same no matter how many members joined. Rejoins are counted per
+    member and forgotten ``rejoin_ttl`` seconds after their last join.
+    """
+
+    __slots__ = ('window', 'rejoin_ttl', 'buckets', 'seconds', 'rejoins')
+
+    def __init__(self, window=10, rejoin_ttl=60):
+        self.window = window
+        self.rejoin_ttl = rejoin_ttl
+        self.buckets = [0] * window
+        self.seconds = [0] * window  # which second each bucket is counting
+        self.rejoins = OrderedDict()  # member id: (joins, expires), oldest first
+
+    def hit(self, member_id, now=None):
+        """Records a join and returns how many times the member joined recently."""
+        now = now or time.monotonic()
+        second = int(now)
+        slot = second % self.window
+        if self.seconds[slot] != second:
+            self.seconds[slot] = second
+            self.buckets[slot] = 0
+        self.buckets[slot] += 1
+
+        while self.rejoins:
+            oldest, (joins, expires) = next(iter(self.rejoins.items()))
+            if expires > now:
+                break
+            del self.rejoins[oldest]
+
+        joins, expires = self.rejoins.pop(member_id, (0, 0))
+        joins = joins + 1 if expires > now else 1
+        self.rejoins[member_id] = (joins, now + self.rejoin_ttl)
+        return joins
+
+    def forget(self, member_id):
+        self.rejoins.pop(member_id, None)
+
+    def rate(self, now=None):
+        """Average joins per second over the window."""
+        second = int(now or time.monotonic())
+        joins = sum(count for count, when in zip(self.buckets, self.seconds) if second - when < self.window)
+        return joins / self.window
+
+
+class RaidQueue:
+    """Raid mode punishments of a guild, executed in batches.
+
+    Punishments are collected for ``delay`` seconds and then executed with at most
+    ``concurrency`` requests in flight, discord.py waits out the rate limits of the
+    requests themselves. Members are not sent a DM when a batch is bigger than
+    ``dm_limit`` and every batch is logged with a single embed.
+    """
+
+    def __init__(self, cog, guild_id, *, delay=2.0, concurrency=5, dm_limit=10):
+        self.cog = cog
+        self.bot = cog.bot
+        self.guild_id = guild_id
+        self.delay = delay
+        self.dm_limit = dm_limit
+        self._limiter = asyncio.Semaphore(concurrency)
+        self._pending = {}  # member id: (action, member, reason)
+        self._task = None
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, action, member, reason):
+        self._pending[member.id] = (action, member, reason)
+        if self._task is None:
+            self._task = self.bot.loop.create_task(self.run())
+
+    async def run(self):
+        try:
+            while self._pending:
+                await asyncio.sleep(self.delay)
+                batch, self._pending = list(self._pending.values()), {}
+                await self.execute(batch)
+        finally:
+            self._task = None
+
+    async def punish(self, action, member, reason, dm):
+        audit_reason = _("Automod Action | {0}").format(reason)
+        async with self._limiter:
+            if action in [6, 8]:
+                await member.guild.kick(member, reason=audit_reason)
+            else:
+                await member.guild.ban(member, reason=audit_reason)
+
+        if dm:
+            if action == 6:
+                msg = _("{0} {1} has anti raid mode activated, please try joining again later.")
+            elif action == 8:
+                msg = _("{0} {1} has strict anti raid mode activated, please try joining again later.")
+            else:
+                msg = _("{0} {1} has anti raid mode activated, you're not allowed to join that server.")
+            with suppress(Exception):
+                await member.send(msg.format(self.bot.settings['emojis']['misc']['warn'], member.guild))
+
+    async def execute(self, batch):
+        guild = self.bot.get_guild(self.guild_id)
+        if not guild:
+            return
+
+        raidmode = cm.get(self.bot, 'raidmode', guild.id)
+        dm = raidmode and raidmode['dm'] and len(batch) <= self.dm_limit
+        results = await asyncio.gather(*(self.punish(action, member, reason, dm) for action, member, reason in batch), return_exceptions=True)
+        done = [entry for entry, result in zip(batch, results) if not isinstance(result, Exception)]
+        errors = [result for result in results if isinstance(result, Exception)]
+
+        try:
+            if errors:
+                log_channel = guild.get_channel(raidmode['channel']) if raidmode else None
+                await default.background_error(self.cog, f'`automod punishment execution (raidmode, {len(errors)} failed)`', errors[0], guild, log_channel)
+
+            automod = cm.get(self.bot, 'automod', guild.id)
+            logchannel = guild.get_channel(automod['channel']) if automod else None
+            if done and logchannel:
+                await logchannel.send(embed=self.cog.raid_embed(guild, done, len(errors)))
+        except Exception as e:
+            print(f'[RAIDMODE] Failed to log a batch in {guild.id}: {e}')
 
 
 class AutomodEvents(commands.Cog, name='AutomodEvents'):
@@ -41,105 +266,160 @@ class AutomodEvents(commands.Cog, name='AutomodEvents'):
         self.link_cooldown = commands.CooldownMapping.from_cooldown(5, 60.0, commands.BucketType.member)
         self.caps_content = commands.CooldownMapping.from_cooldown(8, 10.0, commands.BucketType.member)  # checks for cpas
         self.mentions_limit = commands.CooldownMapping.from_cooldown(5, 17.0, commands.BucketType.member)
+        self.invites = InviteResolver(bot)
+        self._exemptions = {}  # guild id: GuildExemptions
+        self._join_rates = {}  # guild id: JoinRate
+        self._raid_queues = {}  # guild id: RaidQueue
+        # joins per second that turn raid mode on by themselves, 0 disables it
+        self.auto_raidmode_rate = getattr(bot.config, 'AUTO_RAIDMODE_RATE', 0)
 
     def new_member(self, member):
         now = datetime.utcnow()
         month = now - timedelta(days=30)
         return member.created_at.replace(tzinfo=timezone.utc) > month.astimezone(timezone.utc)
 
+    def exemptions(self, guild):
+        index = self._exemptions.get(guild.id)
+        if index is None:
+            index = self._exemptions[guild.id] = GuildExemptions(self.bot, guild)
+        return index
+
+    def join_rate(self, guild):
+        engine = self._join_rates.get(guild.id)
+        if engine is None:
+            engine = self._join_rates[guild.id] = JoinRate()
+        return engine
+
+    def raid_queue(self, guild):
+        queue = self._raid_queues.get(guild.id)
+        if queue is None:
+            queue = self._raid_queues[guild.id] = RaidQueue(self, guild.id)
+        return queue
+
+    def is_exempt(self, message, automod):
+        exemptions = self.exemptions(message.guild)
+        if message.channel.id in exemptions.channels:
+            return True
+
+        if not exemptions.can_act:  # missing manage roles, kick or ban members permissions
+            return True
+
+        if message.guild.get_member(message.author.id) is None:  # They were banned but messages are still being sent cause discord
+            return True
+
+        permissions = message.author.guild_permissions
+        if permissions.manage_messages and automod['ignore_admins']:  # Member has MANAGE_MESSAGES permissions and bot is configured to ignore admins/mods
+            return True
+
+        if permissions.administrator:  # Will still ignore admins
+            return True
+
+        if exemptions.roles and not exemptions.roles.isdisjoint(role.id for role in message.author.roles):
+            return True
+
+        return False
+
     # if they send a message
     @commands.Cog.listener('on_message')
+    @needs_cache('cache')
     async def on_automod(self, message):
         if not message.guild:
             return
 
-        automod = cm.get(self.bot, 'automod', message.guild.id)
+        config = self.bot.guild_configs.get(message.guild.id)
+        automod = getattr(config, 'automod', None)
         if not automod:
             return
 
         if message.author.bot:  # author is a bot
             return
 
-        if message.author not in message.guild.members:  # They were banned but messages are still being sent cause discord
-            return
-
-        if message.author.guild_permissions.manage_messages and automod['ignore_admins']:  # Member has MANAGE_MESSAGES permissions and bot is configured to ignore admins/mods
-            return
-
-        if message.author.guild_permissions.administrator:
-            return
-
-        if not message.guild.me.guild_permissions.manage_roles or not message.guild.me.guild_permissions.kick_members or not message.guild.me.guild_permissions.ban_members:
+        if self.is_exempt(message, automod):
             return
 
-        channel_whitelist = cm.get(self.bot, 'channels_whitelist', message.guild.id)
-        if channel_whitelist and message.channel.id in channel_whitelist:
-            return
-
-        role_whitelist = cm.get(self.bot, 'roles_whitelist', message.guild.id)
-        if role_whitelist:
-            for role in message.author.roles:
-                if role.id in role_whitelist:
-                    return
-
+        features = MessageFeatures(message, config)
         for coro in self.automodactions.copy():
-            if await coro(self, message):
+            if await coro(self, message, features):
                 break
 
     # if they edit existing message
     @commands.Cog.listener('on_message_edit')
+    @needs_cache('cache')
     async def on_automod_edit(self, before, after):
         message = after
         if not message.guild:
             return
 
-        automod = cm.get(self.bot, 'automod', message.guild.id)
-        if not automod or not message.guild:
+        config = self.bot.guild_configs.get(message.guild.id)
+        automod = getattr(config, 'automod', None)
+        if not automod:
             return
 
         if message.author.bot:  # author is a bot
             return
 
-        if message.author not in message.guild.members:  # They were banned but messages are still being sent cause discord
+        if not before.embeds and after.embeds:
             return
 
-        if message.author.guild_permissions.manage_messages and automod['ignore_admins']:  # Member has MANAGE_MESSAGES permissions and bot is configured to ignore admins/mods
+        if self.is_exempt(message, automod):
             return
 
-        if message.author.guild_permissions.administrator:  # Will still ignore admins
-            return
+        features = MessageFeatures(message, config)
+        for coro in self.automodactions.copy():
+            if await coro(self, message, features):
+                break
 
-        if not message.guild.me.guild_permissions.manage_roles or not message.guild.me.guild_permissions.kick_members or not message.guild.me.guild_permissions.ban_members:
-            return
+    # keeping the exemptions index up to date
+    @commands.Cog.listener('on_cache_ready')
+    async def exemptions_cache_ready(self):
+        self._exemptions.clear()  # built from whatever the whitelists were during the warm-up
 
-        if not before.embeds and after.embeds:
-            return
+    @commands.Cog.listener()
+    async def on_automod_whitelist_update(self, guild):
+        self._exemptions.pop(guild.id, None)
 
-        channel_whitelist = cm.get(self.bot, 'channels_whitelist', message.guild.id)
-        if channel_whitelist and message.channel.id in channel_whitelist:
-            return
+    @commands.Cog.listener('on_guild_role_update')
+    async def exemptions_role_update(self, before, after):
+        self._exemptions.pop(after.guild.id, None)
 
-        role_whitelist = cm.get(self.bot, 'roles_whitelist', message.guild.id)
-        if role_whitelist:
-            for role in message.author.roles:
-                if role.id in role_whitelist:
-                    return
+    @commands.Cog.listener('on_guild_role_delete')
+    async def exemptions_role_delete(self, role):
+        self._exemptions.pop(role.guild.id, None)
 
-        for coro in self.automodactions.copy():
-            if await coro(self, message):
-                break
+    @commands.Cog.listener('on_member_update')
+    async def exemptions_member_update(self, before, after):
+        if after.id == self.bot.user.id and before.roles != after.roles:
+            self._exemptions.pop(after.guild.id, None)
+
+    @commands.Cog.listener('on_guild_channel_delete')
+    async def exemptions_channel_delete(self, channel):
+        self._exemptions.pop(channel.guild.id, None)
+
+    @commands.Cog.listener('on_guild_remove')
+    async def exemptions_guild_remove(self, guild):
+        self._exemptions.pop(guild.id, None)
+        self._join_rates.pop(guild.id, None)
+        self._raid_queues.pop(guild.id, None)
 
     @commands.Cog.listener('on_member_join')
+    @needs_cache('cache')
     async def on_anti_raid(self, member):
         if not member.guild:
             return
 
         automod = cm.get(self.bot, 'automod', member.guild.id)
-        raidmode = cm.get(self.bot, 'raidmode', member.guild.id)
         if not automod:
             return
+
+        engine = self.join_rate(member.guild)
+        joins = engine.hit(member.id)
+        raidmode = cm.get(self.bot, 'raidmode', member.guild.id)
         if not raidmode:
-            return
+            if not self.auto_raidmode_rate or engine.rate() < self.auto_raidmode_rate:
+                return
+            raidmode = await self.enable_raidmode(member.guild, automod, engine)
+            if not raidmode:
+                return
 
         if not member.guild.me.guild_permissions.ban_members or not member.guild.me.guild_permissions.kick_members:
             return
@@ -148,41 +428,61 @@ class AutomodEvents(commands.Cog, name='AutomodEvents'):
             return
 
         for coro in self.raidmode.copy():
-            if await coro(self, member):
+            if await coro(self, member, joins):
                 break
 
-    async def anti_spam(self, message):
-        current = message.created_at.replace(tzinfo=timezone.utc).timestamp()
+    async def enable_raidmode(self, guild, automod, engine):
+        """ Turns raid mode on when the join rate goes over the configured limit """
+        channel = guild.get_channel(automod['channel'])
+        if not channel or guild.id in self.bot.raidmode:
+            return None
+
+        raidmode = self.bot.raidmode[guild.id] = {'channel': channel.id, 'dm': False, 'action': 1}
+        try:
+            await self.bot.db.execute("INSERT INTO raidmode(guild_id, channel_id, dm, action) VALUES($1, $2, $3, $4)", guild.id, channel.id, False, 1)
+            prefix = cm.get(self.bot, 'prefix', guild.id)
+            await channel.send(_("{0} Members are joining too fast ({1:.1f} joins per second), enabled raid mode. New members who have their accounts created "
+                                 "less than 30 days ago will be kicked, you can disable raid mode using `{2}raidmode toggle`.").format(
+                self.bot.settings['emojis']['misc']['warn'], engine.rate(), prefix
+            ))
+        except Exception as e:
+            await default.background_error(self, '`automatic raid mode`', e, guild, channel)
+        return raidmode
+
+    async def anti_spam(self, message, features):
         reason = _("Spam (sending multiple messages in a short time span)")
-        automod = cm.get(self.bot, 'automod', message.guild.id)
-        antispam = cm.get(self.bot, 'spam', message.guild.id)
+        antispam = getattr(features.config, 'spam', None)
 
         if not antispam:
             return
 
         content_bucket = self.messages_cooldown.get_bucket(message)
-        if content_bucket.update_rate_limit(current):
+        if content_bucket.update_rate_limit(features.current):
             content_bucket.reset()
             await self.execute_punishment(antispam['level'], message, reason, btime.FutureTime(antispam['time']))
 
         user_bucket = self.user_cooldowns.get_bucket(message)
-        if user_bucket.update_rate_limit(current):
+        if user_bucket.update_rate_limit(features.current):
             user_bucket.reset()
             await self.execute_punishment(antispam['level'], message, reason, btime.FutureTime(antispam['time']))
 
-    async def anti_invite(self, message):
-        invites = INVITE.findall(message.content)
-        current = message.created_at.replace(tzinfo=timezone.utc).timestamp()
+    async def anti_invite(self, message, features):
+        invites = features.invites
         reason = _('Advertising')
-        automod = cm.get(self.bot, 'automod', message.guild.id)
-        antiinvite = cm.get(self.bot, 'invites', message.guild.id)
+        automod = features.automod
+
+        if not invites:
+            return
 
-        if invites and antiinvite:
+        antiinvite = getattr(features.config, 'invites', None)
+        if antiinvite:
             content_bucket = self.invite_cooldown.get_bucket(message)
             the_invite = invites[0]
             try:
-                invite = await self.bot.fetch_invite(the_invite)
-                if invite.guild.id == message.guild.id and len(invites) == 1:
+                guild_id = await self.invites.resolve(the_invite, message)
+                if guild_id is None:  # invalid invite, an unresolved one counts as advertising
+                    return
+                if guild_id == message.guild.id and len(invites) == 1:
                     return
                 if automod['delete_messages'] and message.channel.permissions_for(message.guild.me).manage_messages:
                     await message.delete()
@@ -190,26 +490,27 @@ class AutomodEvents(commands.Cog, name='AutomodEvents'):
                 print(e)
                 return
 
-            retry = content_bucket.update_rate_limit(current)
+            retry = content_bucket.update_rate_limit(features.current)
             if retry:
                 content_bucket.reset()
                 await self.execute_punishment(antiinvite['level'], message, reason, btime.FutureTime(antiinvite['time']))
 
-    async def anti_caps(self, message):
-        cap = CAPS.findall(message.content)
-        current = message.created_at.replace(tzinfo=timezone.utc).timestamp()
+    async def anti_caps(self, message, features):
         reason = _('Spamming caps')
-        automod = cm.get(self.bot, 'automod', message.guild.id)
-        masscaps = cm.get(self.bot, 'masscaps', message.guild.id)
+        automod = features.automod
+
+        if features.length <= 10:
+            return
 
+        masscaps = getattr(features.config, 'masscaps', None)
         if not masscaps:
             return
 
         perc = masscaps['percentage'] / 100
 
-        if len(cap) >= len(message.content) * perc and len(message.content) > 10:
+        if features.uppercase >= features.length * perc:
             content_bucket = self.caps_content.get_bucket(message)
-            retry = content_bucket.update_rate_limit(current)
+            retry = content_bucket.update_rate_limit(features.current)
             if automod['delete_messages'] and message.channel.permissions_for(message.guild.me).manage_messages:
                 await message.delete()
 
@@ -217,50 +518,48 @@ class AutomodEvents(commands.Cog, name='AutomodEvents'):
                 content_bucket.reset()
                 await self.execute_punishment(masscaps['level'], message, reason, btime.FutureTime(masscaps['time']))
 
-    async def anti_links(self, message):
-        link = LINKS.findall(message.content)
-        invites = INVITE.search(message.content)
-        current = message.created_at.replace(tzinfo=timezone.utc).timestamp()
+    async def anti_links(self, message, features):
         reason = _('Spamming links')
-        automod = cm.get(self.bot, 'automod', message.guild.id)
-        antilinks = cm.get(self.bot, 'links', message.guild.id)
+        automod = features.automod
 
-        if not antilinks:
+        if features.invites or not features.links:  # invites and links are different things
             return
 
-        if invites:  # invites and links are different things
+        antilinks = getattr(features.config, 'links', None)
+        if not antilinks:
             return
 
-        if link:
-            # was unable to figure out how to add links without multiplying.
-            # if link_whitelist:
-            #     for li in link_whitelist:
-            #         if li in link:
-            #             return
-            #         else:
-            #             pass
-            content_bucket = self.link_cooldown.get_bucket(message)
-            retry = content_bucket.update_rate_limit(current)
-            if automod['delete_messages'] and message.channel.permissions_for(message.guild.me).manage_messages:
-                await message.delete(silent=True)
-
-            if retry:
-                content_bucket.reset()
-                await self.execute_punishment(antilinks['level'], message, reason, btime.FutureTime(antilinks['time']))
+        # was unable to figure out how to add links without multiplying.
+        # if link_whitelist:
+        #     for li in link_whitelist:
+        #         if li in link:
+        #             return
+        #         else:
+        #             pass
+        content_bucket = self.link_cooldown.get_bucket(message)
+        retry = content_bucket.update_rate_limit(features.current)
+        if automod['delete_messages'] and message.channel.permissions_for(message.guild.me).manage_messages:
+            await message.delete(silent=True)
+
+        if retry:
+            content_bucket.reset()
+            await self.execute_punishment(antilinks['level'], message, reason, btime.FutureTime(antilinks['time']))
 
-    async def anti_mentions(self, message):
-        current = message.created_at.replace(tzinfo=timezone.utc).timestamp()
+    async def anti_mentions(self, message, features):
         reason = _('Spamming mentions')
-        automod = cm.get(self.bot, 'automod', message.guild.id)
-        massmention = cm.get(self.bot, 'massmention', message.guild.id)
+        automod = features.automod
+
+        if not features.mentions:
+            return
 
+        massmention = getattr(features.config, 'massmention', None)
         if not massmention:
             return
 
         limit = massmention['limit']
-        if len(message.mentions) > limit:
+        if features.mentions > limit:
             content_bucket = self.mentions_limit.get_bucket(message)
-            retry = content_bucket.update_rate_limit(current)
+            retry = content_bucket.update_rate_limit(features.current)
             if automod['delete_messages'] and message.channel.permissions_for(message.guild.me).manage_messages:
                 await message.delete()
 
@@ -268,7 +567,7 @@ class AutomodEvents(commands.Cog, name='AutomodEvents'):
                 content_bucket.reset()
                 await self.execute_punishment(massmention['level'], message, reason, btime.FutureTime(massmention['time']))
 
-    async def anti_raid(self, member):
+    async def anti_raid(self, member, joins):
         raidmode = cm.get(self.bot, 'raidmode', member.guild.id)
 
         if not raidmode:
@@ -283,8 +582,12 @@ class AutomodEvents(commands.Cog, name='AutomodEvents'):
             elif raidmode['action'] == 3:
                 action = 8
             elif raidmode['action'] == 4:
-                action == 9
-            await self.execute_punishment(action, member, reason)
+                action = 9
+
+            if action in [6, 8] and joins >= 5:  # they keep rejoining, ban them instead
+                self.join_rate(member.guild).forget(member.id)
+                action = 9
+            self.raid_queue(member.guild).add(action, member, reason)
 
     def embed(self, member, reason, action, time=None) -> discord.Embed:
         emoji = self.bot.settings['emojis']['logs']
@@ -296,11 +599,6 @@ class AutomodEvents(commands.Cog, name='AutomodEvents'):
             color = self.bot.settings['colors']['ban_color']
             emoji = emoji['ban']
             action = _("Member Banned") if action == 4 else _("Member Temp-Banned")
-        elif action in [6, 7, 8, 9]:
-            color = self.bot.settings['colors']
-            color = color['ban_color'] if action == 7 else color['kick_color']
-            emoji = emoji['memberedit'] if action == 6 else emoji['ban']
-            action = _("Member Kicked") if action == 6 else _("Member Banned")
 
         embed = discord.Embed(color=color, timestamp=datetime.now(timezone.utc))
 
@@ -314,12 +612,32 @@ class AutomodEvents(commands.Cog, name='AutomodEvents'):
         embed.set_footer(text=f'Member ID: {member.id}')
         return embed
 
+    def raid_embed(self, guild, batch, failed) -> discord.Embed:
+        kicked = sum(1 for action, member, reason in batch if action in [6, 8])
+        banned = len(batch) - kicked
+        color = self.bot.settings['colors']
+        emoji = self.bot.settings['emojis']['logs']
+
+        embed = discord.Embed(color=color['ban_color'] if banned else color['kick_color'], timestamp=datetime.now(timezone.utc))
+        embed.set_author(name=_("Automod Action"), icon_url=guild.icon_url)
+        embed.title = _("{0} Raid Mode").format(emoji['ban'] if banned else emoji['memberedit'])
+
+        reasons = '\n'.join({reason for action, member, reason in batch})
+        description = _("**Kicked:** {0}\n**Banned:** {1}\n**Failed:** {2}\n**Reason:** {3}\n\n").format(kicked, banned, failed, reasons)
+        for index, (action, member, reason) in enumerate(batch):
+            line = f"`{member.id}` {member}\n"
+            if len(description) + len(line) > 1900:
+                description += _("...and {0} more").format(len(batch) - index)
+                break
+            description += line
+        embed.description = description
+        return embed
+
     async def execute_punishment(self, action, message, reason, time=None):
         automod = cm.get(self.bot, 'automod', message.guild.id)
         logchannel = message.guild.get_channel(automod['channel'])
         muterole = await default.get_muterole(self, message.guild)
         audit_reason = _("Automod Action | {0}").format(reason)
-        anti_raid = cm.get(self.bot, 'raidmode', message.guild.id)
         error_msg = _("{0} Something failed while punishing the member, sent the error to my developers. "
                       "This is most likely due to me either missing permissions or not being able to access the person and/or role").format(self.bot.settings['emojis']['misc']['warn'])
 
@@ -401,73 +719,12 @@ class AutomodEvents(commands.Cog, name='AutomodEvents'):
                 except Exception as e:
                     await default.background_error(self, '`automod punishment execution (tempban)`', e, message.guild, message.channel)
                     return await message.channel.send(error_msg)
-            elif action == 6:
-                if not message.guild.me.guild_permissions.kick_members:
-                    return
-                try:
-                    self.bot.join_counter.update({message.id})
-                    if self.bot.join_counter[message.id] >= 5:
-                        del self.bot.join_counter[message.id]
-                        return await self.execute_punishment(9, message, audit_reason)
-                    await message.guild.kick(message, reason=audit_reason)
-                    log_channel = message.guild.get_channel(anti_raid['channel'])
-                    if anti_raid['dm']:
-                        with suppress(Exception):
-                            await message.send(_("{0} {1} has anti raid mode activated, please try joining again later.").format(self.bot.settings['emojis']['misc']['warn'], message.guild))
-                    time = None
-                except Exception as e:
-                    return await default.background_error(self, '`automod punishment execution (raidmode kick)`', e, message.guild, message.channel if hasattr(message, 'channel') else log_channel)
-            elif action == 7:
-                if not message.guild.me.guild_permissions.ban_members:
-                    return
-                try:
-                    await message.guild.ban(message, reason=audit_reason)
-                    log_channel = message.guild.get_channel(anti_raid['channel'])
-                    if anti_raid['dm']:
-                        with suppress(Exception):
-                            await message.send(_("{0} {1} has anti raid mode activated, you're not allowed to join that server.").format(self.bot.settings['emojis']['misc']['warn'], message.guild))
-                    time = None
-                except Exception as e:
-                    return await default.background_error(self, '`automod punishment execution (raidmode ban)`', e, message.guild, message.channel if hasattr(message, 'channel') else log_channel)
-            elif action == 8:
-                if not message.guild.me.guild_permissions.kick_members:
-                    return
-                try:
-                    self.bot.join_counter.update({message.id})
-                    if self.bot.join_counter[message.id] >= 5:
-                        del self.bot.join_counter[message.id]
-                        return await self.execute_punishment(9, message, audit_reason)
-                    await message.guild.kick(message, reason=audit_reason)
-                    log_channel = message.guild.get_channel(anti_raid['channel'])
-                    if anti_raid['dm']:
-                        with suppress(Exception):
-                            await message.send(_("{0} {1} has strict anti raid mode activated, please try joining again later.").format(self.bot.settings['emojis']['misc']['warn'], message.guild))
-                    time = None
-                except Exception as e:
-                    return await default.background_error(self, '`automod punishment execution (raidmode kick all)`', e, message.guild, message.channel if hasattr(message, 'channel') else log_channel)
-            elif action == 9:
-                if not message.guild.me.guild_permissions.ban_members:
-                    return
-                try:
-                    await message.guild.ban(message, reason=audit_reason)
-                    log_channel = message.guild.get_channel(anti_raid['channel'])
-                    if anti_raid['dm']:
-                        with suppress(Exception):
-                            await message.send(_("{0} {1} has anti raid mode activated, you're not allowed to join that server.").format(self.bot.settings['emojis']['misc']['warn'], message.guild))
-                    time = None
-                except Exception as e:
-                    return await default.background_error(self, '`automod punishment execution (raidmode ban all)`', e, message.guild, message.channel if hasattr(message, 'channel') else log_channel)
-            await logchannel.send(embed=self.embed(member=message if not hasattr(message, 'author') else message.author, reason=reason, action=action, time=time))
-            if action in [6, 8]:
-                await asyncio.sleep(60)  # delete them from the counter after 60 seconds
-                if self.bot.join_counter[message.id] <= 2:
-                    del self.bot.join_counter[message.id]
+            await logchannel.send(embed=self.embed(member=message.author, reason=reason, action=action, time=time))
 
         except Exception as e:
-            await default.background_error(self, '`automod punishment execution`', e, message.guild, message.channel if hasattr(message, 'channel') else log_channel)
-            if action not in [6, 7, 8, 9]:
-                return await message.channel.send(_("{0} I'm not sure what happened, but something broke. Please make sure that my role is above everyone's else, "
-                                                    "otherwise you'll see these errors more often. I've also sent this error to my developers."))
+            await default.background_error(self, '`automod punishment execution`', e, message.guild, message.channel)
+            return await message.channel.send(_("{0} I'm not sure what happened, but something broke. Please make sure that my role is above everyone's else, "
+                                                "otherwise you'll see these errors more often. I've also sent this error to my developers."))
 
     async def update_channel_permissions(self, message, action):
         overwrite = message.channel.overwrites_for(message.author)
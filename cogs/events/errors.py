@@ -61,6 +61,7 @@ class CommandError(commands.Cog, name="CommandError",
         if ctx.guild:
             if ctx.guild.chunked is False:
                 await ctx.guild.chunk(cache=True)
+                self.bot.mutuals.add_guild(ctx.guild)
             printRAW(f"{datetime.now().__format__('%a %d %b %y, %H:%M')} - {ctx.guild.name} | {ctx.author}"
                      f"> {ctx.message.clean_content}")
         else:
@@ -80,34 +81,11 @@ class CommandError(commands.Cog, name="CommandError",
         else:
             cmd = ctx.command.name
 
-        query = """
-                    INSERT INTO command_logs VALUES($1, $2, $3, $4)
-                    ON CONFLICT (user_id, guild_id, command) DO UPDATE
-                    SET usage = command_logs.usage + 1
-                    WHERE command_logs.user_id = $5
-                    AND command_logs.guild_id = $6
-                    AND command_logs.command = $7
-                """
         if ctx.guild:
             guild = ctx.guild.id
         else:
             guild = ctx.channel.id
-        await self.bot.db.execute(query, ctx.author.id, guild, str(cmd), 1, ctx.author.id, guild, str(cmd))
-
-        if cmd not in self.bot.cmdUsage:
-            self.bot.cmdUsage[cmd] = 1
-        else:
-            self.bot.cmdUsage[cmd] += 1
-
-        if not str(ctx.author.id) in self.bot.cmdUsers:
-            self.bot.cmdUsers[str(ctx.author.id)] = 1
-        else:
-            self.bot.cmdUsers[str(ctx.author.id)] += 1
-
-        if ctx.guild and str(ctx.guild.id) not in self.bot.guildUsage:
-            self.bot.guildUsage[str(ctx.guild.id)] = 1
-        elif ctx.guild and str(ctx.guild.id) in self.bot.guildUsage:
-            self.bot.guildUsage[str(ctx.guild.id)] += 1
+        self.bot.command_usage.add(ctx.author.id, guild, str(cmd))
 
     @commands.Cog.listener()
     async def on_command_error(self, ctx, exc):
@@ -21,6 +21,8 @@ from discord.utils import escape_markdown
 
 from db.cache import CacheManager as CM
 from utils import btime, checks, default
+from utils.caches import AuthorSnapshot
+from utils.warmup import needs_cache
 from datetime import datetime, timedelta, timezone
 
 
@@ -62,6 +64,7 @@ class Events(commands.Cog):
 
         support_guild = self.bot.get_guild(self.bot.settings['servers']['main'])
         await support_guild.chunk(cache=True)
+        self.bot.mutuals.add_guild(support_guild)
         print(f"{support_guild} chunked")
 
         # for guild in self.bot.guilds:
@@ -69,11 +72,12 @@ class Events(commands.Cog):
         #         self.bot.dispatch('guild_join', guild)
 
     @commands.Cog.listener()
+    @needs_cache('cache')
     async def on_message(self, message):
         if message.author.bot:
             return
 
-        ctx = await self.bot.get_context(message)
+        ctx = await self.bot.get_cached_context(message)
 
         if ctx.guild is None:
             check = CM.get(self.bot, 'dms', message.author.id)
@@ -140,6 +144,7 @@ class Events(commands.Cog):
                     await logchannel.send(content=f'Failed to send a DM to {message.author} ({message.author.id}) - #{dmid}\n**Error:** {e}')
 
     @commands.Cog.listener()
+    @needs_cache('cache')
     async def on_raw_reaction_add(self, payload):
         try:
             check = CM.get(self.bot, 'rr', payload.message_id)
@@ -176,6 +181,7 @@ class Events(commands.Cog):
             await default.background_error(self, '`raw reaction add`', e, self.bot.get_guild(payload.guild_id), self.bot.get_channel(payload))
 
     @commands.Cog.listener()
+    @needs_cache('cache')
     async def on_raw_reaction_remove(self, payload):
         try:
             check = CM.get(self.bot, 'rr', payload.message_id)
@@ -203,6 +209,7 @@ class Events(commands.Cog):
             await default.background_error(self, '`raw reaction remove`', e, self.bot.get_guild(payload.guild_id), self.bot.get_channel(payload))
 
     @commands.Cog.listener()
+    @needs_cache('cache')
     async def on_guild_join(self, guild):
         check = CM.get(self.bot, 'blacklist', guild.id)
         check_delete_data = CM.get(self.bot, 'guilds_data', guild.id)
@@ -304,6 +311,7 @@ class Events(commands.Cog):
             await chan.send(f"{moksej.mention} most likely failed to save data and the timer is still going\n`{err}`", allowed_mentions=all_mentions)
 
     @commands.Cog.listener()
+    @needs_cache('cache')
     async def on_guild_remove(self, guild):
         # I'm using asyncio.sleep() here just to
         # make sure the events don't bug out and
@@ -365,12 +373,40 @@ class Events(commands.Cog):
             try:
                 time_when = datetime.utcnow() + timedelta(days=30)
                 self.bot.guilds_data[guild.id] = time_when
+                self.bot.timers.schedule('guild_data', guild.id, time_when)
                 await self.bot.db.execute("INSERT INTO delete_data VALUES($1, $2) ON CONFLICT (guild_id) DO UPDATE SET delete_at = $2 WHERE delete_data.guild_id = $1", guild.id, time_when)
                 await msg.edit(content='Inserted data into the db and will delete it automatically in 30 days.')
             except Exception as err:
                 moksej = self.bot.get_user(345457928972533773)
                 await msg.reply(f"{moksej.mention} failed to insert data into automatic 30 days timer\n`{err}`", allowed_mentions=all_mentions)
 
+    # mutual guilds index
+    @commands.Cog.listener('on_ready')
+    async def mutuals_ready(self):
+        for guild in self.bot.guilds:
+            self.bot.mutuals.add_guild(guild)
+            await asyncio.sleep(0)  # don't block the loop on huge member lists
+
+    @commands.Cog.listener('on_guild_join')
+    async def mutuals_guild_join(self, guild):
+        self.bot.mutuals.add_guild(guild)
+
+    @commands.Cog.listener('on_guild_available')
+    async def mutuals_guild_available(self, guild):
+        self.bot.mutuals.add_guild(guild)
+
+    @commands.Cog.listener('on_guild_remove')
+    async def mutuals_guild_remove(self, guild):
+        self.bot.mutuals.remove_guild(guild)
+
+    @commands.Cog.listener('on_member_join')
+    async def mutuals_member_join(self, member):
+        self.bot.mutuals.add(member.id, member.guild.id)
+
+    @commands.Cog.listener('on_member_remove')
+    async def mutuals_member_remove(self, member):
+        self.bot.mutuals.discard(member.id, member.guild.id)
+
     # other events
     @commands.Cog.listener('on_message')
     async def on_del_add(self, message):
@@ -392,6 +428,7 @@ class Events(commands.Cog):
                 return await mok.send(embed=e)
 
     @commands.Cog.listener('on_member_update')
+    @needs_cache('cache')
     async def status_logging(self, before, after):
         await self.bot.wait_until_ready()
 
@@ -399,13 +436,10 @@ class Events(commands.Cog):
             return
 
         if before.status != after.status:
-            query = """INSERT INTO status(user_id, status_type, since) VALUES($1, $2, $3)
-                        ON CONFLICT (user_id) DO UPDATE
-                        SET status_type = $2, since = $3
-                        WHERE status.user_id = $1"""
-            await self.bot.db.execute(query, after.id, after.status.name, datetime.now())
+            self.bot.status_buffer.add(after.id, after.status.name, datetime.now())
 
     @commands.Cog.listener('on_member_update')
+    @needs_cache('cache')
     async def nicknames_logging(self, before, after):
         await self.bot.wait_until_ready()
 
@@ -413,12 +447,12 @@ class Events(commands.Cog):
             return
 
         if before.nick != after.nick:
-            if CM.get(self.bot, 'nicks_op', f'{before.id} - {before.guild.id}'):
+            if CM.get(self.bot, 'nicks_op', (before.id, before.guild.id)):
                 return
-            nick = before.nick or before.name
-            await self.bot.db.execute("INSERT INTO nicknames(user_id, guild_id, nickname, time) VALUES($1, $2, $3, $4)", after.id, after.guild.id, nick, datetime.now())
+            self.bot.nickname_buffer.add(after.id, after.guild.id, before.nick or before.name, after.nick or after.name, datetime.now())
 
     @commands.Cog.listener('on_message')
+    @needs_cache('cache')
     async def afk_status(self, message):
         await self.bot.wait_until_ready()
 
@@ -428,16 +462,16 @@ class Events(commands.Cog):
         if not message.guild:
             return
 
-        afks = CM.get(self.bot, 'afk', f'{str(message.guild.id)}, {str(message.author.id)}')
+        afks = CM.get(self.bot, 'afk', (message.guild.id, message.author.id))
         if afks:
             await message.channel.send(_("Welcome back {0}! You were away for **{1}**. Your AFK state has been removed.").format(
                     message.author.mention, btime.human_timedelta(afks['time'], suffix=None)), allowed_mentions=discord.AllowedMentions(users=True))
             await self.bot.db.execute("DELETE FROM afk WHERE user_id = $1 AND guild_id = $2", message.author.id, message.guild.id)
-            self.bot.afk.pop(f'{str(message.guild.id)}, {str(message.author.id)}')
+            self.bot.afk.pop((message.guild.id, message.author.id))
 
         to_send = ''
         for user in message.mentions:
-            check = CM.get(self.bot, 'afk', f'{str(message.guild.id)}, {str(user.id)}')
+            check = CM.get(self.bot, 'afk', (message.guild.id, user.id))
             if check:
                 afkmsg = check['note']
                 afkmsg = afkmsg.strip()
@@ -457,6 +491,7 @@ class Events(commands.Cog):
                         return
 
     @commands.Cog.listener('on_message_delete')
+    @needs_cache('cache')
     async def snipes_logging(self, message):
         await self.bot.wait_until_ready()
 
@@ -469,7 +504,7 @@ class Events(commands.Cog):
         if message.stickers != []:
             message.content += _("\n*Sticker* - {0}").format(message.stickers[0].name)
 
-        self.bot.snipes[message.channel.id] = {'message': message.content, 'deleted_at': datetime.now(), 'author': message.author.id, 'nsfw': message.channel.is_nsfw()}
+        self.bot.snipes.add(message.channel.id, {'message': message.content, 'deleted_at': datetime.now(), 'author': AuthorSnapshot.from_user(message.author), 'nsfw': message.channel.is_nsfw()})
 
 
 def setup(bot):
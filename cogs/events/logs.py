@@ -14,46 +14,223 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 import discord
-import json
 import asyncio
+import time
 
 from discord.ext import commands
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
+from collections import deque
 
 from utils import btime, default, publicflags
+from utils.warmup import needs_cache
 from db.cache import CacheManager as CM
 
 
+class JoinBurst:
+    """Welcome messages, join logs and join roles of a guild while members join too fast.
+
+    Welcomes are counted and join logs are collected, both are posted every
+    ``interval`` seconds as one message. Join roles are given one member at
+    a time with ``role_delay`` seconds in between.
+    """
+
+    def __init__(self, cog, guild_id, *, interval=10, role_delay=0.5):
+        self.cog = cog
+        self.bot = cog.bot
+        self.guild_id = guild_id
+        self.interval = interval
+        self.role_delay = role_delay
+        self.until = 0
+        self.welcomes = 0
+        self.joins = []
+        self.roles = deque()  # (member, roles)
+        self._flusher = None
+        self._giver = None
+
+    @property
+    def active(self):
+        return time.monotonic() < self.until
+
+    def extend(self, seconds):
+        self.until = time.monotonic() + seconds
+
+    def welcome(self, member):
+        self.welcomes += 1
+        self.start()
+
+    def log(self, member):
+        self.joins.append(member)
+        self.start()
+
+    def give_roles(self, member, roles):
+        self.roles.append((member, roles))
+        if self._giver is None:
+            self._giver = self.bot.loop.create_task(self.give_all())
+
+    def start(self):
+        if self._flusher is None:
+            self._flusher = self.bot.loop.create_task(self.flush_all())
+
+    async def flush_all(self):
+        try:
+            while self.welcomes or self.joins:
+                await asyncio.sleep(self.interval)
+                await self.flush()
+        finally:
+            self._flusher = None
+
+    async def flush(self):
+        guild = self.bot.get_guild(self.guild_id)
+        welcomes, self.welcomes = self.welcomes, 0
+        joins, self.joins = self.joins, []
+        if guild is None:
+            return
+
+        joinmessage = CM.get(self.bot, 'joinmessage', guild.id)
+        welcome_channel = guild.get_channel(joinmessage['channel']) if joinmessage and welcomes else None
+        if welcome_channel:
+            try:
+                await welcome_channel.send(_("{0} {1} new members have joined the server, welcome!").format(self.bot.settings['emojis']['logs']['memberjoin'], welcomes))
+            except Exception as e:
+                await default.background_error(self.cog, '`welcoming message (join burst)`', e, guild, welcome_channel)
+
+        joinlog = CM.get(self.bot, 'joinlog', guild.id)
+        if joinlog and joins:
+            joinlog_channel = guild.get_channel(joinlog)
+            for embed in self.cog.joinlog_embeds(guild, joins):
+                self.bot.log_delivery.send(joinlog_channel, embed)
+
+    async def give_all(self):
+        try:
+            while self.roles:
+                member, roles = self.roles.popleft()
+                try:
+                    await member.add_roles(*roles, reason='Join role')
+                except discord.NotFound:  # they left already
+                    pass
+                except Exception as e:
+                    await default.background_error(self.cog, '`join role (join burst)`', e, member.guild, None)
+                await asyncio.sleep(self.role_delay)
+        finally:
+            self._giver = None
+
+
 class Logging(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.help_icon = ''
         self.big_icon = ''
+        # joins per second above which welcome messages, join logs and join roles get batched
+        burst_rate = getattr(bot.config, 'JOIN_BURST_RATE', 1)
+        self.join_rate = commands.CooldownMapping.from_cooldown(burst_rate * 10, 10.0, commands.BucketType.guild) if burst_rate else None
+        self.bursts = {}  # guild id: JoinBurst
+        self.hoisters = {}  # (guild id, member id): when their name gets checked
+        self.dehoist_queue = deque()  # (member, nickname)
+        self._dehoister = None
+        bot.timers.register('dehoist', self.check_hoister)
+
+    def cog_unload(self):
+        self.bot.timers.unregister('dehoist')
+        self.hoisters.clear()  # their timers are gone, let them be scheduled again
+
+    def join_burst(self, guild_id):
+        """ Returns the guild's JoinBurst if members are currently joining too fast """
+        burst = self.bursts.get(guild_id)
+        if burst is None or not burst.active:
+            return None
+        return burst
+
+    def schedule_dehoist(self, member):
+        """ Checks the member's name again in a minute, unless it's going to be checked already """
+        key, now = (member.guild.id, member.id), datetime.utcnow()
+        if self.hoisters.get(key, now) > now:
+            return
+        when = now + timedelta(seconds=60)
+        self.hoisters[key] = when
+        self.bot.timers.schedule('dehoist', key, when)
+
+    async def check_hoister(self, key, when):
+        if self.hoisters.get(key) != when:
+            return
+        del self.hoisters[key]
 
-    def placeholder_replacer(self, emb_dict, member):
-        for thing in emb_dict:
-            if isinstance(emb_dict[thing], str):
-                emb_dict[thing] = emb_dict[thing].replace("{{member.name}}", member.name)
-                emb_dict[thing] = emb_dict[thing].replace("{{member.id}}", str(member.id))
-                emb_dict[thing] = emb_dict[thing].replace("{{member.tag}}", str(member))
-                emb_dict[thing] = emb_dict[thing].replace("{{member.mention}}", member.mention)
-                emb_dict[thing] = emb_dict[thing].replace("{{server.name}}", member.guild.name)
-                emb_dict[thing] = emb_dict[thing].replace("{{server.members}}", str(member.guild.member_count))
-        return emb_dict
-
-    async def insert_new_case(self, mod_id, channel, case_num, user_id, guild_id, action, reason):
-        query1 = 'INSERT INTO modlog(mod_id, channel_id, case_num, message_id, user_id, guild_id, action, reason) VALUES($1, $2, $3, $4, $5, $6, $7, $8)'
-        await self.bot.db.execute(query1, mod_id, channel, case_num if case_num else 1, None,
-                                  user_id, guild_id, action, reason)
-
-    async def update_old_case(self, message_id, guild_id, case_num):
-        await self.bot.db.execute("UPDATE modlog SET message_id = $1 WHERE guild_id = $2 AND case_num = $3", message_id, guild_id, case_num if case_num else 1)
-        await self.bot.db.execute("UPDATE modlog SET case_num = $1 WHERE guild_id = $2 AND message_id = $3", case_num if case_num else 1, guild_id, message_id)
-        await self.bot.db.execute("UPDATE cases SET case_num = $1 + 1 WHERE guild_id = $2", case_num if case_num else 1, guild_id)
-        self.bot.case_num[guild_id] += 1
+        guild = self.bot.get_guild(key[0])
+        member = guild.get_member(key[1]) if guild else None
+        if member is None:
+            return
+        check = CM.get(self.bot, 'antihoist', guild.id)
+        if not check or not guild.me.guild_permissions.manage_nicknames:
+            return
+        if member.display_name[0].isalnum():
+            return
+
+        self.dehoist_queue.append((member, check['nickname'] or 'z (hoister)'))
+        if self._dehoister is None:
+            self._dehoister = self.bot.loop.create_task(self.dehoist_all())
+
+    async def dehoist_all(self):
+        """ Renames the queued hoisters 10 at a time and logs every batch per guild """
+        try:
+            while self.dehoist_queue:
+                dehoisted = {}
+                for num in range(min(10, len(self.dehoist_queue))):
+                    member, nick = self.dehoist_queue.popleft()
+                    try:
+                        await member.edit(nick=nick, reason='Anti hoist')
+                        dehoisted.setdefault(member.guild, []).append(member)
+                    except discord.HTTPException:
+                        pass
+                    await asyncio.sleep(0.5)
+                for guild, members in dehoisted.items():
+                    self.bot.dispatch('dehoist', guild, guild.me, members)
+        finally:
+            self._dehoister = None
+
+    def joinlog_embeds(self, guild, members):
+        emoji = self.bot.settings['emojis']['logs']['memberjoin']
+        now = datetime.utcnow()
+        lines = [_("{0} ({1}) - created {2}").format(member.mention, member.id, btime.human_timedelta(member.created_at.replace(tzinfo=None), source=now))
+                 for member in members]
+
+        pages, page = [], ''
+        for line in lines:
+            if len(page) + len(line) > 1900:
+                pages.append(page)
+                page = ''
+            page += line + '\n'
+        pages.append(page)
+
+        for page in pages:
+            embed = discord.Embed(color=self.bot.settings['colors']['memberlog_color'], timestamp=datetime.now(timezone.utc))
+            embed.title = _("{0} {1} new members have joined").format(emoji, len(members))
+            embed.description = page
+            embed.set_footer(text=_("Member #{0}").format(guild.member_count))
+            yield embed
+
+    async def new_case(self, guild_id, mod_id, channel_id, user_ids, action, reason):
+        """ Takes the next case number of the guild and inserts the case for every user in one go """
+        query = ('INSERT INTO cases(guild_id, case_num) VALUES($1, 2) ON CONFLICT (guild_id) '
+                 'DO UPDATE SET case_num = GREATEST(cases.case_num, 1) + 1 RETURNING case_num - 1')
+        case_num = await self.bot.db.fetchval(query, guild_id)
+        self.bot.case_num[guild_id] = max(self.bot.case_num.get(guild_id, 0), case_num + 1)
+
+        query = 'INSERT INTO modlog(mod_id, channel_id, case_num, message_id, user_id, guild_id, action, reason) VALUES($1, $2, $3, $4, $5, $6, $7, $8)'
+        await self.bot.db.executemany(query, [(mod_id, channel_id, case_num, None, user_id, guild_id, action, reason) for user_id in user_ids])
+        return case_num
+
+    async def link_case(self, guild_id, case_num, message):
+        if message is None:
+            return
+        await self.bot.db.execute("UPDATE modlog SET message_id = $1 WHERE guild_id = $2 AND case_num = $3", message.id, guild_id, case_num)
 
     @commands.Cog.listener()
     async def on_member_join(self, member):
+        if self.join_rate and self.join_rate.get_bucket(member).update_rate_limit():
+            burst = self.bursts.get(member.guild.id)
+            if burst is None:
+                burst = self.bursts[member.guild.id] = JoinBurst(self, member.guild.id)
+            burst.extend(30)
+
         self.bot.dispatch('member_joinlog', member)
         self.bot.dispatch('join_message', member)
         self.bot.dispatch('joinrole', member)
@@ -65,6 +242,7 @@ class Logging(commands.Cog):
         self.bot.dispatch('member_kick', member.guild, member)
 
     @commands.Cog.listener()
+    @needs_cache('cache', 'guild_settings')
     async def on_message_edit(self, before, after):
         if not before.guild:
             return
@@ -78,8 +256,8 @@ class Logging(commands.Cog):
             return
 
         if before.content != after.content:
-            ctx = await self.bot.get_context(before)
-            ctx2 = await self.bot.get_context(after)
+            ctx = await self.bot.get_cached_context(before)
+            ctx2 = await self.bot.get_cached_context(after)
             if ctx.valid and ctx2.valid:
                 return
 
@@ -97,12 +275,10 @@ class Logging(commands.Cog):
                                     value=after.content[:1000] + '...' if len(after.content) > 1000 else after.content)
             editlog_embed.set_footer(text=_("User ID: {0}").format(after.author.id))
 
-            try:
-                await editlog_channel.send(embed=editlog_embed)
-            except Exception as e:
-                await default.background_error(self, '`message edit`', e, before.guild, editlog_channel)
+            self.bot.log_delivery.send(editlog_channel, editlog_embed)
 
     @commands.Cog.listener()
+    @needs_cache('cache', 'guild_settings')
     async def on_message_delete(self, message):
         if not message.guild:
             return
@@ -115,7 +291,7 @@ class Logging(commands.Cog):
         if message.author.bot or message.author not in message.guild.members:
             return
 
-        ctx = await self.bot.get_context(message)
+        ctx = await self.bot.get_cached_context(message)
         if ctx.valid:
             return
 
@@ -140,12 +316,10 @@ class Logging(commands.Cog):
                                       value=f"{message.stickers[0].name} - `{message.stickers[0].description}`")
         deletelog_embed.set_footer(text=_("User ID: {0}").format(message.author.id))
 
-        try:
-            await deletelog_channel.send(embed=deletelog_embed)
-        except Exception as e:
-            await default.background_error(self, '`message delete`', e, message.guild, deletelog_channel)
+        self.bot.log_delivery.send(deletelog_channel, deletelog_embed)
 
     @commands.Cog.listener()
+    @needs_cache('cache', 'guild_settings')
     async def on_member_update(self, before, after):
         member_update = CM.get(self.bot, 'memberlog', before.guild.id)
 
@@ -165,21 +339,18 @@ class Logging(commands.Cog):
                                                                                                           after.nick if after.nick else after.name)
             nick_embed.set_footer(text=_("User ID: {0}").format(before.id))
 
-            try:
-                await nick_channel.send(embed=nick_embed)
-            except Exception as e:
-                await default.background_error(self, '`member update`', e, before.guild, nick_channel)
+            self.bot.log_delivery.send(nick_channel, nick_embed)
 
     @commands.Cog.listener()
+    @needs_cache('cache', 'guild_settings')
     async def on_user_update(self, before, after):
-        for guild in self.bot.guilds:
-            if guild.get_member(before.id):
-                member_update = CM.get(self.bot, 'memberlog', guild.id)
+        if before.bot:
+            return
 
-                if not member_update:
-                    continue
-                if before.bot:
-                    continue
+        for guild_id in self.bot.mutuals.with_setting(before.id, self.bot.memberlog):
+            guild = self.bot.get_guild(guild_id)
+            if guild:
+                member_update = CM.get(self.bot, 'memberlog', guild.id)
 
                 if before.avatar != after.avatar:
                     updateavatar_channel = guild.get_channel(member_update)
@@ -189,12 +360,7 @@ class Logging(commands.Cog):
                     updateavatar_embed.description = _("**Member:** {0} `{1}`\n[Avatar URL]({2})").format(before.mention, before, after.avatar_url)
                     updateavatar_embed.set_thumbnail(url=after.avatar_url)
                     updateavatar_embed.set_footer(text=_("User ID: {0}").format(before.id))
-                    try:
-                        await updateavatar_channel.send(embed=updateavatar_embed)
-                        pass
-                    except Exception as e:
-                        await default.background_error(self, '`user update (avatar update)`', e, guild, updateavatar_channel)
-                        pass
+                    self.bot.log_delivery.send(updateavatar_channel, updateavatar_embed)
 
                 if before.name != after.name:
                     updateuser_channel = guild.get_channel(member_update)
@@ -203,92 +369,76 @@ class Logging(commands.Cog):
                     updateuser_embed.title = _("{0} Username Changed").format(self.bot.settings['emojis']['logs']['memberedit'])
                     updateuser_embed.description = _("**Member:** {0} `{1}`\n**Before:** {2}\n**After:** {3}").format(after.mention, after, before.name, after.name)
                     updateuser_embed.set_footer(text=_("User ID: {0}").format(before.id))
-                    try:
-                        await updateuser_channel.send(embed=updateuser_embed)
-                    except Exception as e:
-                        await default.background_error(self, '`user update (username update)`', e, guild, updateuser_channel)
+                    self.bot.log_delivery.send(updateuser_channel, updateuser_embed)
 
     @commands.Cog.listener()
+    @needs_cache('cache', 'guild_settings')
     async def on_member_ban(self, guild, user):
-        await asyncio.sleep(1)
         moderation = CM.get(self.bot, 'moderation', guild.id)
-        case = CM.get(self.bot, 'case_num', guild.id)
         if not moderation:
             return
         if not guild.me.guild_permissions.view_audit_log:
             return
-        mod, reason = None, ""
-        async for entry in guild.audit_logs(action=discord.AuditLogAction.ban, limit=5):
-            if entry.target == user:
-                if (datetime.utcnow() - entry.created_at.replace(tzinfo=None)).total_seconds() < 3:
-                    mod = entry.user
-                    reason += f"{entry.reason}"
+        entry = await self.bot.audit_logs.find(guild, discord.AuditLogAction.ban, user.id)
+        if entry is None:
+            return
+        mod, reason = entry.user, f"{entry.reason}"
 
         if mod == self.bot.user:
             return
         reason = reason if reason != "None" else "No reason"
 
         log_channel = self.bot.get_channel(moderation)
-        query = 'INSERT INTO cases(guild_id, case_num) VALUES($1, $2) ON CONFLICT (guild_id) DO NOTHING'
-        await self.bot.db.execute(query, guild.id, case if case else 0)
-        if not case:
-            self.bot.case_num[guild.id] = 1
-        await self.insert_new_case(mod.id, log_channel.id, case, user.id, guild.id, 1, reason)
+        case = await self.new_case(guild.id, mod.id, log_channel.id, [user.id], 1, reason)
 
         embed = discord.Embed(color=self.bot.settings['colors']['ban_color'], timestamp=datetime.now(timezone.utc))
         embed.set_author(name=mod, icon_url=mod.avatar_url, url=f'https://discord.com/users/{mod.id}')
         embed.title = _("{0} A member has been banned").format(self.bot.settings['emojis']['logs']['ban'])
         the_user = f"{user} ({user.id})"
         embed.description = _("**Member:** {0}\n**Moderator:** {1} ({2})\n**Reason:** {3}").format(the_user, mod, mod.id, reason)
-        embed.set_footer(text=_("Case ID: #{0}").format(case if case else 1))
+        embed.set_footer(text=_("Case ID: #{0}").format(case))
 
+        message = await self.bot.log_delivery.send_case(log_channel, embed)
         try:
-            message = await log_channel.send(embed=embed)
-            await self.update_old_case(message.id, guild.id, case)
+            await self.link_case(guild.id, case, message)
         except Exception as e:
             await default.background_error(self, '`ban members`', e, guild, log_channel)
 
     @commands.Cog.listener()
+    @needs_cache('cache', 'guild_settings')
     async def on_member_unban(self, guild, user):
-        await asyncio.sleep(1)
         moderation = CM.get(self.bot, 'moderation', guild.id)
-        case = CM.get(self.bot, 'case_num', guild.id)
         if not moderation:
             return
         if not guild.me.guild_permissions.view_audit_log:
             return
-        mod, reason = None, ""
-        async for entry in guild.audit_logs(action=discord.AuditLogAction.unban, limit=50):
-            if entry.target == user:
-                if (datetime.utcnow() - entry.created_at.replace(tzinfo=None)).total_seconds() < 3:
-                    mod = entry.user
-                    reason += f"{entry.reason}"
+        entry = await self.bot.audit_logs.find(guild, discord.AuditLogAction.unban, user.id)
+        if entry is None:
+            return
+        mod, reason = entry.user, f"{entry.reason}"
 
         if mod == self.bot.user:
             return
         reason = reason if reason != "None" else "No reason"
 
         log_channel = self.bot.get_channel(moderation)
-        query = 'INSERT INTO cases(guild_id, case_num) VALUES($1, $2) ON CONFLICT (guild_id) DO NOTHING'
-        await self.bot.db.execute(query, guild.id, case if case else 0)
-        if not case:
-            self.bot.case_num[guild.id] = 1
-        await self.insert_new_case(mod.id, log_channel.id, case, user.id, guild.id, 6, reason)
+        case = await self.new_case(guild.id, mod.id, log_channel.id, [user.id], 6, reason)
 
         embed = discord.Embed(color=self.bot.settings['colors']['approve_color'], timestamp=datetime.now(timezone.utc))
         embed.set_author(name=mod, icon_url=mod.avatar_url, url=f'https://discord.com/users/{mod.id}')
         embed.title = _("{0} A member was un-banned").format(self.bot.settings['emojis']['logs']['unban'])
         the_user = f"{user} ({user.id})"
         embed.description = _("**Member:** {0}\n**Moderator:** {1} ({2})\n**Reason:** {3}").format(the_user, mod, mod.id, reason)
-        embed.set_footer(text=_("Case ID: #{0}").format(case if case else 1))
+        embed.set_footer(text=_("Case ID: #{0}").format(case))
 
+        message = await self.bot.log_delivery.send_case(log_channel, embed)
         try:
-            message = await log_channel.send(embed=embed)
-            await self.update_old_case(message.id, guild.id, case)
+            await self.link_case(guild.id, case, message)
         except Exception as e:
             await default.background_error(self, '`unban members`', e, guild, log_channel)
 
     @commands.Cog.listener()
+    @needs_cache('cache', 'guild_settings')
     async def on_guild_update(self, before, after):
         guild_logs = CM.get(self.bot, 'guildlog', before.id)
 
@@ -302,74 +452,59 @@ class Logging(commands.Cog):
         if before.name != after.name:
             embed.title += _(" Guild name changed")
             embed.description = _("**Before:** {0}\n**After:** {1}").format(before.name, after.name)
-            try:
-                await channels.send(embed=embed)
-            except Exception as e:
-                await default.background_error(self, '`guild name update`', e, before, channels)
-                return
+            self.bot.log_delivery.send(channels, embed.copy())
 
         if before.region != after.region:
             embed.title += _(" Guild region changed")
             embed.description = _("**Before:** {0}\n**After:** {1}").format(before.region, after.region)
-            try:
-                await channels.send(embed=embed)
-            except Exception as e:
-                await default.background_error(self, '`guild region update`', e, before, channels)
-                return
+            self.bot.log_delivery.send(channels, embed.copy())
 
         if before.afk_channel != after.afk_channel:
             embed.title += _(" Guild afk channel changed")
             embed.description = _("**Before:** {0}\n**After:** {1}").format(before.afk_channel, after.afk_channel)
-            try:
-                await channels.send(embed=embed)
-            except Exception as e:
-                await default.background_error(self, '`guild afk channel update`', e, before, channels)
-                return
+            self.bot.log_delivery.send(channels, embed.copy())
 
         if before.icon_url != after.icon_url:
             embed.title += _(" Guild icon changed")
             embed.description = _("**Before:** [Click here]({0})\n**After:** [Click here]({1})").format(before.icon_url, after.icon_url)
             embed.set_thumbnail(url=after.icon_url)
-            try:
-                await channels.send(embed=embed)
-            except Exception as e:
-                await default.background_error(self, '`guild icon update`', e, before, channels)
-                return
+            self.bot.log_delivery.send(channels, embed.copy())
 
         if before.mfa_level != after.mfa_level:
             embed.title += _(" Guild multifactor authentication (MFA) changed")
-            embed.description = _("**Before:** {0}\n**After:** {1}").format(before.mfa_level, after.mfa_lever)
-            try:
-                await channels.send(embed=embed)
-            except Exception as e:
-                await default.background_error(self, '`guild MFA update`', e, before, channels)
-                return
+            embed.description = _("**Before:** {0}\n**After:** {1}").format(before.mfa_level, after.mfa_level)
+            self.bot.log_delivery.send(channels, embed.copy())
 
         if before.verification_level != after.verification_level:
             embed.title += _(" Guild verification level changed")
             embed.description = _("**Before:** {0}\n**After:** {1}").format(before.verification_level, after.verification_level)
-            try:
-                await channels.send(embed=embed)
-            except Exception as e:
-                await default.background_error(self, '`guild verification update`', e, before, channels)
-                return
+            self.bot.log_delivery.send(channels, embed.copy())
 
         if before.default_notifications != after.default_notifications:
             embed.title += _(" Guild default notifications changed")
             embed.description = _("**Before:** {0}\n**After:** {1}").format(before.default_notifications, after.default_notifications)
-            try:
-                await channels.send(embed=embed)
-            except Exception as e:
-                await default.background_error(self, '`guild notifications update`', e, before, channels)
-                return
+            self.bot.log_delivery.send(channels, embed.copy())
+
+    @commands.Cog.listener('on_guild_remove')
+    async def forget_guild(self, guild):
+        self.bot.audit_logs.forget(guild.id)
+        self.bursts.pop(guild.id, None)
+
+    @commands.Cog.listener('on_guild_channel_delete')
+    async def log_channel_delete(self, channel):
+        self.bot.log_delivery.forget(channel.id)
 
 # Custom Events Start Here
 
     @commands.Cog.listener()
+    @needs_cache('cache', 'guild_settings')
     async def on_member_joinlog(self, member):
         joinlog = CM.get(self.bot, 'joinlog', member.guild.id)
 
-        if joinlog:
+        burst = self.join_burst(member.guild.id)
+        if joinlog and burst:
+            burst.log(member)
+        elif joinlog:
             joinlog_channel = member.guild.get_channel(joinlog)
             joinlog_embed = discord.Embed(color=self.bot.settings['colors']['memberlog_color'], timestamp=datetime.now(timezone.utc))
             joinlog_embed.title = _("{0} A new member has joined").format(self.bot.settings['emojis']['logs']['memberjoin'])
@@ -379,12 +514,10 @@ class Logging(commands.Cog):
                                               member.mention, member.id, btime.human_timedelta(member.created_at.replace(tzinfo=None), source=datetime.utcnow())
                                           )
             joinlog_embed.set_footer(text=_("Member #{0}").format(member.guild.member_count))
-            try:
-                await joinlog_channel.send(embed=joinlog_embed)
-            except Exception as e:
-                await default.background_error(self, '`member joinlog`', e, member.guild, joinlog_channel)
+            self.bot.log_delivery.send(joinlog_channel, joinlog_embed)
 
     @commands.Cog.listener()
+    @needs_cache('cache', 'guild_settings')
     async def on_member_leavelog(self, member):
         leavelog = CM.get(self.bot, 'leavelog', member.guild.id)
 
@@ -401,18 +534,24 @@ class Logging(commands.Cog):
                                               ', '.join(roles[:20]) + f' **(+{len(member.roles) - 20})**' if len(roles) > 20 else ', '.join(roles) if roles else _('No roles.')
                                           )
             joinlog_embed.set_footer(text=_("Members left: {0}").format(member.guild.member_count))
-            try:
-                await joinlog_channel.send(embed=joinlog_embed)
-            except Exception as e:
-                await default.background_error(self, '`member joinlog`', e, member.guild, joinlog_channel)
+            self.bot.log_delivery.send(joinlog_channel, joinlog_embed)
 
     @commands.Cog.listener()
+    @needs_cache('cache', 'guild_settings')
     async def on_joinrole(self, member):
         joinrole = CM.get(self.bot, 'joinrole', member.guild.id)
 
         if not joinrole:
             return
 
+        burst = self.join_burst(member.guild.id)
+        if burst:
+            roles = [member.guild.get_role(role) for role in joinrole['bots' if member.bot else 'people'] or []]
+            roles = [role for role in roles if role]
+            if roles:
+                burst.give_roles(member, roles)
+            return
+
         if member.bot and joinrole['bots']:
             for role in joinrole['bots']:
                 role_for_bots = member.guild.get_role(role)
@@ -433,8 +572,9 @@ class Logging(commands.Cog):
                     await default.background_error(self, '`join role (people)`', e, member.guild, None)
 
     @commands.Cog.listener()
+    @needs_cache('cache', 'guild_settings')
     async def on_join_message(self, member):
-        db_check = CM.get(self.bot, 'temp_mutes', f'{member.id}, {member.guild.id}')
+        db_check = CM.get(self.bot, 'temp_mutes', (member.id, member.guild.id))
         if db_check:
             try:
                 the_role = member.guild.get_role(db_check)
@@ -446,37 +586,12 @@ class Logging(commands.Cog):
         if joinmessage:
             if member.bot and not joinmessage['log_bots']:
                 return
+            burst = self.join_burst(member.guild.id)
+            if burst:
+                return burst.welcome(member)
             welcome_channel = member.guild.get_channel(joinmessage['channel'])
             is_embed = joinmessage['embedded']
-            if is_embed:
-                if joinmessage['message']:
-                    msg = json.loads(joinmessage['message'])
-                else:
-                    msg = self.bot.settings['default']['join_message_embed']
-                emb_dict = msg
-                emb_dict = self.placeholder_replacer(emb_dict, member)
-                if "author" in emb_dict:
-                    emb_dict["author"] = self.placeholder_replacer(emb_dict["author"], member)
-                if "footer" in emb_dict:
-                    emb_dict["footer"] = self.placeholder_replacer(emb_dict["footer"], member)
-                if "fields" in emb_dict:
-                    for field in emb_dict["fields"]:
-                        emb_dict["fields"] = self.placeholder_replacer(field["name"], member)
-                        emb_dict["fields"] = self.placeholder_replacer(field["value"], member)
-                joinmessage = emb_dict
-            elif not is_embed:
-                if joinmessage['message']:
-                    joinmessage = str(joinmessage['message'])
-                else:
-                    joinmessage = self.bot.settings['default']['join_message_text'].format(member, str(member.guild.member_count))
-                joinmessage = joinmessage.replace("{{member.mention}}", member.mention)
-                joinmessage = joinmessage.replace("{{member.tag}}", str(member))
-                joinmessage = joinmessage.replace("{{member.id}}", str(member.id))
-                joinmessage = joinmessage.replace("{{member.name}}", discord.utils.escape_markdown(member.name, as_needed=True))
-                joinmessage = joinmessage.replace("{{server.name}}", member.guild.name)
-                joinmessage = joinmessage.replace("{{server.members}}", str(member.guild.member_count))
-                joinmessage = joinmessage.replace("{0}", member.display_name)
-                joinmessage = joinmessage.replace("{1}", str(member.guild.member_count))
+            joinmessage = self.bot.welcome_templates.get('join', member.guild.id, joinmessage).render(member)
             all_mentions = discord.AllowedMentions(users=True, roles=False, everyone=False)
 
             if is_embed:
@@ -494,6 +609,7 @@ class Logging(commands.Cog):
                     await default.background_error(self, '`welcoming message (text)`', e, member.guild, welcome_channel)
 
     @commands.Cog.listener()
+    @needs_cache('cache', 'guild_settings')
     async def on_leave_message(self, member):
         leavemessage = CM.get(self.bot, 'leavemessage', member.guild.id)
         if leavemessage:
@@ -501,33 +617,7 @@ class Logging(commands.Cog):
                 return
             welcome_channel = member.guild.get_channel(leavemessage['channel'])
             is_embed = leavemessage['embedded']
-            if is_embed:
-                if leavemessage['message']:
-                    msg = json.loads(leavemessage['message'])
-                else:
-                    msg = self.bot.settings['default']['leave_message_embed']
-                emb_dict = msg
-                emb_dict = self.placeholder_replacer(emb_dict, member)
-                if "author" in emb_dict:
-                    emb_dict["author"] = self.placeholder_replacer(emb_dict["author"], member)
-                if "footer" in emb_dict:
-                    emb_dict["footer"] = self.placeholder_replacer(emb_dict["footer"], member)
-                if "fields" in emb_dict:
-                    for field in emb_dict["fields"]:
-                        emb_dict["fields"] = self.placeholder_replacer(field["name"], member)
-                        emb_dict["fields"] = self.placeholder_replacer(field["value"], member)
-                leavemessage = emb_dict
-            elif not is_embed:
-                if leavemessage['message']:
-                    leavemessage = str(leavemessage['message'])
-                else:
-                    leavemessage = self.bot.settings['default']['leave_message_text'].format(member, str(member.guild.member_count))
-                leavemessage = leavemessage.replace("{{member.mention}}", member.mention)
-                leavemessage = leavemessage.replace("{{member.tag}}", str(member))
-                leavemessage = leavemessage.replace("{{member.id}}", str(member.id))
-                leavemessage = leavemessage.replace("{{member.name}}", discord.utils.escape_markdown(member.name, as_needed=True))
-                leavemessage = leavemessage.replace("{{server.name}}", member.guild.name)
-                leavemessage = leavemessage.replace("{{server.members}}", str(member.guild.member_count))
+            leavemessage = self.bot.welcome_templates.get('leave', member.guild.id, leavemessage).render(member)
             all_mentions = discord.AllowedMentions(users=True, roles=False, everyone=False)
 
             if is_embed:
@@ -543,9 +633,9 @@ class Logging(commands.Cog):
                     await default.background_error(self, '`leaving message (text)`', e, member.guild, welcome_channel)
 
     @commands.Cog.listener()
+    @needs_cache('cache', 'guild_settings')
     async def on_ban(self, guild, mod, members, duration, reason, created_at):
         moderation = CM.get(self.bot, 'moderation', guild.id)
-        case = CM.get(self.bot, 'case_num', guild.id)
         if not moderation:
             return
         log_channel = self.bot.get_channel(moderation)
@@ -553,13 +643,9 @@ class Logging(commands.Cog):
         reason = reason or "No reason"
 
         ban_list = []
-        query = 'INSERT INTO cases(guild_id, case_num) VALUES($1, $2) ON CONFLICT (guild_id) DO NOTHING'
-        await self.bot.db.execute(query, guild.id, case if case else 0)
-        if not case:
-            self.bot.case_num[guild.id] = 1
         for num, member in enumerate(members, start=0):
             ban_list.append(f"`[{num + 1}]` {member} ({member.id})")
-            await self.insert_new_case(mod.id, log_channel.id, case, member.id, guild.id, 1, reason)
+        case = await self.new_case(guild.id, mod.id, log_channel.id, [member.id for member in members], 1, reason)
 
         embed = discord.Embed(color=self.bot.settings['colors']['ban_color'], timestamp=datetime.now(timezone.utc))
         embed.set_author(name=mod, icon_url=mod.avatar_url, url=f'https://discord.com/users/{mod.id}')
@@ -567,111 +653,99 @@ class Logging(commands.Cog):
         embed.description = _("**Member(s):**\n{0}{1}\n**Moderator:** {2} ({3})\n**Reason:** {4}").format("\n".join(ban_list),
                                                                                                           _("\n**Duration:** {0}").format(time) if time else '',
                                                                                                           mod, mod.id, reason)
-        embed.set_footer(text=_("Case ID: #{0}").format(case if case else 1))
+        embed.set_footer(text=_("Case ID: #{0}").format(case))
 
+        message = await self.bot.log_delivery.send_case(log_channel, embed)
         try:
-            message = await log_channel.send(embed=embed)
-            await self.update_old_case(message.id, guild.id, case)
+            await self.link_case(guild.id, case, message)
         except Exception as e:
             await default.background_error(self, '`ban members (manual)`', e, guild, log_channel)
 
     @commands.Cog.listener()
+    @needs_cache('cache', 'guild_settings')
     async def on_hackban(self, guild, mod, members, reason):
         moderation = CM.get(self.bot, 'moderation', guild.id)
-        case = CM.get(self.bot, 'case_num', guild.id)
         if not moderation:
             return
         log_channel = self.bot.get_channel(moderation)
         reason = reason or "No reason"
 
         ban_list = []
-        query = 'INSERT INTO cases(guild_id, case_num) VALUES($1, $2) ON CONFLICT (guild_id) DO NOTHING'
-        await self.bot.db.execute(query, guild.id, case if case else 0)
-        if not case:
-            self.bot.case_num[guild.id] = 1
         for num, member in enumerate(members, start=0):
             ban_list.append(f"`[{num + 1}]` {member} ({member.id})")
-            await self.insert_new_case(mod.id, log_channel.id, case, member.id, guild.id, 1, reason)
+        case = await self.new_case(guild.id, mod.id, log_channel.id, [member.id for member in members], 1, reason)
 
         embed = discord.Embed(color=self.bot.settings['colors']['ban_color'], timestamp=datetime.now(timezone.utc))
         embed.set_author(name=mod, icon_url=mod.avatar_url, url=f'https://discord.com/users/{mod.id}')
         embed.title = _("{0} {1} Member(s) hack-banned").format(self.bot.settings['emojis']['logs']['ban'], len(members))
         embed.description = _("**Member(s):**\n{0}{1}\n**Moderator:** {2} ({3})\n**Reason:** {4}").format("\n".join(ban_list[:10]), '' if len(ban_list) <= 10 else f"\n**(+{len(ban_list) - 10}**)",
                                                                                                           mod, mod.id, reason)
-        embed.set_footer(text=_("Case ID: #{0}").format(case if case else 1))
+        embed.set_footer(text=_("Case ID: #{0}").format(case))
 
+        message = await self.bot.log_delivery.send_case(log_channel, embed)
         try:
-            message = await log_channel.send(embed=embed)
-            await self.update_old_case(message.id, guild.id, case)
+            await self.link_case(guild.id, case, message)
         except Exception as e:
             await default.background_error(self, '`hackban members (manual)`', e, guild, log_channel)
 
     @commands.Cog.listener()
+    @needs_cache('cache', 'guild_settings')
     async def on_kick(self, guild, mod, members, reason):
         moderation = CM.get(self.bot, 'moderation', guild.id)
-        case = CM.get(self.bot, 'case_num', guild.id)
         if not moderation:
             return
         log_channel = self.bot.get_channel(moderation)
         reason = reason or "No reason"
 
         kick_list = []
-        query = 'INSERT INTO cases(guild_id, case_num) VALUES($1, $2) ON CONFLICT (guild_id) DO NOTHING'
-        await self.bot.db.execute(query, guild.id, case if case else 0)
-        if not case:
-            self.bot.case_num[guild.id] = 1
         for num, member in enumerate(members, start=0):
             kick_list.append(f"`[{num + 1}]` {member} ({member.id})")
-            await self.insert_new_case(mod.id, log_channel.id, case, member.id, guild.id, 2, reason)
+        case = await self.new_case(guild.id, mod.id, log_channel.id, [member.id for member in members], 2, reason)
 
         embed = discord.Embed(color=self.bot.settings['colors']['kick_color'], timestamp=datetime.now(timezone.utc))
         embed.set_author(name=mod, icon_url=mod.avatar_url, url=f'https://discord.com/users/{mod.id}')
         embed.title = _("{0} {1} Member(s) kicked").format(self.bot.settings['emojis']['logs']['memberleave'], len(members))
         embed.description = _("**Member(s):**\n{0}\n**Moderator:** {1} ({2})\n**Reason:** {3}").format("\n".join(kick_list),
                                                                                                        mod, mod.id, reason)
-        embed.set_footer(text=_("Case ID: #{0}").format(case if case else 1))
+        embed.set_footer(text=_("Case ID: #{0}").format(case))
 
+        message = await self.bot.log_delivery.send_case(log_channel, embed)
         try:
-            message = await log_channel.send(embed=embed)
-            await self.update_old_case(message.id, guild.id, case)
+            await self.link_case(guild.id, case, message)
         except Exception as e:
             await default.background_error(self, '`kick members (manual)`', e, guild, log_channel)
 
     @commands.Cog.listener()
+    @needs_cache('cache', 'guild_settings')
     async def on_softban(self, guild, mod, members, reason):
         moderation = CM.get(self.bot, 'moderation', guild.id)
-        case = CM.get(self.bot, 'case_num', guild.id)
         if not moderation:
             return
         log_channel = self.bot.get_channel(moderation)
         reason = reason or "No reason"
 
         kick_list = []
-        query = 'INSERT INTO cases(guild_id, case_num) VALUES($1, $2) ON CONFLICT (guild_id) DO NOTHING'
-        await self.bot.db.execute(query, guild.id, case if case else 0)
-        if not case:
-            self.bot.case_num[guild.id] = 1
         for num, member in enumerate(members, start=0):
             kick_list.append(f"`[{num + 1}]` {member} ({member.id})")
-            await self.insert_new_case(mod.id, log_channel.id, case, member.id, guild.id, 3, reason)
+        case = await self.new_case(guild.id, mod.id, log_channel.id, [member.id for member in members], 3, reason)
 
         embed = discord.Embed(color=self.bot.settings['colors']['kick_color'], timestamp=datetime.now(timezone.utc))
         embed.set_author(name=mod, icon_url=mod.avatar_url, url=f'https://discord.com/users/{mod.id}')
         embed.title = _("{0} {1} Member(s) softbanned").format(self.bot.settings['emojis']['logs']['memberleave'], len(members))
         embed.description = _("**Member(s):**\n{0}\n**Moderator:** {1} ({2})\n**Reason:** {3}").format("\n".join(kick_list),
                                                                                                        mod, mod.id, reason)
-        embed.set_footer(text=_("Case ID: #{0}").format(case if case else 1))
+        embed.set_footer(text=_("Case ID: #{0}").format(case))
 
+        message = await self.bot.log_delivery.send_case(log_channel, embed)
         try:
-            message = await log_channel.send(embed=embed)
-            await self.update_old_case(message.id, guild.id, case)
+            await self.link_case(guild.id, case, message)
         except Exception as e:
             await default.background_error(self, '`softban members (manual)`', e, guild, log_channel)
 
     @commands.Cog.listener()
+    @needs_cache('cache', 'guild_settings')
     async def on_mute(self, guild, mod, members, duration, reason, created_at):
         moderation = CM.get(self.bot, 'moderation', guild.id)
-        case = CM.get(self.bot, 'case_num', guild.id)
         if not moderation:
             return
         log_channel = self.bot.get_channel(moderation)
@@ -679,13 +753,9 @@ class Logging(commands.Cog):
         reason = reason or "No reason"
 
         ban_list = []
-        query = 'INSERT INTO cases(guild_id, case_num) VALUES($1, $2) ON CONFLICT (guild_id) DO NOTHING'
-        await self.bot.db.execute(query, guild.id, case if case else 0)
-        if not case:
-            self.bot.case_num[guild.id] = 1
         for num, member in enumerate(members, start=0):
             ban_list.append(f"`[{num + 1}]` {member} ({member.id})")
-            await self.insert_new_case(mod.id, log_channel.id, case, member.id, guild.id, 4, reason)
+        case = await self.new_case(guild.id, mod.id, log_channel.id, [member.id for member in members], 4, reason)
 
         embed = discord.Embed(color=self.bot.settings['colors']['kick_color'], timestamp=datetime.now(timezone.utc))
         embed.set_author(name=mod, icon_url=mod.avatar_url, url=f'https://discord.com/users/{mod.id}')
@@ -693,62 +763,54 @@ class Logging(commands.Cog):
         embed.description = _("**Member(s):**\n{0}{1}\n**Moderator:** {2} ({3})\n**Reason:** {4}").format("\n".join(ban_list),
                                                                                                           _("\n**Duration:** {0}").format(time) if time else '',
                                                                                                           mod, mod.id, reason)
-        embed.set_footer(text=_("Case ID: #{0}").format(case if case else 1))
+        embed.set_footer(text=_("Case ID: #{0}").format(case))
 
+        message = await self.bot.log_delivery.send_case(log_channel, embed)
         try:
-            message = await log_channel.send(embed=embed)
-            await self.update_old_case(message.id, guild.id, case)
+            await self.link_case(guild.id, case, message)
         except Exception as e:
             await default.background_error(self, '`mute members (manual)`', e, guild, log_channel)
 
     @commands.Cog.listener()
+    @needs_cache('cache', 'guild_settings')
     async def on_warn(self, guild, mod, members, reason):
         moderation = CM.get(self.bot, 'moderation', guild.id)
-        case = CM.get(self.bot, 'case_num', guild.id)
         if not moderation:
             return
         log_channel = self.bot.get_channel(moderation)
         reason = reason or "No reason"
 
         warn_list = []
-        query = 'INSERT INTO cases(guild_id, case_num) VALUES($1, $2) ON CONFLICT (guild_id) DO NOTHING'
-        await self.bot.db.execute(query, guild.id, case if case else 0)
-        if not case:
-            self.bot.case_num[guild.id] = 1
         for num, member in enumerate(members, start=0):
             warn_list.append(f"`[{num + 1}]` {member} ({member.id})")
-            await self.insert_new_case(mod.id, log_channel.id, case, member.id, guild.id, 5, reason)
+        case = await self.new_case(guild.id, mod.id, log_channel.id, [member.id for member in members], 5, reason)
 
         embed = discord.Embed(color=self.bot.settings['colors']['warn_color'], timestamp=datetime.now(timezone.utc))
         embed.set_author(name=mod, icon_url=mod.avatar_url, url=f'https://discord.com/users/{mod.id}')
         embed.title = _("{0} {1} Member(s) warned").format(self.bot.settings['emojis']['logs']['memberedit'], len(members))
         embed.description = _("**Member(s):**\n{0}\n**Moderator:** {1} ({2})\n**Reason:** {3}").format("\n".join(warn_list),
                                                                                                        mod, mod.id, reason)
-        embed.set_footer(text=_("Case ID: #{0}").format(case if case else 1))
+        embed.set_footer(text=_("Case ID: #{0}").format(case))
 
+        message = await self.bot.log_delivery.send_case(log_channel, embed)
         try:
-            message = await log_channel.send(embed=embed)
-            await self.update_old_case(message.id, guild.id, case)
+            await self.link_case(guild.id, case, message)
         except Exception as e:
             await default.background_error(self, '`warn members (manual)`', e, guild, log_channel)
 
     @commands.Cog.listener()
+    @needs_cache('cache', 'guild_settings')
     async def on_unban(self, guild, mod, members, reason):
         moderation = CM.get(self.bot, 'moderation', guild.id)
-        case = CM.get(self.bot, 'case_num', guild.id)
         if not moderation:
             return
         log_channel = self.bot.get_channel(moderation)
         reason = reason or "No Reason"
 
         unban_list = []
-        query = 'INSERT INTO cases(guild_id, case_num) VALUES($1, $2) ON CONFLICT (guild_id) DO NOTHING'
-        await self.bot.db.execute(query, guild.id, case if case else 0)
-        if not case:
-            self.bot.case_num[guild.id] = 1
         for num, member in enumerate(members, start=0):
             unban_list.append(f"`[{num + 1}]` {member} ({member.id})")
-            await self.insert_new_case(mod.id, log_channel.id, case, member.id, guild.id, 6, reason)
+        case = await self.new_case(guild.id, mod.id, log_channel.id, [member.id for member in members], 6, reason)
 
         unban_lists = unban_list if len(unban_list) <= 10 else unban_list[:10]
 
@@ -757,167 +819,141 @@ class Logging(commands.Cog):
         embed.title = _("{0} {1} Member(s) un-banned").format(self.bot.settings['emojis']['logs']['unban'], len(members))
         embed.description = _("**Member(s):**\n{0}{1}\n**Moderator:** {2} ({3})\n**Reason:** {4}").format("\n".join(unban_lists), '' if len(unban_list) <= 10 else f"\n**(+{len(unban_list) - 10}**)",
                                                                                                           mod, mod.id, reason)
-        embed.set_footer(text=_("Case ID: #{0}").format(case if case else 1))
+        embed.set_footer(text=_("Case ID: #{0}").format(case))
 
+        message = await self.bot.log_delivery.send_case(log_channel, embed)
         try:
-            message = await log_channel.send(embed=embed)
-            await self.update_old_case(message.id, guild.id, case)
+            await self.link_case(guild.id, case, message)
         except Exception as e:
             await default.background_error(self, '`unban members (manual)`', e, guild, log_channel)
 
     @commands.Cog.listener()
+    @needs_cache('cache', 'guild_settings')
     async def on_unmute(self, guild, mod, members, reason):
         moderation = CM.get(self.bot, 'moderation', guild.id)
-        case = CM.get(self.bot, 'case_num', guild.id)
         if not moderation:
             return
         log_channel = self.bot.get_channel(moderation)
         reason = reason or "No Reason"
 
         unmute_list = []
-        query = 'INSERT INTO cases(guild_id, case_num) VALUES($1, $2) ON CONFLICT (guild_id) DO NOTHING'
-        await self.bot.db.execute(query, guild.id, case if case else 0)
-        if not case:
-            self.bot.case_num[guild.id] = 1
         for num, member in enumerate(members, start=0):
             unmute_list.append(f"`[{num + 1}]` {member} ({member.id})")
-            await self.insert_new_case(mod.id, log_channel.id, case, member.id, guild.id, 7, reason)
+        case = await self.new_case(guild.id, mod.id, log_channel.id, [member.id for member in members], 7, reason)
 
         embed = discord.Embed(color=self.bot.settings['colors']['approve_color'], timestamp=datetime.now(timezone.utc))
         embed.set_author(name=mod, icon_url=mod.avatar_url, url=f'https://discord.com/users/{mod.id}')
         embed.title = _("{0} {1} Member(s) un-muted").format(self.bot.settings['emojis']['logs']['memberedit'], len(members))
         embed.description = _("**Member(s):**\n{0}\n**Moderator:** {1} ({2})\n**Reason:** {3}").format("\n".join(unmute_list),
                                                                                                        mod, mod.id, reason)
-        embed.set_footer(text=_("Case ID: #{0}").format(case if case else 1))
+        embed.set_footer(text=_("Case ID: #{0}").format(case))
 
+        message = await self.bot.log_delivery.send_case(log_channel, embed)
         try:
-            message = await log_channel.send(embed=embed)
-            await self.update_old_case(message.id, guild.id, case)
+            await self.link_case(guild.id, case, message)
         except Exception as e:
             await default.background_error(self, '`unmute members (manual)`', e, guild, log_channel)
 
     @commands.Cog.listener()
+    @needs_cache('cache', 'guild_settings')
     async def on_member_kick(self, guild, user):
-        await asyncio.sleep(1)
         moderation = CM.get(self.bot, 'moderation', guild.id)
-        case = CM.get(self.bot, 'case_num', guild.id)
         if not moderation:
             return
         if not guild.me.guild_permissions.view_audit_log:
             return
-        mod, reason = None, ""
-        async for entry in guild.audit_logs(action=discord.AuditLogAction.kick, limit=5):
-            if entry.target == user:
-                if (datetime.utcnow() - entry.created_at.replace(tzinfo=None)).total_seconds() < 3:
-                    mod = entry.user
-                    reason += f"{entry.reason}"
-
-        if mod is None:
+        entry = await self.bot.audit_logs.find(guild, discord.AuditLogAction.kick, user.id)
+        if entry is None:
             return
+        mod, reason = entry.user, f"{entry.reason}"
 
         if mod == self.bot.user:
             return
         reason = reason if reason != "None" else "No reason"
 
         log_channel = self.bot.get_channel(moderation)
-        query = 'INSERT INTO cases(guild_id, case_num) VALUES($1, $2) ON CONFLICT (guild_id) DO NOTHING'
-        await self.bot.db.execute(query, guild.id, case if case else 0)
-        if not case:
-            self.bot.case_num[guild.id] = 1
-        await self.insert_new_case(mod.id, log_channel.id, case, user.id, guild.id, 2, reason)
+        case = await self.new_case(guild.id, mod.id, log_channel.id, [user.id], 2, reason)
 
         embed = discord.Embed(color=self.bot.settings['colors']['kick_color'], timestamp=datetime.now(timezone.utc))
         embed.set_author(name=mod, icon_url=mod.avatar_url, url=f'https://discord.com/users/{mod.id}')
         embed.title = _("{0} A member has been kicked").format(self.bot.settings['emojis']['logs']['memberleave'])
         the_user = f"{user} ({user.id})"
         embed.description = _("**Member:** {0}\n**Moderator:** {1} ({2})\n**Reason:** {3}").format(the_user, mod, mod.id, reason)
-        embed.set_footer(text=_("Case ID: #{0}").format(case if case else 1))
+        embed.set_footer(text=_("Case ID: #{0}").format(case))
 
+        message = await self.bot.log_delivery.send_case(log_channel, embed)
         try:
-            message = await log_channel.send(embed=embed)
-            await self.update_old_case(message.id, guild.id, case)
+            await self.link_case(guild.id, case, message)
         except Exception as e:
             await default.background_error(self, '`kick members`', e, guild, log_channel)
 
     @commands.Cog.listener()
+    @needs_cache('cache', 'guild_settings')
     async def on_voice_mute(self, guild, mod, members, reason):
         moderation = CM.get(self.bot, 'moderation', guild.id)
-        case = CM.get(self.bot, 'case_num', guild.id)
         if not moderation:
             return
         log_channel = self.bot.get_channel(moderation)
         reason = reason or "No reason"
 
         mute_list = []
-        query = 'INSERT INTO cases(guild_id, case_num) VALUES($1, $2) ON CONFLICT (guild_id) DO NOTHING'
-        await self.bot.db.execute(query, guild.id, case if case else 0)
-        if not case:
-            self.bot.case_num[guild.id] = 1
         for num, member in enumerate(members, start=0):
             mute_list.append(f"`[{num + 1}]` {member} ({member.id})")
-            await self.insert_new_case(mod.id, log_channel.id, case, member.id, guild.id, 8, reason)
+        case = await self.new_case(guild.id, mod.id, log_channel.id, [member.id for member in members], 8, reason)
 
         embed = discord.Embed(color=self.bot.settings['colors']['update_color'], timestamp=datetime.now(timezone.utc))
         embed.set_author(name=mod, icon_url=mod.avatar_url, url=f'https://discord.com/users/{mod.id}')
         embed.title = _("{0} {1} Member(s) voice muted").format(self.bot.settings['emojis']['logs']['vmute'], len(members))
         embed.description = _("**Member(s):**\n{0}\n**Moderator:** {1} ({2})\n**Reason:** {3}").format("\n".join(mute_list),
                                                                                                        mod, mod.id, reason)
-        embed.set_footer(text=_("Case ID: #{0}").format(case if case else 1))
+        embed.set_footer(text=_("Case ID: #{0}").format(case))
 
+        message = await self.bot.log_delivery.send_case(log_channel, embed)
         try:
-            message = await log_channel.send(embed=embed)
-            await self.update_old_case(message.id, guild.id, case)
+            await self.link_case(guild.id, case, message)
         except Exception as e:
             await default.background_error(self, '`voice mute members (manual)`', e, guild, log_channel)
 
     @commands.Cog.listener()
+    @needs_cache('cache', 'guild_settings')
     async def on_voice_unmute(self, guild, mod, members, reason):
         moderation = CM.get(self.bot, 'moderation', guild.id)
-        case = CM.get(self.bot, 'case_num', guild.id)
         if not moderation:
             return
         log_channel = self.bot.get_channel(moderation)
         reason = reason or "No reason"
 
         mute_list = []
-        query = 'INSERT INTO cases(guild_id, case_num) VALUES($1, $2) ON CONFLICT (guild_id) DO NOTHING'
-        await self.bot.db.execute(query, guild.id, case if case else 0)
-        if not case:
-            self.bot.case_num[guild.id] = 1
         for num, member in enumerate(members, start=0):
             mute_list.append(f"`[{num + 1}]` {member} ({member.id})")
-            await self.insert_new_case(mod.id, log_channel.id, case, member.id, guild.id, 9, reason)
+        case = await self.new_case(guild.id, mod.id, log_channel.id, [member.id for member in members], 9, reason)
 
         embed = discord.Embed(color=self.bot.settings['colors']['update_color'], timestamp=datetime.now(timezone.utc))
         embed.set_author(name=mod, icon_url=mod.avatar_url, url=f'https://discord.com/users/{mod.id}')
         embed.title = _("{0} {1} Member(s) voice unmuted").format(self.bot.settings['emojis']['logs']['vunmute'], len(members))
         embed.description = _("**Member(s):**\n{0}\n**Moderator:** {1} ({2})\n**Reason:** {3}").format("\n".join(mute_list),
                                                                                                        mod, mod.id, reason)
-        embed.set_footer(text=_("Case ID: #{0}").format(case if case else 1))
+        embed.set_footer(text=_("Case ID: #{0}").format(case))
 
+        message = await self.bot.log_delivery.send_case(log_channel, embed)
         try:
-            message = await log_channel.send(embed=embed)
-            await self.update_old_case(message.id, guild.id, case)
+            await self.link_case(guild.id, case, message)
         except Exception as e:
             await default.background_error(self, '`voice unmute members (manual)`', e, guild, log_channel)
 
     @commands.Cog.listener()
+    @needs_cache('cache', 'guild_settings')
     async def on_dehoist(self, guild, mod, members):
         moderation = CM.get(self.bot, 'moderation', guild.id)
-        case = CM.get(self.bot, 'case_num', guild.id)
         if not moderation:
             return
         log_channel = self.bot.get_channel(moderation)
         reason = None
 
         dehoist_list = []
-        query = 'INSERT INTO cases(guild_id, case_num) VALUES($1, $2) ON CONFLICT (guild_id) DO NOTHING'
-        await self.bot.db.execute(query, guild.id, case if case else 0)
-        if not case:
-            self.bot.case_num[guild.id] = 1
         for num, member in enumerate(members, start=0):
             dehoist_list.append(f"`[{num + 1}]` {member} ({member.id})")
-            await self.insert_new_case(mod.id, log_channel.id, case, member.id, guild.id, 10, reason)
+        case = await self.new_case(guild.id, mod.id, log_channel.id, [member.id for member in members], 10, reason)
 
         dehoist_lists = dehoist_list if len(dehoist_list) <= 10 else dehoist_list[:10]
 
@@ -926,17 +962,18 @@ class Logging(commands.Cog):
         embed.title = _("{0} {1} Member(s) dehoisted").format(self.bot.settings['emojis']['logs']['memberedit'], len(members))
         embed.description = _("**Member(s):**\n{0}{1}\n**Moderator:** {2} ({3})\n").format("\n".join(dehoist_lists), '' if len(dehoist_list) <= 10 else f"\n**(+{len(dehoist_list) - 10}**)",
                                                                                            mod, mod.id)
-        embed.set_footer(text=_("Case ID: #{0}").format(case if case else 1))
+        embed.set_footer(text=_("Case ID: #{0}").format(case))
 
+        message = await self.bot.log_delivery.send_case(log_channel, embed)
         try:
-            message = await log_channel.send(embed=embed)
-            await self.update_old_case(message.id, guild.id, case)
+            await self.link_case(guild.id, case, message)
         except Exception as e:
             await default.background_error(self, '`unban members (manual)`', e, guild, log_channel)
 
 # Support Server Events
 
     @commands.Cog.listener('on_member_update')
+    @needs_cache('cache', 'guild_settings')
     async def on_booster_append(self, before, after):
         if before.guild.id != 671078170874740756:
             return
@@ -968,6 +1005,7 @@ class Logging(commands.Cog):
                     self.bot.badges[before.id] = 256
 
     @commands.Cog.listener('on_member_join')
+    @needs_cache('cache', 'guild_settings')
     async def anti_join_dehoist(self, member):
         check = CM.get(self.bot, 'antihoist', member.guild.id)
 
@@ -980,19 +1018,11 @@ class Logging(commands.Cog):
         if not check:
             return
 
-        nick = member.display_name
-        chosen_nick = check['nickname']
-        logchannel = check['channel']
-        chosen_nick = chosen_nick or 'z (hoister)'
-        if logchannel:
-            channel = member.guild.get_channel(logchannel)
-        if not nick[0].isalnum():
-            await asyncio.sleep(60)
-            if not nick[0].isalnum():
-                await member.edit(nick=chosen_nick, reason='Anti hoist')
-                self.bot.dispatch('dehoist', member.guild, member.guild.me, [member])
+        if not member.display_name[0].isalnum():
+            self.schedule_dehoist(member)
 
     @commands.Cog.listener('on_member_update')
+    @needs_cache('cache', 'guild_settings')
     async def anti_edit_dehoist(self, before, after):
         check = CM.get(self.bot, 'antihoist', before.guild.id)
 
@@ -1005,17 +1035,8 @@ class Logging(commands.Cog):
         if not check:
             return
 
-        nick = after.display_name
-        chosen_nick = check['nickname']
-        logchannel = check['channel']
-        chosen_nick = chosen_nick or 'z (hoister)'
-        if logchannel:
-            channel = after.guild.get_channel(logchannel)
-        if not nick[0].isalnum():
-            await asyncio.sleep(60)
-            if not nick[0].isalnum():
-                await after.edit(nick=chosen_nick, reason='Anti hoist')
-                self.bot.dispatch('dehoist', after.guild, after.guild.me, [after])
+        if not after.display_name[0].isalnum():
+            self.schedule_dehoist(after)
 
 
 def setup(bot):
@@ -28,6 +28,7 @@ class fun(commands.Cog, name="Fun"):
     def __init__(self, bot):
         self.bot = bot
         self.help_icon = "<:funn:747192603564441680>"
+        self.needs_cache = False  # only reads the critical caches, commands don't wait for the full warm-up
         self.big_icon = "https://cdn.discordapp.com/emojis/747192603564441680.png?v=1"
 
     @commands.command(brief="Rate something")
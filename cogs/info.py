@@ -182,12 +182,13 @@ Dredd is a bot that will help your server with moderation, provide fun to your m
             if len(uroles) > 15:
                 uroles = [f"{', '.join(uroles[:10])} (+{len(member.roles) - 11})"]
             if not member.bot:
-                if CM.get(self.bot, 'nicks_op', member.id) is None:
+                if CM.get(self.bot, 'nicks_op', (member.id, ctx.guild.id)) is None:
                     nicks += _('\n**Latest nicknames:**  ')
                     nicknames = await self.bot.db.fetch("SELECT * FROM nicknames WHERE user_id = $1 AND guild_id = $2 ORDER BY time DESC LIMIT 5", user.id, ctx.guild.id)
+                    nicknames = (self.bot.nickname_buffer.get(user.id, ctx.guild.id) + [nickk['nickname'] for nickk in nicknames])[:5]
                     if nicknames:
                         for nickk in nicknames:
-                            nicks += f"{escape_markdown(nickk['nickname'], as_needed=False)}, "
+                            nicks += f"{escape_markdown(nickk, as_needed=False)}, "
                     if not nicknames:
                         nicks += 'N/A  '
             user_roles = _(' **({0} Total)**').format(len(member.roles) - 1) if uroles != [] else _('No roles')
@@ -208,9 +209,9 @@ Dredd is a bot that will help your server with moderation, provide fun to your m
 
         else:
 
-            guilds = [x for x in self.bot.guilds if x.get_member(user.id)]
             try:
-                member = guilds[0].get_member(user.id)
+                guild = self.bot.get_guild(next(iter(self.bot.mutuals.get(user.id))))
+                member = guild.get_member(user.id)
                 status = default.member_status(ctx, member)
                 act = default.member_activity(ctx, member)
             except Exception:
@@ -246,6 +247,7 @@ Dredd is a bot that will help your server with moderation, provide fun to your m
 
         if not ctx.guild.chunked:
             await ctx.guild.chunk(cache=True)
+            self.bot.mutuals.add_guild(ctx.guild)
 
         acks = default.server_badges(ctx, ctx.guild)
         ack = _("\n**Acknowledgements:** {0}").format(acks) if acks else ''
@@ -556,16 +558,17 @@ Dredd is a bot that will help your server with moderation, provide fun to your m
         """ History of member nicknames """
         member = member or ctx.author
 
-        if CM.get(self.bot, 'nicks_op', f'{ctx.author.id} - {ctx.guild.id}'):
+        if CM.get(self.bot, 'nicks_op', (ctx.author.id, ctx.guild.id)):
             return await ctx.send(_("{0} | **{1}** has opted out of nickname logging.").format(
                 self.bot.settings['emojis']['misc']['warn'],
                 member
             ))
 
         nicks = await self.bot.db.fetch("SELECT * FROM nicknames WHERE user_id = $1 AND guild_id = $2 ORDER BY time DESC LIMIT 10", member.id, ctx.guild.id)
-        names = []
+        names = self.bot.nickname_buffer.get(member.id, ctx.guild.id)
         for n in nicks:
             names.append(str(n['nickname']))
+        names = names[:10]
 
         if not names:
             return await ctx.send(_("{0} | **{1}** has had no past nicknames since I joined.").format(
@@ -807,6 +810,7 @@ Dredd is a bot that will help your server with moderation, provide fun to your m
 
         if not ctx.guild.chunked:
             await self.bot.request_offline_members(ctx.guild)
+            self.bot.mutuals.add_guild(ctx.guild)
         members = sorted(ctx.guild.members, key=lambda m: m.joined_at.replace(tzinfo=None), reverse=True)[:counts]
         e = discord.Embed(title=_('Newest member(s) in this server:'), colour=self.bot.settings['colors']['embed_color'])
         for num, member in enumerate(members, start=1):
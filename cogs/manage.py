@@ -205,20 +205,17 @@ class Manage(commands.Cog, name='Management', aliases=['Manage']):
         memberlogs = self.bot.cache.get(self.bot, 'memberlog', ctx.guild.id)
 
         if memberlogs and not channel:
-            await self.bot.db.execute("DELETE from memberlog WHERE guild_id = $1", ctx.guild.id)
-            self.bot.memberlog.pop(ctx.guild.id)
+            await self.bot.guild_settings.update(ctx.guild.id, memberlog=None)
             return await ctx.send(_("{0} Successfully disabled member logs.").format(self.bot.settings['emojis']['misc']['white-mark']))
         elif memberlogs and channel:
-            await self.bot.db.execute("UPDATE memberlog SET channel_id = $1 WHERE guild_id = $2", channel.id, ctx.guild.id)
-            self.bot.memberlog[ctx.guild.id] = channel.id
+            await self.bot.guild_settings.update(ctx.guild.id, memberlog=channel.id)
             return await ctx.send(_("{0} Successfully changed the member logging channel. I will now send member updates in {1}.").format(self.bot.settings['emojis']['misc']['white-mark'],
                                                                                                                                           channel.mention))
         elif not memberlogs and not channel:
             return await ctx.send(_("{0} You don't have member logs enabled in this server."
                                     "\n*Hint: If you want to enable logging, you need to provide a channel where logging should be sent to*").format(self.bot.settings['emojis']['misc']['warn']))
         elif not memberlogs and channel:
-            await self.bot.db.execute("INSERT INTO memberlog VALUES($1, $2)", ctx.guild.id, channel.id)
-            self.bot.memberlog[ctx.guild.id] = channel.id
+            await self.bot.guild_settings.update(ctx.guild.id, memberlog=channel.id)
             return await ctx.send(_("{0} Successfully enabled member logs. I will now send member updates in {1}.").format(self.bot.settings['emojis']['misc']['white-mark'],
                                                                                                                            channel.mention))
 
@@ -238,12 +235,10 @@ class Manage(commands.Cog, name='Management', aliases=['Manage']):
         joinlogs = self.bot.cache.get(self.bot, 'joinlog', ctx.guild.id)
 
         if joinlogs and not channel:
-            await self.bot.db.execute("DELETE from joinlog WHERE guild_id = $1", ctx.guild.id)
-            self.bot.joinlog.pop(ctx.guild.id)
+            await self.bot.guild_settings.update(ctx.guild.id, joinlog=None)
             return await ctx.send(_("{0} New members logging was successfully disabled.").format(self.bot.settings['emojis']['misc']['white-mark']))
         elif joinlogs and channel:
-            await self.bot.db.execute("UPDATE joinlog SET channel_id = $1 WHERE guild_id = $2", channel.id, ctx.guild.id)
-            self.bot.joinlog[ctx.guild.id] = channel.id
+            await self.bot.guild_settings.update(ctx.guild.id, joinlog=channel.id)
             self.bot.dispatch('member_joinlog', ctx.author)
             return await ctx.send(_("{0} Successfully changed the new member logging channel. I will now send member updates in {1}.").format(self.bot.settings['emojis']['misc']['white-mark'],
                                                                                                                                               channel.mention))
@@ -251,8 +246,7 @@ class Manage(commands.Cog, name='Management', aliases=['Manage']):
             return await ctx.send(_("{0} You don't have new member logs enabled in this server."
                                     "\n*Hint: If you want to enable logging, you need to provide a channel where logging should be sent to*").format(self.bot.settings['emojis']['misc']['warn']))
         elif not joinlogs and channel:
-            await self.bot.db.execute("INSERT INTO joinlog VALUES($1, $2)", ctx.guild.id, channel.id)
-            self.bot.joinlog[ctx.guild.id] = channel.id
+            await self.bot.guild_settings.update(ctx.guild.id, joinlog=channel.id)
             self.bot.dispatch('member_joinlog', ctx.author)
             return await ctx.send(_("{0} Successfully enabled new member logging. I will now send member updates in {1}.").format(self.bot.settings['emojis']['misc']['white-mark'],
                                                                                                                                   channel.mention))
@@ -273,12 +267,10 @@ class Manage(commands.Cog, name='Management', aliases=['Manage']):
         leavelogs = self.bot.cache.get(self.bot, 'leavelog', ctx.guild.id)
 
         if leavelogs and not channel:
-            await self.bot.db.execute("DELETE from leavelog WHERE guild_id = $1", ctx.guild.id)
-            self.bot.leavelog.pop(ctx.guild.id)
+            await self.bot.guild_settings.update(ctx.guild.id, leavelog=None)
             return await ctx.send(_("{0} Successfully disabled leave member logs.").format(self.bot.settings['emojis']['misc']['white-mark']))
         elif leavelogs and channel:
-            await self.bot.db.execute("UPDATE leavelog SET channel_id = $1 WHERE guild_id = $2", channel.id, ctx.guild.id)
-            self.bot.leavelog[ctx.guild.id] = channel.id
+            await self.bot.guild_settings.update(ctx.guild.id, leavelog=channel.id)
             self.bot.dispatch('member_leavelog', ctx.author)
             return await ctx.send(_("{0} Successfully changed the leave member logging channel. I will now send member updates in {1}.").format(self.bot.settings['emojis']['misc']['white-mark'],
                                                                                                                                                 channel.mention))
@@ -286,8 +278,7 @@ class Manage(commands.Cog, name='Management', aliases=['Manage']):
             return await ctx.send(_("{0} You don't have leave member logs enabled in this server."
                                     "\n*Hint: If you want to enable logging, you need to provide a channel where logging should be sent to*").format(self.bot.settings['emojis']['misc']['warn']))
         elif not leavelogs and channel:
-            await self.bot.db.execute("INSERT INTO leavelog VALUES($1, $2)", ctx.guild.id, channel.id)
-            self.bot.leavelog[ctx.guild.id] = channel.id
+            await self.bot.guild_settings.update(ctx.guild.id, leavelog=channel.id)
             self.bot.dispatch('member_leavelog', ctx.author)
             return await ctx.send(_("{0} Successfully changed the leave member logging channel. I will now send member leaves in {1}.").format(self.bot.settings['emojis']['misc']['white-mark'],
                                                                                                                                                channel.mention))
@@ -308,20 +299,17 @@ class Manage(commands.Cog, name='Management', aliases=['Manage']):
         guildlogs = self.bot.cache.get(self.bot, 'guildlog', ctx.guild.id)
 
         if guildlogs and not channel:
-            await self.bot.db.execute("DELETE from guildlog WHERE guild_id = $1", ctx.guild.id)
-            self.bot.guildlog.pop(ctx.guild.id)
+            await self.bot.guild_settings.update(ctx.guild.id, guildlog=None)
             return await ctx.send(_("{0} Successfully disabled guild log updates.").format(self.bot.settings['emojis']['misc']['white-mark']))
         elif guildlogs and channel:
-            await self.bot.db.execute("UPDATE guildlog SET channel_id = $1 WHERE guild_id = $2", channel.id, ctx.guild.id)
-            self.bot.guildlog[ctx.guild.id] = channel.id
+            await self.bot.guild_settings.update(ctx.guild.id, guildlog=channel.id)
             return await ctx.send(_("{0} Successfully changed the guild log updates channel. I will now send guild updates in {1}.").format(self.bot.settings['emojis']['misc']['white-mark'],
                                                                                                                                             channel.mention))
         elif not guildlogs and not channel:
             return await ctx.send(_("{0} You don't have guild update logging enabled in this server."
                                     "\n*Hint: If you want to enable logging, you need to provide a channel where logging should be sent to*").format(self.bot.settings['emojis']['misc']['warn']))
         elif not guildlogs and channel:
-            await self.bot.db.execute("INSERT INTO guildlog VALUES($1, $2)", ctx.guild.id, channel.id)
-            self.bot.guildlog[ctx.guild.id] = channel.id
+            await self.bot.guild_settings.update(ctx.guild.id, guildlog=channel.id)
             return await ctx.send(_("{0} Successfully enabled guild updates logging. I will now send guild updates in {1}.").format(self.bot.settings['emojis']['misc']['white-mark'],
                                                                                                                                     channel.mention))
 
@@ -339,20 +327,17 @@ class Manage(commands.Cog, name='Management', aliases=['Manage']):
         messageedit = self.bot.cache.get(self.bot, 'messageedits', ctx.guild.id)
 
         if messageedit and not channel:
-            await self.bot.db.execute("DELETE from messageedits WHERE guild_id = $1", ctx.guild.id)
-            self.bot.messageedits.pop(ctx.guild.id)
+            await self.bot.guild_settings.update(ctx.guild.id, messageedits=None)
             return await ctx.send(_("{0} Successfully disabled edit message logs.").format(self.bot.settings['emojis']['misc']['white-mark']))
         elif messageedit and channel:
-            await self.bot.db.execute("UPDATE messageedits SET channel_id = $1 WHERE guild_id = $2", channel.id, ctx.guild.id)
-            self.bot.messageedits[ctx.guild.id] = channel.id
+            await self.bot.guild_settings.update(ctx.guild.id, messageedits=channel.id)
             return await ctx.send(_("{0} Successfully updated the logging channel for edited messages to {1}.").format(self.bot.settings['emojis']['misc']['white-mark'],
                                                                                                                        channel.mention))
         elif not messageedit and not channel:
             return await ctx.send(_("{0} You don't have edit message logs enabled in this server."
                                     "\n*Hint: If you want to enable logging, you need to provide a channel where logging should be sent to*").format(self.bot.settings['emojis']['misc']['warn']))
         elif not messageedit and channel:
-            await self.bot.db.execute("INSERT INTO messageedits VALUES($1, $2)", ctx.guild.id, channel.id)
-            self.bot.messageedits[ctx.guild.id] = channel.id
+            await self.bot.guild_settings.update(ctx.guild.id, messageedits=channel.id)
             return await ctx.send(_("{0} Enabled edit message logging in {1}.").format(self.bot.settings['emojis']['misc']['white-mark'],
                                                                                        channel.mention))
 
@@ -370,20 +355,17 @@ class Manage(commands.Cog, name='Management', aliases=['Manage']):
         messagedelete = self.bot.cache.get(self.bot, 'messagedeletes', ctx.guild.id)
 
         if messagedelete and not channel:
-            await self.bot.db.execute("DELETE from messagedeletes WHERE guild_id = $1", ctx.guild.id)
-            self.bot.messagedeletes.pop(ctx.guild.id)
+            await self.bot.guild_settings.update(ctx.guild.id, messagedeletes=None)
             return await ctx.send(_("{0} Successfully disabled deleted message logs.").format(self.bot.settings['emojis']['misc']['white-mark']))
         elif messagedelete and channel:
-            await self.bot.db.execute("UPDATE messagedeletes SET channel_id = $1 WHERE guild_id = $2", channel.id, ctx.guild.id)
-            self.bot.messagedeletes[ctx.guild.id] = channel.id
+            await self.bot.guild_settings.update(ctx.guild.id, messagedeletes=channel.id)
             return await ctx.send(_("{0} Successfully updated the logging channel for deleted messages to {1}.").format(self.bot.settings['emojis']['misc']['white-mark'],
                                                                                                                         channel.mention))
         elif not messagedelete and not channel:
             return await ctx.send(_("{0} Deleted message logs are currently disabled in this server."
                                     "\n*Hint: If you want to enable logging, you need to provide a channel where logging should be sent to*").format(self.bot.settings['emojis']['misc']['warn']))
         elif not messagedelete and channel:
-            await self.bot.db.execute("INSERT INTO messagedeletes VALUES($1, $2)", ctx.guild.id, channel.id)
-            self.bot.messagedeletes[ctx.guild.id] = channel.id
+            await self.bot.guild_settings.update(ctx.guild.id, messagedeletes=channel.id)
             return await ctx.send(_("{0} Enabled deleted message logging in {1}.").format(self.bot.settings['emojis']['misc']['white-mark'],
                                                                                           channel.mention))
 
@@ -403,20 +385,17 @@ class Manage(commands.Cog, name='Management', aliases=['Manage']):
         moderation = self.bot.cache.get(self.bot, 'moderation', ctx.guild.id)
 
         if moderation and not channel:
-            await self.bot.db.execute("DELETE from moderation WHERE guild_id = $1", ctx.guild.id)
-            self.bot.moderation.pop(ctx.guild.id)
+            await self.bot.guild_settings.update(ctx.guild.id, moderation=None)
             return await ctx.send(_("{0} Moderation logging was successfully disabled.").format(self.bot.settings['emojis']['misc']['white-mark']))
         elif moderation and channel:
-            await self.bot.db.execute("UPDATE moderation SET channel_id = $1 WHERE guild_id = $2", channel.id, ctx.guild.id)
-            self.bot.moderation[ctx.guild.id] = channel.id
+            await self.bot.guild_settings.update(ctx.guild.id, moderation=channel.id)
             return await ctx.send(_("{0} Successfully updated the moderation logging channel to {1}.").format(self.bot.settings['emojis']['misc']['white-mark'],
                                                                                                               channel.mention))
         elif not moderation and not channel:
             return await ctx.send(_("{0} Moderation logs are currently disabled in this server."
                                     "\n*Hint: If you want to enable logging, you need to provide a channel where logging should be sent to*").format(self.bot.settings['emojis']['misc']['warn']))
         elif not moderation and channel:
-            await self.bot.db.execute("INSERT INTO moderation VALUES($1, $2)", ctx.guild.id, channel.id)
-            self.bot.moderation[ctx.guild.id] = channel.id
+            await self.bot.guild_settings.update(ctx.guild.id, moderation=channel.id)
             return await ctx.send(_("{0} Enabled moderation logging in {1}.").format(self.bot.settings['emojis']['misc']['white-mark'],
                                                                                      channel.mention))
 
@@ -431,31 +410,15 @@ class Manage(commands.Cog, name='Management', aliases=['Manage']):
         if channel and not channel.can_send or channel and not channel.permissions_for(ctx.guild.me).embed_links:
             return await ctx.send(_("{0} I'm missing permissions in that channel. Make sure you have given me the correct permissions!").format(self.bot.settings['emojis']['misc']['warn']))
 
-        options = ['moderation', 'memberlog', 'joinlog', 'leavelog', 'guildlog', 'messageedits', 'messagedeletes']
+        options = self.bot.guild_settings.LOGS
         if not channel:
-            count = 0
-            for option in options:
-                await self.bot.db.execute("DELETE from {0} WHERE guild_id = $1".format(option), ctx.guild.id)
-                data = hasattr(self.bot, option)
-                if data:
-                    attr = getattr(self.bot, option)
-                    try:
-                        attr.pop(ctx.guild.id)
-                    except Exception:
-                        count += 1
-                        pass
-            if count == 7:
+            if not any(self.bot.guild_settings.get(ctx.guild.id, option) for option in options):
                 return await ctx.send(_("{0} Logs are currently disabled in this server."
                                         "\n*Hint: If you want to enable logging, you need to provide a channel where logging should be sent to*").format(self.bot.settings['emojis']['misc']['warn']))
+            await self.bot.guild_settings.update(ctx.guild.id, **dict.fromkeys(options))
             return await ctx.send(_("{0} Successfully disabled logging.").format(self.bot.settings['emojis']['misc']['white-mark']))
         elif channel:
-            query = """INSERT INTO {0}(guild_id, channel_id) VALUES($1, $2) ON CONFLICT (guild_id) DO UPDATE SET channel_id = $2 WHERE {0}.guild_id = $1"""
-            for option in options:
-                await self.bot.db.execute(query.format(option), ctx.guild.id, channel.id)
-                data = hasattr(self.bot, option)
-                if data:
-                    attr = getattr(self.bot, option)
-                    attr[ctx.guild.id] = channel.id
+            await self.bot.guild_settings.update(ctx.guild.id, **dict.fromkeys(options, channel.id))
             return await ctx.send(_("{0} Enabled logging in {1}.").format(self.bot.settings['emojis']['misc']['white-mark'],
                                                                           channel.mention))
 
@@ -522,6 +485,7 @@ class Manage(commands.Cog, name='Management', aliases=['Manage']):
         if joinmessages and not channel:
             await self.bot.db.execute("DELETE from joinmessage WHERE guild_id = $1", ctx.guild.id)
             self.bot.joinmessage.pop(ctx.guild.id)
+            self.bot.welcome_templates.invalidate(ctx.guild.id, 'join')
             return await ctx.send(_("{0} Disabled welcome messages.").format(self.bot.settings['emojis']['misc']['white-mark']))
         elif joinmessages and channel:
             await self.bot.db.execute("UPDATE joinmessage SET channel_id = $1 WHERE guild_id = $2", channel.id, ctx.guild.id)
@@ -568,6 +532,7 @@ class Manage(commands.Cog, name='Management', aliases=['Manage']):
                                                                                                                                                          len(message) - 1000))
                 await self.bot.db.execute("UPDATE joinmessage SET message = $1 WHERE guild_id = $2", message, ctx.guild.id)
                 self.bot.joinmessage[ctx.guild.id]['message'] = message
+                self.bot.welcome_templates.invalidate(ctx.guild.id, 'join')
                 await ctx.send(_("{0} **Successfully set your welcome message to:**\n{1}").format(self.bot.settings['emojis']['misc']['white-mark'],
                                                                                                   message))
 
@@ -591,6 +556,7 @@ class Manage(commands.Cog, name='Management', aliases=['Manage']):
                                             "use <https://embedbuilder.nadekobot.me/> to create an embed dict, then paste the code here.").format(self.bot.settings['emojis']['misc']['warn']))
                 await self.bot.db.execute("UPDATE joinmessage SET message = $1 WHERE guild_id = $2", message, ctx.guild.id)
                 self.bot.joinmessage[ctx.guild.id]['message'] = message
+                self.bot.welcome_templates.invalidate(ctx.guild.id, 'join')
                 plainText = '' if 'plainText' not in jsonify else _("\n**Plain Text:** {0}").format(jsonify['plainText'])
                 await ctx.send(content=_("**Here is your new welcome embed:**{0}").format(plainText), embed=welcoming_embed)
 
@@ -614,11 +580,13 @@ class Manage(commands.Cog, name='Management', aliases=['Manage']):
                 await self.bot.db.execute("UPDATE joinmessage SET embedded = $1, message = $2 WHERE guild_id = $3", False, None, ctx.guild.id)
                 self.bot.joinmessage[ctx.guild.id]['embedded'] = False
                 self.bot.joinmessage[ctx.guild.id]['message'] = None
+                self.bot.welcome_templates.invalidate(ctx.guild.id, 'join')
                 await ctx.send(_("{0} Welcome messages will not be sent in embeds anymore.").format(self.bot.settings['emojis']['misc']['white-mark']))
             elif not joinmessage['embedded']:
                 await self.bot.db.execute("UPDATE joinmessage SET embedded = $1, message = $2 WHERE guild_id = $3", True, None, ctx.guild.id)
                 self.bot.joinmessage[ctx.guild.id]['embedded'] = True
                 self.bot.joinmessage[ctx.guild.id]['message'] = None
+                self.bot.welcome_templates.invalidate(ctx.guild.id, 'join')
                 await ctx.send(_("{0} Welcome messages will now be sent in embeds.").format(self.bot.settings['emojis']['misc']['white-mark']))
 
     @welcoming.command(name='bots',
@@ -674,6 +642,7 @@ class Manage(commands.Cog, name='Management', aliases=['Manage']):
         if leavemessages and not channel:
             await self.bot.db.execute("DELETE from leavemessage WHERE guild_id = $1", ctx.guild.id)
             self.bot.leavemessage.pop(ctx.guild.id)
+            self.bot.welcome_templates.invalidate(ctx.guild.id, 'leave')
             return await ctx.send(_("{0} Leave messages are now disabled.").format(self.bot.settings['emojis']['misc']['white-mark']))
         elif leavemessages and channel:
             await self.bot.db.execute("UPDATE leavemessage SET channel_id = $1 WHERE guild_id = $2", channel.id, ctx.guild.id)
@@ -720,6 +689,7 @@ class Manage(commands.Cog, name='Management', aliases=['Manage']):
                                                                                                                                                        len(message) - 1000))
                 await self.bot.db.execute("UPDATE leavemessage SET message = $1 WHERE guild_id = $2", message, ctx.guild.id)
                 self.bot.leavemessage[ctx.guild.id]['message'] = message
+                self.bot.welcome_templates.invalidate(ctx.guild.id, 'leave')
                 await ctx.send(_("{0} **Successfully set your leave message to:**\n{1}").format(self.bot.settings['emojis']['misc']['white-mark'],
                                                                                                 message))
 
@@ -743,6 +713,7 @@ class Manage(commands.Cog, name='Management', aliases=['Manage']):
                                             "use <https://embedbuilder.nadekobot.me/> to create an embed dict and then paste that code.").format(self.bot.settings['emojis']['misc']['warn']))
                 await self.bot.db.execute("UPDATE leavemessage SET message = $1 WHERE guild_id = $2", message, ctx.guild.id)
                 self.bot.leavemessage[ctx.guild.id]['message'] = message
+                self.bot.welcome_templates.invalidate(ctx.guild.id, 'leave')
                 plainText = '' if 'plainText' not in jsonify else _("\n**Plain Text:** {0}").format(jsonify['plainText'])
                 await ctx.send(content=_("**Here is your new leave member embed message:**{0}").format(plainText), embed=leaving_embed)
 
@@ -766,11 +737,13 @@ class Manage(commands.Cog, name='Management', aliases=['Manage']):
                 await self.bot.db.execute("UPDATE leavemessage SET embedded = $1, message = $2 WHERE guild_id = $3", False, None, ctx.guild.id)
                 self.bot.leavemessage[ctx.guild.id]['embedded'] = False
                 self.bot.leavemessage[ctx.guild.id]['message'] = None
+                self.bot.welcome_templates.invalidate(ctx.guild.id, 'leave')
                 await ctx.send(_("{0} Leave messages will no longer be sent in embeds.").format(self.bot.settings['emojis']['misc']['white-mark']))
             elif not leavemessage['embedded']:
                 await self.bot.db.execute("UPDATE leavemessage SET embedded = $1, message = $2 WHERE guild_id = $3", True, None, ctx.guild.id)
                 self.bot.leavemessage[ctx.guild.id]['embedded'] = True
                 self.bot.leavemessage[ctx.guild.id]['message'] = None
+                self.bot.welcome_templates.invalidate(ctx.guild.id, 'leave')
                 await ctx.send(_("{0} Leave messages will now be sent in embeds.").format(self.bot.settings['emojis']['misc']['white-mark']))
 
     @leaving.command(name='bots',
@@ -1188,15 +1161,15 @@ class Manage(commands.Cog, name='Management', aliases=['Manage']):
 
         if command.parent:
             if not command.name:
-                self.bot.guild_disabled[f"{str(command.parent)}, {ctx.guild.id}"] = str(command.parent)
+                self.bot.guild_disabled[(str(command.parent), ctx.guild.id)] = str(command.parent)
                 await self.bot.db.execute("INSERT INTO guild_disabled(guild_id, command) VALUES($1, $2)", ctx.guild.id, str(command.parent))
                 await ctx.send(f"{self.bot.settings['emojis']['misc']['white-mark']} | `{command.parent}` and its corresponding subcommands were successfully disabled")
             elif command.name:
-                self.bot.guild_disabled[f"{str(f'{command.parent} {command.name}')}, {ctx.guild.id}"] = str(commands.parent)
+                self.bot.guild_disabled[(command.qualified_name, ctx.guild.id)] = str(commands.parent)
                 await self.bot.db.execute("INSERT INTO guild_disabled(guild_id, command) VALUES($1, $2)", ctx.guild.id, str(f"{command.parent} {command.name}"))
                 await ctx.send(f"{self.bot.settings['emojis']['misc']['white-mark']} | `{command.parent} {command.name}` and its corresponding subcommands were successfully disabled")
         elif not command.parent:
-            self.bot.guild_disabled[f"{str(command)}, {ctx.guild.id}"] = str(command.name)
+            self.bot.guild_disabled[(str(command), ctx.guild.id)] = str(command.name)
             await self.bot.db.execute("INSERT INTO guild_disabled(guild_id, command) VALUES($1, $2)", ctx.guild.id, str(command.name))
             await ctx.send(f"{self.bot.settings['emojis']['misc']['white-mark']} | `{command}` was successfully disabled")
 
@@ -1223,15 +1196,15 @@ class Manage(commands.Cog, name='Management', aliases=['Manage']):
 
         if command.parent:
             if not command.name:
-                self.bot.guild_disabled.pop(f"{str(command.parent)}, {ctx.guild.id}")
+                self.bot.guild_disabled.pop((str(command.parent), ctx.guild.id))
                 await self.bot.db.execute("DELETE FROM guild_disabled WHERE command = $1 AND guild_id = $2", str(command.parent), ctx.guild.id)
                 await ctx.send(f"{self.bot.settings['emojis']['misc']['white-mark']} | `{command.parent}` and its corresponding subcommands were successfully re-enabled")
             elif command.name:
-                self.bot.guild_disabled.pop(f"{str(f'{command.parent} {command.name}')}, {ctx.guild.id}")
+                self.bot.guild_disabled.pop((command.qualified_name, ctx.guild.id))
                 await self.bot.db.execute("DELETE FROM guild_disabled WHERE command = $1 AND guild_id = $2", str(f"{command.parent} {command.name}"), ctx.guild.id)
                 await ctx.send(f"{self.bot.settings['emojis']['misc']['white-mark']} | `{command.parent} {command.name}` and its corresponding subcommands were successfully re-enabled")
         elif not command.parent:
-            self.bot.guild_disabled.pop(f"{str(command)}, {ctx.guild.id}")
+            self.bot.guild_disabled.pop((str(command), ctx.guild.id))
             await self.bot.db.execute("DELETE FROM guild_disabled WHERE command = $1 AND guild_id = $2", str(command), ctx.guild.id)
             await ctx.send(f"{self.bot.settings['emojis']['misc']['white-mark']} | `{command}` was successfully re-enabled")
 
@@ -1255,10 +1228,10 @@ class Manage(commands.Cog, name='Management', aliases=['Manage']):
         if cog.qualified_name in cant_disable:
             return await ctx.send(_("{0} You can't disable that category!").format(self.bot.settings['emojis']['misc']['warn']))
 
-        if self.bot.cache.get(self.bot, 'cog_disabled', f"{str(ctx.guild.id)}, {str(cog.qualified_name)}"):
+        if self.bot.cache.get(self.bot, 'cog_disabled', (ctx.guild.id, cog.qualified_name)):
             return await ctx.send(_("{0} That category is already disabled.").format(self.bot.settings['emojis']['misc']['warn']))
 
-        self.bot.cog_disabled[f"{str(ctx.guild.id)}, {str(cog.qualified_name)}"] = str(cog.qualified_name)
+        self.bot.cog_disabled[(ctx.guild.id, cog.qualified_name)] = str(cog.qualified_name)
         await self.bot.db.execute("INSERT INTO cog_disabled(guild_id, cog) VALUES($1, $2)", ctx.guild.id, cog.qualified_name)
         await ctx.send(_("{0} Category {1} was successfully disabled").format(
             self.bot.settings['emojis']['misc']['white-mark'], cog.qualified_name
@@ -1280,10 +1253,10 @@ class Manage(commands.Cog, name='Management', aliases=['Manage']):
                 self.bot.settings['emojis']['misc']['warn'], category.title()
             ))
 
-        if not self.bot.cache.get(self.bot, 'cog_disabled', f"{str(ctx.guild.id)}, {str(cog.qualified_name)}"):
+        if not self.bot.cache.get(self.bot, 'cog_disabled', (ctx.guild.id, cog.qualified_name)):
             return await ctx.send(_("{0} That category is not disabled.").format(self.bot.settings['emojis']['misc']['warn']))
 
-        self.bot.cog_disabled.pop(f"{str(ctx.guild.id)}, {str(cog.qualified_name)}")
+        self.bot.cog_disabled.pop((ctx.guild.id, cog.qualified_name))
         await self.bot.db.execute("DELETE FROM cog_disabled WHERE cog = $1 AND guild_id = $2", cog.qualified_name, ctx.guild.id)
         await ctx.send(_("{0} Category {1} was successfully re-enabled").format(
             self.bot.settings['emojis']['misc']['white-mark'], cog.qualified_name
@@ -55,6 +55,7 @@ class Misc(commands.Cog, name='Miscellaneous', aliases=['Misc']):
             self.bot.reminders[ctx.author.id] = {'1': {'time': time, 'content': content, 'channel': ctx.channel.id, 'message': ctx.message.id}}
         else:
             self.bot.reminders[ctx.author.id][str(len(check_reminders) + 1)] = {'time': time, 'content': content, 'channel': ctx.channel.id, 'message': ctx.message.id}
+        self.bot.timers.schedule('reminder', ctx.author.id, time)
 
     @commands.command(brief="Search the urban dictionary")
     @commands.guild_only()
@@ -343,7 +344,7 @@ class Misc(commands.Cog, name='Miscellaneous', aliases=['Misc']):
     @checks.has_voted()
     @commands.cooldown(1, 5, commands.BucketType.user)
     async def setafk(self, ctx, *, note: commands.clean_content = "I'm currently AFK"):
-        check = CM.get(self.bot, 'afk', f"{str(ctx.guild.id)}, {str(ctx.author.id)}")
+        check = CM.get(self.bot, 'afk', (ctx.guild.id, ctx.author.id))
 
         if len(note) > 500:
             note = note[:500]
@@ -351,49 +352,45 @@ class Misc(commands.Cog, name='Miscellaneous', aliases=['Misc']):
 
         if check is not None:
             await self.bot.db.execute("UPDATE afk SET message = $1 WHERE user_id = $2 AND guild_id = $3", note, ctx.author.id, ctx.guild.id)
-            self.bot.afk[f"{str(ctx.guild.id)}, {str(ctx.author.id)}"]['note'] = note
+            self.bot.afk[(ctx.guild.id, ctx.author.id)]['note'] = note
             await ctx.send(_("{0} **Changed your AFK state to -** {1}").format(
                 self.bot.settings['emojis']['misc']['white-mark'], escape_markdown(note, as_needed=False)
             ))
         elif check is None:
             await self.bot.db.execute("INSERT INTO afk(user_id, guild_id, message, time) VALUES($1, $2, $3, $4)", ctx.author.id, ctx.guild.id, note, datetime.now())
-            self.bot.afk[f"{str(ctx.guild.id)}, {str(ctx.author.id)}"] = {'note': note, 'time': datetime.now()}
+            self.bot.afk[(ctx.guild.id, ctx.author.id)] = {'note': note, 'time': datetime.now()}
             await ctx.send(_("{0} ** Set your AFK state to -** {1}").format(
                 self.bot.settings['emojis']['misc']['white-mark'], escape_markdown(note, as_needed=False)
             ))
 
-    @commands.command(brief='Snipe the latest deleted message')
+    @commands.command(brief='Snipe the latest deleted messages')
     @commands.guild_only()
     @commands.cooldown(1, 5, commands.BucketType.user)
-    async def snipe(self, ctx, *, channel: discord.TextChannel = None):
+    async def snipe(self, ctx, channel: typing.Optional[discord.TextChannel] = None, index: int = 1):
+        """ Snipe the latest deleted messages in the channel.
+        Provide a number to see older deleted messages, `snipe 2` shows the second latest one """
         channel = channel or ctx.channel
 
-        snipe = CM.get(self.bot, 'snipes', channel.id)
-        if snipe is None:
+        total = self.bot.snipes.count(channel.id)
+        if not total:
             return await ctx.send(_("{0} I haven't yet logged any messages from {1}.").format(
                 self.bot.settings['emojis']['misc']['warn'], channel.mention if channel != ctx.channel else _('this channel')
             ))
+        snipe = self.bot.snipes.get(channel.id, index)
+        if snipe is None:
+            return await ctx.send(_("{0} I only have **{1}** deleted message(s) logged from {2}.").format(
+                self.bot.settings['emojis']['misc']['warn'], total, channel.mention if channel != ctx.channel else _('this channel')
+            ))
         if snipe['nsfw'] and not ctx.channel.is_nsfw():
             return await ctx.send(_("{0} I can't let you snipe messages from an NSFW channel!").format(self.bot.settings['emojis']['logs']['nsfw']))
 
         else:
-            try:
-                user = await self.bot.fetch_user(snipe['author'])
-                name = user
-            except discord.errors.NotFound:
-                try:
-                    user = await self.bot.fetch_webhook(snipe['author'])
-                    name = user.name
-                except discord.errors.NotFound:
-                    return await ctx.send(_("{0} Looks like I can't fetch the user that sent the snipped message.").format(self.bot.settings['emojis']['logs']['nsfw']))
-                except discord.errors.Forbidden:
-                    return await ctx.send(_("{0} That message looks like it was a webhook, and I'm missing permissions to look for more information.").format(self.bot.settings['emojis']['logs']['nsfw']))
-
+            author = snipe['author']
             message = snipe['message'] or _("*[Couldn't get the sniped content]*")
-            message = message.replace('[', '\[')
+            message = message.replace('[', '\\[')
             e = discord.Embed(color=self.bot.settings['colors']['embed_color'], description=message)
-            e.set_author(name=_("Deleted by {0}").format(name), icon_url=user.avatar_url)
-            e.set_footer(text=_("Deleted {0} in #{1}").format(btime.human_timedelta(snipe['deleted_at']), channel.name))
+            e.set_author(name=_("Deleted by {0}").format(author), icon_url=author.avatar_url)
+            e.set_footer(text=_("Deleted {0} in #{1} | {2}/{3}").format(btime.human_timedelta(snipe['deleted_at']), channel.name, index, total))
             await ctx.send(embed=e)
 
     # toggle commands for activity and snipes
@@ -466,7 +463,7 @@ class Misc(commands.Cog, name='Miscellaneous', aliases=['Misc']):
     async def toggle_nicknames(self, ctx):
         """ Toggle your nicknames logging
         This applies to all the servers we share """
-        check = CM.get(self.bot, 'nicks_op', f'{ctx.author.id} - {ctx.guild.id}')
+        check = CM.get(self.bot, 'nicks_op', (ctx.author.id, ctx.guild.id))
 
         def checks(r, u):
             return u.id == ctx.author.id and r.message.id == checkmsg.id
@@ -480,7 +477,8 @@ class Misc(commands.Cog, name='Miscellaneous', aliases=['Misc']):
 
                 if str(react) == f"{self.bot.settings['emojis']['misc']['white-mark']}":
                     await self.bot.db.execute('INSERT INTO nicks_op(guild_id, user_id) VALUES($1, $2)', ctx.guild.id, ctx.author.id)
-                    self.bot.nicks_op[f'{ctx.author.id} - {ctx.guild.id}'] = ctx.author.id
+                    self.bot.nicks_op[(ctx.author.id, ctx.guild.id)] = ctx.author.id
+                    self.bot.nickname_buffer.discard(ctx.author.id, ctx.guild.id)
                     await self.bot.db.execute("DELETE FROM nicknames WHERE user_id = $1 AND guild_id = $2", ctx.author.id, ctx.guild.id)
                     await ctx.channel.send(_("{0} Alright. I won't be logging your nicknames anymore in this server!").format(self.bot.settings['emojis']['misc']['white-mark']))
                     await checkmsg.delete()
@@ -504,7 +502,7 @@ class Misc(commands.Cog, name='Miscellaneous', aliases=['Misc']):
 
                 if str(react) == f"{self.bot.settings['emojis']['misc']['white-mark']}":
                     await self.bot.db.execute('DELETE FROM nicks_op WHERE guild_id = $1 AND user_id = $2', ctx.guild.id, ctx.author.id)
-                    self.bot.nicks_op.pop(f'{ctx.author.id} - {ctx.guild.id}')
+                    self.bot.nicks_op.pop((ctx.author.id, ctx.guild.id))
                     await ctx.channel.send(_("{0} You're now opted-in! I'll be logging your nicknames from now on in this server!").format(self.bot.settings['emojis']['misc']['white-mark']))
                     await checkmsg.delete()
 
@@ -535,6 +533,7 @@ class Misc(commands.Cog, name='Miscellaneous', aliases=['Misc']):
                 if str(react) == f"{self.bot.settings['emojis']['misc']['white-mark']}":
                     await self.bot.db.execute('DELETE FROM status_op WHERE user_id = $1', ctx.author.id)
                     self.bot.status_op.pop(ctx.author.id)
+                    self.bot.status_buffer.discard(ctx.author.id)
                     await self.bot.db.execute("DELETE FROM status WHERE user_id = $1", ctx.author.id)
                     await ctx.channel.send(f"{self.bot.settings['emojis']['misc']['white-mark']} Alright. I won't be logging your statuses anymore!")
                     await checkmsg.delete()
@@ -649,7 +648,7 @@ class Misc(commands.Cog, name='Miscellaneous', aliases=['Misc']):
 
         member_check = CM.get(self.bot, 'status_op', member.id)
         author_check = CM.get(self.bot, 'status_op', ctx.author.id)
-        afks = CM.get(self.bot, 'afk', f'{str(ctx.guild.id)}, {str(ctx.author.id)}')
+        afks = CM.get(self.bot, 'afk', (ctx.guild.id, ctx.author.id))
 
         if member_check is None:
             return await ctx.send(_("{0} {1} has opted-out of status logging."
@@ -667,6 +666,9 @@ class Misc(commands.Cog, name='Miscellaneous', aliases=['Misc']):
 
         elif member_check is not None and author_check is not None:
             status = await self.bot.db.fetch("SELECT * FROM status WHERE user_id = $1", member.id)
+            pending = self.bot.status_buffer.get(member.id)
+            if pending is not None:  # latest change isn't written yet
+                status = [{'user_id': member.id, 'status_type': pending[0], 'since': pending[1]}]
             if status is None:
                 return await ctx.send(_("{0} I don't have {1}").format(
                     self.bot.settings['emojis']['misc']['warn'],
@@ -1742,6 +1742,13 @@ class moderation(commands.Cog, name='Moderation', aliases=['Mod']):
                                         self.bot.settings['emojis']['misc']['warn']
                                     ))
 
+    def case_embed(self, message, case_id):
+        """ The embed of the case, a message sent by the logging webhook can hold multiple logs """
+        for embed in message.embeds:
+            if embed.footer.text and embed.footer.text.endswith(f'#{case_id}'):
+                return embed
+        return None
+
     @commands.command(brief='Edit a reason of a case', aliases=['editcase', 'editreason'])
     @moderator(manage_messages=True)
     @commands.guild_only()
@@ -1774,9 +1781,13 @@ class moderation(commands.Cog, name='Moderation', aliases=['Mod']):
 
         old_reason = await self.bot.db.fetchval("SELECT reason FROM modlog WHERE guild_id = $1 AND case_num = $2", ctx.guild.id, case_id)
         old_reason = old_reason or "No reason"
-        embed = message.embeds[0]
+        embed = self.case_embed(message, case_id)
+        if embed is None:
+            return await ctx.send(_("{0} I couldn't find case `#{1}` in that message.").format(self.bot.settings['emojis']['misc']['warn'], case_id))
         new_description = embed.description[:-len(old_reason)] + new_reason  # not using .replace cause then it replaces even usernames etc
         embed.description = new_description
+        if message.author.id != self.bot.user.id or len(message.embeds) != 1:  # older cases were sent by the logging webhook together with other logs
+            return await ctx.send(_("{0} Case `#{1}` was logged in a message I can't edit.").format(self.bot.settings['emojis']['misc']['warn'], case_id))
         await message.edit(embed=embed)
         query = 'UPDATE modlog SET reason = $1 WHERE guild_id = $2 AND case_num = $3'
         await self.bot.db.execute(query, new_reason, ctx.guild.id, case_id)
@@ -1850,7 +1861,9 @@ class moderation(commands.Cog, name='Moderation', aliases=['Mod']):
         except discord.HTTPException:
             return await ctx.send(_("{0} Retrieving the message failed.").format(self.bot.settings['emojis']['misc']['warn']))
 
-        embed = message.embeds[0]
+        embed = self.case_embed(message, case_id)
+        if embed is None:
+            return await ctx.send(_("{0} I couldn't find case `#{1}` in that message.").format(self.bot.settings['emojis']['misc']['warn'], case_id))
         await ctx.send(content=_("Showing you case `#{0}` information").format(case_id), embed=embed)
 
     @commands.command(brief='Check user history of punishments', aliases=['punishments'])
@@ -1862,8 +1875,8 @@ class moderation(commands.Cog, name='Moderation', aliases=['Mod']):
 
         case_check = await self.bot.db.fetch("SELECT * FROM modlog WHERE guild_id = $1 AND user_id = $2 ORDER BY case_num", ctx.guild.id, user.id)
         no_msg = _("{0} {1} doesn't have any punishments history.").format(self.bot.settings['emojis']['misc']['warn'], user)
-        temp_mutes = cm.get(self.bot, 'temp_mutes', f'{user.id}, {ctx.guild.id}')
-        temp_bans = cm.get(self.bot, 'temp_bans', f'{user.id}, {ctx.guild.id}')
+        temp_mutes = cm.get(self.bot, 'temp_mutes', (user.id, ctx.guild.id))
+        temp_bans = cm.get(self.bot, 'temp_bans', (user.id, ctx.guild.id))
 
         if not case_check:
             return await ctx.send(no_msg)
@@ -1926,7 +1939,7 @@ class moderation(commands.Cog, name='Moderation', aliases=['Mod']):
 
         if ctx.guild and ctx.author.guild_permissions.manage_messages and not await self.bot.is_owner(ctx.author):
             guild_id = ctx.guild.id
-            temp_mute = cm.get(self.bot, 'temp_mutes', f'{user.id}, {guild_id}')
+            temp_mute = cm.get(self.bot, 'temp_mutes', (user.id, guild_id))
 
             if not temp_mute or temp_mute and not temp_mute['time']:
                 raise commands.BadArgument(_("User is not temp muted."))
@@ -1943,7 +1956,7 @@ class moderation(commands.Cog, name='Moderation', aliases=['Mod']):
                 raise commands.BadArgument(_("Server administrators have disabled this feature in that server, unfortunately I cannot tell you the duration until you get unmuted."))
 
             user = ctx.author
-            temp_mute = cm.get(self.bot, 'temp_mutes', f'{user.id}, {guild_id}')
+            temp_mute = cm.get(self.bot, 'temp_mutes', (user.id, guild_id))
             if not temp_mute or temp_mute and not temp_mute['time']:
                 raise commands.BadArgument(_("You're not temp muted?"))
 
@@ -1954,7 +1967,7 @@ class moderation(commands.Cog, name='Moderation', aliases=['Mod']):
             raise commands.BadArgument(_("Please give the ID of the server too."))
 
         elif await self.bot.is_owner(ctx.author):
-            temp_mute = cm.get(self.bot, 'temp_mutes', f'{user.id}, {guild_id}')
+            temp_mute = cm.get(self.bot, 'temp_mutes', (user.id, guild_id))
             if not temp_mute or temp_mute and not temp_mute['time']:
                 raise commands.BadArgument(_("User is not temp muted in that server."))
 
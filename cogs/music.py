@@ -176,6 +176,7 @@ class Music(commands.Cog, wavelink.WavelinkMixin):
         self.controllers = {}
 
         self.help_icon = '<:deafened:686251889519493250>'
+        self.needs_cache = False  # only reads the critical caches, commands don't wait for the full warm-up
         self.big_icon = ''
         self._last_command_channel = {}
 
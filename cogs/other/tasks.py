@@ -29,84 +29,95 @@ from db.cache import CacheManager as cm
 
 
 class Tasks(commands.Cog, name="Tasks", command_attrs=dict(hidden=True)):
+    TIMERS = ('guild_data', 'temp_ban', 'temp_mute', 'reminder')
+
     def __init__(self, bot):
         self.bot = bot
         self.help_icon = ''
-        self.guild_data.start()
-        self.temp_ban.start()
-        self.temp_mute.start()
-        self.reminders.start()
+        self.bot.timers.register('guild_data', self.guild_data)
+        self.bot.timers.register('temp_ban', self.temp_ban)
+        self.bot.timers.register('temp_mute', self.temp_mute)
+        self.bot.timers.register('reminder', self.reminders)
+        self.timers_task = self.bot.loop.create_task(self.start_timers())
         self.dispatch_unmute.start()
         self.delete_nicknames.start()
         self.backups.start()
         self.client = gmailpy.Client(mail=bot.config.BACKUP_USER, password=bot.config.BACKUP_PASSWORD)
 
     def cog_unload(self):
-        self.guild_data.cancel()
-        self.temp_ban.cancel()
-        self.temp_mute.cancel()
-        self.reminders.cancel()
+        self.timers_task.cancel()
+        for kind in self.TIMERS:
+            self.bot.timers.unregister(kind)
         self.dispatch_unmute.cancel()
         self.delete_nicknames.cancel()
         self.backups.cancel()
 
-    @tasks.loop(seconds=1)
-    async def guild_data(self):
-        try:
-            for guild_id in self.bot.guilds_data:
-                now = datetime.utcnow()
-                the_time = cm.get(self.bot, 'guilds_data', guild_id)
-                seconds = (the_time - now).total_seconds()
-                if the_time and seconds <= 0:
-                    await self.bot.db.execute("DELETE FROM guilds WHERE guild_id = $1", guild_id)
-                    cm.clear(self.bot, guild_id)
-                    await default.guild_data_deleted(self, guild_id)
-        except Exception:
-            pass
-
-    @tasks.loop(seconds=1)
-    async def temp_ban(self):
-        try:
-            for result in self.bot.temp_bans:
-                check = cm.get(self.bot, 'temp_bans', result)
-                if check:
-                    now = datetime.utcnow()
-                    the_time = check['time']
-                    seconds = (the_time - now).total_seconds()
-                    if the_time and seconds <= 0:
-                        user = await self.bot.try_user(int(result.split(', ')[0]))
-                        guild = self.bot.get_guild(int(result.split(', ')[1]))
-                        mod = await self.bot.try_user(int(check['moderator']))
-                        await default.execute_untemporary(self, 2, user, guild)
-                        await guild.unban(user, reason='Auto Unban')
-                        self.bot.dispatch('unban', guild, mod, [user], 'Auto Unban')
-        except Exception:
-            pass
-
-    @tasks.loop(seconds=1)
-    async def temp_mute(self):
-        try:
-            for result in self.bot.temp_mutes:
-                check = cm.get(self.bot, 'temp_mutes', result)
-                if check:
-                    now = datetime.utcnow()
-                    the_time = check['time']
-                    seconds = (the_time - now).total_seconds()
-                    if the_time and seconds <= 0:
-                        user = await self.bot.try_user(int(result.split(', ')[0]))
-                        guild = self.bot.get_guild(int(result.split(', ')[1]))
-                        mod = await self.bot.try_user(int(check['moderator']))
-                        to_disp = cm.get(self.bot, 'to_dispatch', guild.id)
-                        if not to_disp:
-                            self.bot.to_dispatch[guild.id] = {'users': [], 'mod': mod}
-                        await default.execute_untemporary(self, 1, user, guild)
-                        role = guild.get_role(int(check['role']))
-                        if role:
-                            member = guild.get_member(user.id)
-                            await member.remove_roles(role, reason='Auto Unmute')
-                        self.bot.to_dispatch[guild.id]['users'].append(member)
-        except Exception as e:
-            pass
+    async def start_timers(self):
+        await self.bot.wait_until_ready()
+        timers = self.bot.timers
+        timers.clear(*self.TIMERS)  # other cogs keep their own timers
+        for guild_id, the_time in self.bot.guilds_data.items():
+            timers.schedule('guild_data', guild_id, the_time)
+        for result, check in self.bot.temp_bans.items():
+            timers.schedule('temp_ban', result, check['time'])
+        for result, check in self.bot.temp_mutes.items():
+            timers.schedule('temp_mute', result, check['time'])
+        for user_id, reminds in self.bot.reminders.items():
+            for json in reminds.values():
+                timers.schedule('reminder', user_id, json['time'])
+        print(f"[BACKGROUND] Scheduled timers ({len(timers)} pending: guild data deletes, temp bans, temp mutes and reminders)")
+
+    @commands.Cog.listener()
+    async def on_cache_ready(self):
+        # the cache was replaced, timers that came with it don't have a heap entry yet
+        if self.timers_task.done():
+            self.timers_task = self.bot.loop.create_task(self.start_timers())
+
+    def is_due(self, the_time):
+        return the_time and (the_time - datetime.utcnow()).total_seconds() <= 0
+
+    async def guild_data(self, guild_id, when):
+        the_time = cm.get(self.bot, 'guilds_data', guild_id)
+        if not self.is_due(the_time):  # guild re-invited the bot or the timer was moved
+            return
+
+        await self.bot.db.execute("DELETE FROM guilds WHERE guild_id = $1", guild_id)
+        cm.clear(self.bot, guild_id)
+        self.bot.guild_settings.forget(guild_id)
+        self.bot.guild_configs.forget(guild_id)
+        await default.guild_data_deleted(self, guild_id)
+
+    async def temp_ban(self, result, when):
+        check = cm.get(self.bot, 'temp_bans', result)
+        if not check or not self.is_due(check['time']):
+            return
+
+        user_id, guild_id = result
+        user = await self.bot.try_user(user_id)
+        guild = self.bot.get_guild(guild_id)
+        mod = await self.bot.try_user(int(check['moderator']))
+        await default.execute_untemporary(self, 2, user, guild)
+        await guild.unban(user, reason='Auto Unban')
+        self.bot.dispatch('unban', guild, mod, [user], 'Auto Unban')
+
+    async def temp_mute(self, result, when):
+        check = cm.get(self.bot, 'temp_mutes', result)
+        if not check or not self.is_due(check['time']):
+            return
+
+        user_id, guild_id = result
+        user = await self.bot.try_user(user_id)
+        guild = self.bot.get_guild(guild_id)
+        mod = await self.bot.try_user(int(check['moderator']))
+        to_disp = cm.get(self.bot, 'to_dispatch', guild.id)
+        if not to_disp:
+            self.bot.to_dispatch[guild.id] = {'users': [], 'mod': mod}
+        await default.execute_untemporary(self, 1, user, guild)
+        role = guild.get_role(int(check['role']))
+        member = guild.get_member(user.id)
+        if role and member:
+            await member.remove_roles(role, reason='Auto Unmute')
+        self.bot.to_dispatch[guild.id]['users'].append(member)
 
     @tasks.loop(seconds=10)
     async def dispatch_unmute(self):
@@ -114,36 +125,31 @@ class Tasks(commands.Cog, name="Tasks", command_attrs=dict(hidden=True)):
             self.bot.dispatch('unmute', self.bot.get_guild(guild), self.bot.to_dispatch[guild]['mod'], self.bot.to_dispatch[guild]['users'], 'Auto Unmute')
             self.bot.to_dispatch.pop(guild, None)
 
-    @tasks.loop(seconds=1)
-    async def reminders(self):
-        try:
-            reminds = self.bot.reminders
-            for result in reminds:
-                for result_2 in reminds[result]:
-                    json = reminds[result][result_2]
-                    now = datetime.utcnow()
-                    the_time = json['time']
-                    seconds = (the_time - now).total_seconds()
-                    if the_time and seconds <= 0:
-                        try:
-                            channel = self.bot.get_channel(json['channel'])
-                            message = await channel.fetch_message(json['message'])
-                            await message.reply(json['content'], allowed_mentions=discord.AllowedMentions(replied_user=True))
-                        except Exception:
-                            user = self.bot.get_user(result)
-                            try:
-                                channel = self.bot.get_channel(json['channel'])
-                                await channel.send(f"{user.mention}: {json['content']}", allowed_mentions=discord.AllowedMentions(users=True))
-                            except Exception:
-                                try:
-                                    reminder = json['content']
-                                    await user.send(_("*The original message was deleted or I'm missing permissions*\n\nYour reminder: {0}").format(reminder[:1800] + '...' if len(reminder) > 1800 else reminder))
-                                except Exception:
-                                    pass
-                        self.bot.reminders[result].pop(result_2)
-                        await self.bot.db.execute("DELETE FROM reminders WHERE user_id = $1 AND reminder = $2 AND time = $3", result, json['content'], json['time'])
-        except Exception:
-            pass
+    async def reminders(self, result, when):
+        reminds = cm.get(self.bot, 'reminders', result)
+        if not reminds:
+            return
+
+        for result_2, json in list(reminds.items()):
+            if not self.is_due(json['time']):
+                continue
+            try:
+                channel = self.bot.get_channel(json['channel'])
+                message = await channel.fetch_message(json['message'])
+                await message.reply(json['content'], allowed_mentions=discord.AllowedMentions(replied_user=True))
+            except Exception:
+                user = self.bot.get_user(result)
+                try:
+                    channel = self.bot.get_channel(json['channel'])
+                    await channel.send(f"{user.mention}: {json['content']}", allowed_mentions=discord.AllowedMentions(users=True))
+                except Exception:
+                    try:
+                        reminder = json['content']
+                        await user.send(_("*The original message was deleted or I'm missing permissions*\n\nYour reminder: {0}").format(reminder[:1800] + '...' if len(reminder) > 1800 else reminder))
+                    except Exception:
+                        pass
+            reminds.pop(result_2, None)
+            await self.bot.db.execute("DELETE FROM reminders WHERE user_id = $1 AND reminder = $2 AND time = $3", result, json['content'], json['time'])
 
     @tasks.loop(hours=6)
     async def backups(self):
@@ -167,30 +173,16 @@ class Tasks(commands.Cog, name="Tasks", command_attrs=dict(hidden=True)):
 
     @tasks.loop(hours=24)
     async def delete_nicknames(self):
-        now = datetime.now()
-        days = timedelta(days=90)
-        time = now - days
-        await self.bot.db.execute("DELETE FROM nicknames WHERE time < $1", time)
-
-    @guild_data.before_loop
-    async def before_guild_delete(self):
-        await self.bot.wait_until_ready()
-        print("[BACKGROUND] Started automatic guild data delete process")
-
-    @temp_ban.before_loop
-    async def before_temp_ban(self):
-        await self.bot.wait_until_ready()
-        print("[BACKGROUND] Started temp bans unbanning process")
-
-    @temp_mute.before_loop
-    async def before_temp_mute(self):
-        await self.bot.wait_until_ready()
-        print("[BACKGROUND] Started temp mutes unmuting process")
-
-    @reminders.before_loop
-    async def before_reminders(self):
-        await self.bot.wait_until_ready()
-        print("[BACKGROUND] Started sending reminders")
+        """ Deletes nicknames older than 90 days 5000 rows at a time, oldest first """
+        # every batch is an index range scan on nicknames_time_idx (migrations/nicknames_time.sql)
+        query = """DELETE FROM nicknames WHERE ctid = ANY(ARRAY(
+                    SELECT ctid FROM nicknames WHERE time < $1 ORDER BY time LIMIT $2))"""
+        expired, batch = datetime.now() - timedelta(days=90), 5000
+        while True:
+            status = await self.bot.db.execute(query, expired, batch)
+            if int(status.split()[-1]) < batch:
+                break
+            await asyncio.sleep(1)
 
     @delete_nicknames.before_loop
     async def before_delete_nicknames(self):
@@ -24,7 +24,6 @@ from importlib import reload as importlib_reload
 from prettytable import PrettyTable
 from utils import btime, default
 from utils.paginator import TextPages
-from db.cache import LoadCache as LC
 from db.cache import CacheManager as CM
 from datetime import datetime, timezone
 
@@ -97,9 +96,25 @@ class owner(commands.Cog, name="Owner"):
 
     @dev.command(name='reload-cache', aliases=['rcache'])
     async def dev_reload_cache(self, ctx):
-        cache = await LC.reloadall(self.bot)
+        cache = await self.bot.reloadall()
         await ctx.send("I've successfully reloaded cache!")
 
+    @dev.command(name='cache-stats', aliases=['cstats'])
+    async def dev_cache_stats(self, ctx):
+        edits = self.bot.cmd_edits.stats
+        statuses = self.bot.status_buffer.stats
+        nicknames = self.bot.nickname_buffer.stats
+        usage = self.bot.command_usage.stats
+        message = (f"**Command edits:** {edits['size']} tracked, {edits['hits']} hits, {edits['misses']} misses, {edits['evictions']} evictions\n"
+                   f"**Status buffer:** {statuses['queued']} queued, {statuses['written']} written, {statuses['failed']} failed flushes\n"
+                   f"**Nickname buffer:** {nicknames['queued']} queued, {nicknames['written']} written, {nicknames['failed']} failed flushes\n"
+                   f"**Command usage:** {usage['queued']} queued, {usage['written']} written, {usage['failed']} failed flushes\n"
+                   f"**Guild configs:** {len(self.bot.guild_configs)} guilds\n"
+                   f"**Warm-up:** {', '.join(f'{name} {took:.2f}s' for name, took in self.bot.warmup.timings.items()) or 'loading'}")
+        for name, error in self.bot.warmup.failed.items():
+            message += f"\n**Failing to load {name}:** {error}"
+        await ctx.send(message)
+
     @dev.command(name='reload-config', aliases=['rconfig', 'rconf'])
     async def dev_reload_config(self, ctx):
         importlib_reload(self.bot.config)
@@ -212,7 +227,7 @@ class owner(commands.Cog, name="Owner"):
         e.description = f"""
 **Full username:** [{user}](https://discord.com/users/{user.id}) {acks if acks else ''}
 **Avatar URL:** [Click here]({user.avatar_url})
-**Shared servers:** {len([x for x in self.bot.guilds if x.get_member(user.id)])}
+**Shared servers:** {self.bot.mutuals.count(user.id)}
 **Commands Used:** {commands}
 **Suggestions suggested:** {len(suggestions)} {f'**IDs:** {", ".join(ids)}' if len(suggestions) != 0 else ''}
 **Blacklisted?** {bl}{dm_check}
@@ -234,6 +249,7 @@ class owner(commands.Cog, name="Owner"):
             return await ctx.send(f"{self.bot.settings['emojis']['misc']['warn']} | That server doesn't seem to exist. Are you sure the server ID is correct?")
         if not guild.chunked:
             await guild.chunk(cache=True)
+            self.bot.mutuals.add_guild(guild)
 
         acks = default.server_badges(ctx, guild)
         logging = default.server_logs(ctx, guild)
@@ -353,7 +369,7 @@ class owner(commands.Cog, name="Owner"):
                 await self.bot.db.execute("UPDATE badges SET flags = flags + $1 WHERE _id = $2", ranks[rank], user.id)
             else:
                 await self.bot.db.execute("INSERT INTO badges VALUES($1, $2)", user.id, ranks[rank])
-            await LC.reloadall(self.bot)
+            await self.bot.reloadall()
             try:
                 dm_message = f"Hey {user}! Just letting you know your rank was updated and you're now a **{rank}**!"
                 await user.send(dm_message)
@@ -66,6 +66,17 @@ MUSIC_PASSWORD = ''
 MUSIC_PORT = 0000  # change to your port
 MUSIC_ID = ''
 
+# Joins per second that turn anti raid mode on automatically, 0 to disable
+AUTO_RAIDMODE_RATE = 0
+
+# Joins per second above which welcome messages, join logs and join roles are batched, 0 to disable
+JOIN_BURST_RATE = 1
+
+# File the cache is saved to on shutdown so restarts don't reload it from the database, None to disable
+CACHE_SNAPSHOT = 'cache.snapshot'
+# Oldest snapshot in seconds that's still used on boot
+CACHE_SNAPSHOT_MAX_AGE = 3600
+
 # Extensions
 EXTENSIONS = [
     'cogs.extension'
@@ -0,0 +1,22 @@
+-- Settings of every guild as a single JSONB document, read by utils/guildsettings.py
+CREATE TABLE IF NOT EXISTS guild_settings (
+    guild_id BIGINT PRIMARY KEY REFERENCES guilds(guild_id) ON DELETE CASCADE,
+    settings JSONB NOT NULL DEFAULT '{}'::jsonb
+);
+
+-- Move the logging channels out of their own tables, run once before starting the bot with guild_settings
+BEGIN;
+INSERT INTO guild_settings(guild_id, settings)
+SELECT guild_id, jsonb_object_agg(setting, channel_id) FROM (
+    SELECT guild_id, 'moderation' AS setting, channel_id FROM moderation
+    UNION ALL SELECT guild_id, 'memberlog', channel_id FROM memberlog
+    UNION ALL SELECT guild_id, 'joinlog', channel_id FROM joinlog
+    UNION ALL SELECT guild_id, 'leavelog', channel_id FROM leavelog
+    UNION ALL SELECT guild_id, 'guildlog', channel_id FROM guildlog
+    UNION ALL SELECT guild_id, 'messageedits', channel_id FROM messageedits
+    UNION ALL SELECT guild_id, 'messagedeletes', channel_id FROM messagedeletes
+) AS logs
+WHERE guild_id IN (SELECT guild_id FROM guilds)
+GROUP BY guild_id
+ON CONFLICT (guild_id) DO UPDATE SET settings = EXCLUDED.settings || guild_settings.settings;
+COMMIT;
@@ -0,0 +1,2 @@
+-- Lets the nickname retention in cogs/other/tasks.py find expired rows without scanning the whole table
+CREATE INDEX CONCURRENTLY IF NOT EXISTS nicknames_time_idx ON nicknames (time);
@@ -0,0 +1,53 @@
+import asyncio
+import importlib.util
+import unittest
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+from utils.timers import TimerScheduler
+
+HAS_DEPENDENCIES = all(importlib.util.find_spec(name) for name in ('discord', 'db', 'timeago'))
+
+
+@unittest.skipUnless(HAS_DEPENDENCIES, 'needs the bot requirements installed')
+class ExecuteTemporaryTests(unittest.TestCase):
+    def fire(self, action, cache, kind):
+        from utils import default
+
+        async def run():
+            bot = SimpleNamespace(db=mock.AsyncMock(), timers=TimerScheduler(), temp_mutes={}, temp_bans={})
+            ctx = SimpleNamespace(bot=bot)
+            user, mod, guild, role = (SimpleNamespace(id=i) for i in (1, 2, 3, 4))
+            fired = []
+
+            async def handler(key, when):
+                fired.append(getattr(bot, cache).get(key))
+
+            bot.timers.register(kind, handler)
+            when = datetime.utcnow() - timedelta(seconds=1)
+            await default.execute_temporary(ctx, action, user, mod, guild, role, when, 'reason')
+            task = bot.timers.start()
+            for _ in range(10):
+                if fired:
+                    break
+                await asyncio.sleep(0)
+            task.cancel()
+            return fired
+
+        return asyncio.new_event_loop().run_until_complete(run())
+
+    def test_temp_mute_timer_finds_the_mute(self):
+        fired = self.fire(1, 'temp_mutes', 'temp_mute')
+        self.assertEqual(len(fired), 1)
+        self.assertEqual(fired[0]['moderator'], 2)
+
+    def test_temp_ban_timer_finds_the_ban(self):
+        fired = self.fire(2, 'temp_bans', 'temp_ban')
+        self.assertEqual(len(fired), 1)
+        self.assertEqual(fired[0]['moderator'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
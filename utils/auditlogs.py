@@ -0,0 +1,120 @@
+"""
+Dredd, discord bot
+Copyright (C) 2021 Moksej
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import discord
+import asyncio
+import time
+
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+
+class GuildAuditLog:
+    __slots__ = ('last_id', 'entries', 'task', 'started', 'fetched')
+
+    def __init__(self):
+        self.last_id = None
+        self.entries = OrderedDict()  # (action, target id): entry, oldest first
+        self.task = None
+        self.started = 0  # when the running fetch started
+        self.fetched = 0  # when the last finished fetch started
+
+
+class AuditLogPoller:
+    """Reads the audit log of every guild once for every event that needs it.
+
+    Each fetch only asks for the entries after the last one we've seen, ``limit`` per
+    request until it has all of them, and indexes them by ``(action, target id)`` for
+    ``ttl`` seconds. Events arriving at the same
+    time wait for the same fetch, so a mass ban reads the audit log a couple times
+    instead of once per banned member.
+    """
+
+    def __init__(self, bot, *, delay=1, ttl=60, limit=100):
+        self.bot = bot
+        self.delay = delay  # discord takes a moment to write the audit log entry
+        self.ttl = ttl
+        self.limit = limit
+        self._guilds = {}  # guild id: GuildAuditLog
+
+    def forget(self, guild_id):
+        self._guilds.pop(guild_id, None)
+
+    def lookup(self, guild_id, action, target_id, when, tolerance=3):
+        state = self._guilds.get(guild_id)
+        entry = state.entries.get((action, target_id)) if state else None
+        if entry is None or abs((entry.created_at.replace(tzinfo=None) - when).total_seconds()) >= tolerance:
+            return None
+        return entry
+
+    async def find(self, guild, action, target_id):
+        """Returns the audit log entry of ``action`` done to ``target_id`` just now, if there is one."""
+        when, requested = datetime.utcnow(), time.monotonic()
+        await asyncio.sleep(self.delay)
+        entry = self.lookup(guild.id, action, target_id, when)
+        if entry is None:
+            await self.refresh(guild, requested + self.delay)
+            entry = self.lookup(guild.id, action, target_id, when)
+        return entry
+
+    async def refresh(self, guild, after):
+        """Waits for a fetch that started at or after ``after``, starting one if needed."""
+        state = self._guilds.get(guild.id)
+        if state is None:
+            state = self._guilds[guild.id] = GuildAuditLog()
+
+        while True:
+            if state.task is None:
+                if state.fetched >= after:
+                    return
+                state.started = time.monotonic()
+                state.task = self.bot.loop.create_task(self.fetch(guild, state))
+            started = state.started
+            await asyncio.shield(state.task)
+            if started >= after:
+                return
+
+    async def fetch(self, guild, state):
+        started = state.started
+        try:
+            if state.last_id is None:  # nothing seen yet, only the last minute is interesting
+                after = discord.Object(id=discord.utils.time_snowflake(datetime.utcnow() - timedelta(seconds=self.ttl)))
+            else:
+                after = discord.Object(id=state.last_id)
+
+            while True:  # a page at a time until we've caught up, a mass ban can be more than one page
+                count = 0
+                async for entry in guild.audit_logs(limit=self.limit, after=after, oldest_first=True):
+                    count += 1
+                    state.last_id = max(state.last_id or 0, entry.id)
+                    if entry.target is not None:
+                        key = (entry.action, entry.target.id)
+                        state.entries.pop(key, None)
+                        state.entries[key] = entry
+                if count < self.limit:
+                    break
+                after = discord.Object(id=state.last_id)
+        except discord.HTTPException:
+            pass
+        finally:
+            state.task = None
+            state.fetched = started
+
+        expired = datetime.utcnow() - timedelta(seconds=self.ttl)
+        while state.entries:
+            key, entry = next(iter(state.entries.items()))
+            if entry.created_at.replace(tzinfo=None) > expired:
+                break
+            del state.entries[key]
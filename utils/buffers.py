@@ -0,0 +1,180 @@
+"""
+Dredd, discord bot
+Copyright (C) 2021 Moksej
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+
+from collections import Counter
+
+
+class WriteBuffer:
+    """Rows waiting to be written to the database.
+
+    Rows are kept in memory keyed by whatever identifies them and written with a
+    single ``executemany`` every ``interval`` seconds, so a key that changes many
+    times between two flushes is only written once. Whatever is still waiting is
+    written when the bot shuts down.
+    """
+
+    query = None
+
+    def __init__(self, bot, *, interval=10):
+        self.bot = bot
+        self.interval = interval
+        self.written = 0
+        self.failed = 0
+        self._pending = {}
+        self._task = None
+        self._lock = asyncio.Lock()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def start(self):
+        if self._task is None:
+            self._task = self.bot.loop.create_task(self.run())
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    def rows(self, pending):
+        return list(pending.values())
+
+    def requeue(self, pending):
+        """Puts back rows that failed to write, without overwriting newer ones."""
+        for key, row in pending.items():
+            self._pending.setdefault(key, row)
+
+    async def flush(self):
+        async with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, type(self._pending)()
+            rows = self.rows(pending)
+            try:
+                await self.bot.db.executemany(self.query, rows)
+            except asyncio.CancelledError:
+                self.requeue(pending)
+                raise
+            except Exception as e:
+                self.failed += 1
+                self.requeue(pending)
+                print(f"[{type(self).__name__}] Failed to write {len(rows)} rows: {e}")
+            else:
+                self.written += len(rows)
+
+    async def close(self):
+        if self._task is not None:
+            async with self._lock:  # lets a flush that already started finish before the task goes
+                self._task.cancel()
+                self._task = None
+        await self.flush()
+
+    @property
+    def stats(self):
+        return {'queued': len(self._pending), 'written': self.written, 'failed': self.failed}
+
+
+class StatusBuffer(WriteBuffer):
+    """Latest presence status of every user who opted in to status logging."""
+
+    query = """INSERT INTO status(user_id, status_type, since) VALUES($1, $2, $3)
+                ON CONFLICT (user_id) DO UPDATE
+                SET status_type = $2, since = $3
+                WHERE status.user_id = $1"""
+
+    def add(self, user_id, status, since):
+        self._pending[user_id] = (user_id, status, since)
+        self.start()
+
+    def get(self, user_id):
+        """The status that hasn't been written yet, as ``(status, since)``."""
+        row = self._pending.get(user_id)
+        return row[1:] if row else None
+
+    def discard(self, user_id):
+        self._pending.pop(user_id, None)
+
+
+class NicknameBuffer(WriteBuffer):
+    """Nickname changes that haven't been written to the nickname history yet.
+
+    Every member keeps the list of their previous nicknames since the last flush.
+    Changing back to a nickname that's already in that list drops everything after
+    it, so switching back and forth between nicknames within the window is never written.
+    """
+
+    query = "INSERT INTO nicknames(user_id, guild_id, nickname, time) VALUES($1, $2, $3, $4)"
+
+    def add(self, user_id, guild_id, before, after, when):
+        history = self._pending.get((user_id, guild_id))
+        if history is None:
+            history = self._pending[(user_id, guild_id)] = []
+        history.append((before, when))
+
+        for index, (nickname, changed) in enumerate(history):
+            if nickname == after:
+                del history[index:]
+                break
+        if not history:
+            del self._pending[(user_id, guild_id)]
+        self.start()
+
+    def get(self, user_id, guild_id):
+        """Nicknames that haven't been written yet, newest first."""
+        return [nickname for nickname, changed in reversed(self._pending.get((user_id, guild_id), ()))]
+
+    def discard(self, user_id, guild_id):
+        self._pending.pop((user_id, guild_id), None)
+
+    def rows(self, pending):
+        return [(user_id, guild_id, nickname, changed) for (user_id, guild_id), history in pending.items() for nickname, changed in history]
+
+    def requeue(self, pending):
+        for key, history in pending.items():
+            self._pending[key] = history + self._pending.get(key, [])
+
+    @property
+    def stats(self):
+        stats = super().stats
+        stats['queued'] = sum(len(history) for history in self._pending.values())
+        return stats
+
+
+class CommandUsage(WriteBuffer):
+    """Command usage counted per ``(user id, guild id, command)``.
+
+    The counts since the last flush are added to ``command_logs`` in one upsert.
+    Commands used in DMs are counted under the channel id, same as ``command_logs``.
+    """
+
+    query = """INSERT INTO command_logs VALUES($1, $2, $3, $4)
+                ON CONFLICT (user_id, guild_id, command) DO UPDATE
+                SET usage = command_logs.usage + $4"""
+
+    def __init__(self, bot, **kwargs):
+        super().__init__(bot, **kwargs)
+        self._pending = Counter()
+
+    def add(self, user_id, guild_id, command):
+        self._pending[(user_id, guild_id, command)] += 1
+        self.start()
+
+    def rows(self, pending):
+        return [(user_id, guild_id, command, usage) for (user_id, guild_id, command), usage in pending.items()]
+
+    def requeue(self, pending):
+        self._pending.update(pending)
@@ -0,0 +1,47 @@
+"""
+Dredd, discord bot
+Copyright (C) 2021 Moksej
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+
+# caches keyed by a pair of values: (separator of the old string key, types of the pair)
+PAIR_KEYS = {
+    'afk': (', ', (int, int)),  # (guild id, user id)
+    'temp_bans': (', ', (int, int)),  # (user id, guild id)
+    'temp_mutes': (', ', (int, int)),  # (user id, guild id)
+    'nicks_op': (' - ', (int, int)),  # (user id, guild id)
+    'guild_disabled': (', ', (str, int)),  # (command, guild id)
+    'cog_disabled': (', ', (int, str)),  # (guild id, cog name)
+}
+
+
+def parse_key(key, separator, types):
+    # command names contain spaces but never the separator, cog names are always last
+    first, second = key.rsplit(separator, 1) if types[0] is str else key.split(separator, 1)
+    return types[0](first), types[1](second)
+
+
+def migrate_keys(bot):
+    """Rekeys the ``"a, b"`` string keys the cache loader builds to ``(a, b)`` tuples.
+
+    Runs once after the cache is loaded, everything after that reads and writes
+    the tuple keys so no key is formatted or parsed on every message.
+    """
+    migrated = 0
+    for name, (separator, types) in PAIR_KEYS.items():
+        cache = getattr(bot, name)
+        for key in [key for key in cache if isinstance(key, str)]:
+            cache[parse_key(key, separator, types)] = cache.pop(key)
+            migrated += 1
+    return migrated
@@ -0,0 +1,232 @@
+"""
+Dredd, discord bot
+Copyright (C) 2021 Moksej
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import time
+
+from collections import OrderedDict, deque, namedtuple
+
+
+class LRUCache(OrderedDict):
+    """A dict that keeps at most ``maxsize`` entries, dropping the least recently used one."""
+
+    def __init__(self, maxsize=1000):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key in self:
+            self.move_to_end(key)
+        super().__setitem__(key, value)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+class EditTracker:
+    """Keeps track of the replies to commands so editing the command edits the reply.
+
+    Holds at most ``maxsize`` replies and forgets them after ``max_age`` seconds,
+    since editing a command is only useful for a few minutes after it was sent.
+    Entries are kept in insertion order, which makes the expiry sweep stop at the
+    first entry that is still fresh.
+    """
+
+    def __init__(self, maxsize=1000, max_age=300):
+        self.maxsize = maxsize
+        self.max_age = max_age
+        self._entries = OrderedDict()  # command message id: (created, reply)
+        self._replies = {}  # reply id: command message id
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, message_id):
+        return message_id in self._entries
+
+    def __getitem__(self, message_id):
+        reply = self.get(message_id)
+        if reply is None:
+            raise KeyError(message_id)
+        return reply
+
+    def __setitem__(self, message_id, reply):
+        self._remove(message_id)
+        self._entries[message_id] = (time.monotonic(), reply)
+        self._replies[reply.id] = message_id
+        self.expire()
+
+    def get(self, message_id, default=None):
+        entry = self._entries.get(message_id)
+        if entry is not None and time.monotonic() - entry[0] > self.max_age:
+            self._remove(message_id)
+            self.evictions += 1
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return entry[1]
+
+    def discard(self, message_id):
+        """Forgets the entry if either the command or the reply was deleted."""
+        if self._remove(message_id):
+            return
+        source = self._replies.get(message_id)
+        if source is not None:
+            self._remove(source)
+
+    def expire(self):
+        now = time.monotonic()
+        while self._entries:
+            message_id, (created, reply) = next(iter(self._entries.items()))
+            if len(self._entries) <= self.maxsize and now - created <= self.max_age:
+                break
+            self._remove(message_id)
+            self.evictions += 1
+
+    def _remove(self, message_id):
+        entry = self._entries.pop(message_id, None)
+        if entry is None:
+            return False
+        self._replies.pop(entry[1].id, None)
+        return True
+
+    @property
+    def stats(self):
+        return {'size': len(self._entries), 'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+
+class AuthorSnapshot(namedtuple('AuthorSnapshot', 'id name discriminator avatar_url')):
+    __slots__ = ()
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(user.id, user.name, user.discriminator, str(user.avatar_url))
+
+    def __str__(self):
+        if self.discriminator == '0000':  # webhooks
+            return self.name
+        return f'{self.name}#{self.discriminator}'
+
+
+class SnipeStore:
+    """Last deleted messages of each channel.
+
+    Every channel keeps a ring buffer of its last ``per_channel`` deleted messages and only
+    the ``max_channels`` most recently active channels are kept, so the memory used doesn't
+    grow with the amount of channels the bot has ever seen.
+    """
+
+    def __init__(self, per_channel=10, max_channels=5000):
+        self.per_channel = per_channel
+        self.max_channels = max_channels
+        self._channels = OrderedDict()  # channel id: deque of snipes, newest last
+
+    def __len__(self):
+        return len(self._channels)
+
+    def __contains__(self, channel_id):
+        return channel_id in self._channels
+
+    def add(self, channel_id, snipe):
+        buffer = self._channels.get(channel_id)
+        if buffer is None:
+            buffer = self._channels[channel_id] = deque(maxlen=self.per_channel)
+        else:
+            self._channels.move_to_end(channel_id)
+        buffer.append(snipe)
+
+        while len(self._channels) > self.max_channels:
+            self._channels.popitem(last=False)
+
+    def get(self, channel_id, index=1):
+        """Returns the ``index``-th latest snipe of the channel, starting at 1."""
+        buffer = self._channels.get(channel_id)
+        if not buffer or not 0 < index <= len(buffer):
+            return None
+        return buffer[-index]
+
+    def count(self, channel_id):
+        buffer = self._channels.get(channel_id)
+        return len(buffer) if buffer else 0
+
+    def pop(self, channel_id, default=None):
+        return self._channels.pop(channel_id, default)
+
+
+class MutualGuilds:
+    """Ids of the guilds every cached user shares with the bot.
+
+    Built from the member cache of every guild once it's chunked and kept up
+    to date from member joins and removals, so events about a user only look
+    at the guilds the user is in instead of every guild the bot is in.
+    """
+
+    def __init__(self):
+        self._guilds = {}  # user id: set of guild ids
+
+    def __len__(self):
+        return len(self._guilds)
+
+    def get(self, user_id):
+        return frozenset(self._guilds.get(user_id, ()))
+
+    def count(self, user_id):
+        return len(self._guilds.get(user_id, ()))
+
+    def add(self, user_id, guild_id):
+        guilds = self._guilds.get(user_id)
+        if guilds is None:
+            guilds = self._guilds[user_id] = set()
+        guilds.add(guild_id)
+
+    def discard(self, user_id, guild_id):
+        guilds = self._guilds.get(user_id)
+        if guilds is None:
+            return
+        guilds.discard(guild_id)
+        if not guilds:
+            del self._guilds[user_id]
+
+    def add_guild(self, guild):
+        for member in guild.members:
+            self.add(member.id, guild.id)
+
+    def remove_guild(self, guild):
+        for member in guild.members:
+            self.discard(member.id, guild.id)
+
+    def with_setting(self, user_id, setting):
+        """Ids of the user's guilds that have a value in ``setting``, a cache dict keyed by guild id."""
+        guilds = self._guilds.get(user_id)
+        if not guilds or not setting:
+            return []
+        if len(guilds) <= len(setting):
+            return [guild_id for guild_id in guilds if setting.get(guild_id)]
+        return [guild_id for guild_id, value in setting.items() if value and guild_id in guilds]
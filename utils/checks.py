@@ -210,14 +210,14 @@ async def lockdown(ctx):
 async def guild_disabled(ctx):
     if ctx.guild:
         if ctx.command.parent:
-            if CM.get(ctx.bot, 'guild_disabled', f"{str(ctx.command.parent)}, {ctx.guild.id}"):
+            if CM.get(ctx.bot, 'guild_disabled', (str(ctx.command.parent), ctx.guild.id)):
                 return True
-            elif CM.get(ctx.bot, 'guild_disabled', f"{str(f'{ctx.command.parent} {ctx.command.name}')}, {ctx.guild.id}"):
+            elif CM.get(ctx.bot, 'guild_disabled', (ctx.command.qualified_name, ctx.guild.id)):
                 return True
             else:
                 return False
         else:
-            if CM.get(ctx.bot, 'guild_disabled', f"{str(ctx.command.name)}, {ctx.guild.id}"):
+            if CM.get(ctx.bot, 'guild_disabled', (str(ctx.command.name), ctx.guild.id)):
                 return True
             else:
                 return False
@@ -225,7 +225,7 @@ async def guild_disabled(ctx):
 
 async def cog_disabled(ctx, cog_name: str):
     if ctx.guild:
-        if ctx.bot.get_cog(CM.get(ctx.bot, 'cog_disabled', f"{str(ctx.guild.id)}, {str(cog_name)}")) == ctx.bot.get_cog(cog_name) and not await ctx.bot.is_admin(ctx.author):
+        if ctx.bot.get_cog(CM.get(ctx.bot, 'cog_disabled', (ctx.guild.id, cog_name))) == ctx.bot.get_cog(cog_name) and not await ctx.bot.is_admin(ctx.author):
             return True
         else:
             return False
@@ -256,18 +256,18 @@ async def is_disabled(ctx, command):
     if ctx.guild:
         try:
             if command.parent:
-                if CM.get(ctx.bot, 'guild_disabled', f"{str(command.parent)}, {ctx.guild.id}"):
+                if CM.get(ctx.bot, 'guild_disabled', (str(command.parent), ctx.guild.id)):
                     return True
                 elif CM.get(ctx.bot, 'disabled_commands', str(command.parent)):
                     return True
-                elif CM.get(ctx.bot, 'guild_disabled', f"{str(f'{command.parent} {command.name}')}, {ctx.guild.id}"):
+                elif CM.get(ctx.bot, 'guild_disabled', (command.qualified_name, ctx.guild.id)):
                     return True
                 elif CM.get(ctx.bot, 'disabled_commands', str(f"{command.parent} {command.name}")):
                     return True
                 else:
                     return False
             elif not command.parent:
-                if CM.get(ctx.bot, 'guild_disabled', f"{str(command.name)}, {ctx.guild.id}"):
+                if CM.get(ctx.bot, 'guild_disabled', (str(command.name), ctx.guild.id)):
                     return True
                 elif CM.get(ctx.bot, 'disabled_commands', str(command.name)):
                     return True
@@ -282,20 +282,20 @@ async def is_guild_disabled(ctx, command):
     if ctx.guild:
         try:
             if command.parent:
-                if CM.get(ctx.bot, 'guild_disabled', f"{str(command.parent)}, {ctx.guild.id}"):
+                if CM.get(ctx.bot, 'guild_disabled', (str(command.parent), ctx.guild.id)):
                     return True
-                elif CM.get(ctx.bot, 'guild_disabled', f"{str(f'{command.parent} {command.name}')}, {ctx.guild.id}"):
+                elif CM.get(ctx.bot, 'guild_disabled', (command.qualified_name, ctx.guild.id)):
                     return True
                 else:
                     return False
             elif not command.parent:
-                if CM.get(ctx.bot, 'guild_disabled', f"{str(command.name)}, {ctx.guild.id}"):
+                if CM.get(ctx.bot, 'guild_disabled', (str(command.name), ctx.guild.id)):
                     return True
                 else:
                     return False
         except Exception as e:
             print(e)
-            if CM.get(ctx.bot, 'guild_commands', f"{str(command.name)}, {ctx.guild.id}"):
+            if CM.get(ctx.bot, 'guild_commands', (str(command.name), ctx.guild.id)):
                 return True
 
 
@@ -0,0 +1,68 @@
+"""
+Dredd, discord bot
+Copyright (C) 2021 Moksej
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+
+
+class CriticalCache:
+    """The caches every command needs, loaded ahead of everything else.
+
+    These are the bot settings, guild prefixes, the blacklist, booster prefixes and
+    the disabled commands and categories, all small tables that load in a few
+    seconds. Each of them is a warm-up loader of its own so they load at the same
+    time, and messages are handled as soon as they're ready while the rest of the
+    cache is still loading. The full cache load replaces them afterwards.
+    """
+
+    NAMES = ('settings', 'prefixes', 'blacklist', 'boosters', 'disabled')
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    def add_loaders(self, warmup, stage):
+        for name in self.NAMES:
+            warmup.add(stage, name, getattr(self, f'load_{name}'))
+
+    def read_settings(self):
+        with open('db/settings.json', 'r', encoding='utf8') as f:
+            return json.load(f)
+
+    async def load_settings(self):
+        settings = await self.bot.loop.run_in_executor(None, self.read_settings)
+        self.bot.settings.clear()
+        self.bot.settings.update(settings)
+
+    async def load_prefixes(self):
+        async for rows in self.bot.warmup.stream("SELECT guild_id, prefix FROM guilds WHERE prefix IS NOT NULL"):
+            for row in rows:
+                self.bot.guild_configs.set(row['guild_id'], 'prefix', row['prefix'])
+
+    async def load_blacklist(self):
+        async for rows in self.bot.warmup.stream("SELECT * FROM blacklist"):
+            for row in rows:
+                entry = dict(row)
+                self.bot.blacklist[entry.pop('_id')] = entry
+
+    async def load_boosters(self):
+        for row in await self.bot.db.fetch("SELECT user_id, prefix FROM boosters"):
+            self.bot.boosters[row['user_id']] = row['prefix']
+
+    async def load_disabled(self):
+        for row in await self.bot.db.fetch("SELECT command, reason, dev FROM discmds"):
+            self.bot.disabled_commands[row['command']] = {'reason': row['reason'], 'dev': row['dev']}
+        for row in await self.bot.db.fetch("SELECT guild_id, command FROM guild_disabled"):
+            self.bot.guild_disabled[(row['command'], row['guild_id'])] = row['command']
+        for row in await self.bot.db.fetch("SELECT guild_id, cog FROM cog_disabled"):
+            self.bot.cog_disabled[(row['guild_id'], row['cog'])] = row['cog']
@@ -288,20 +288,22 @@ async def execute_temporary(ctx, action, user, mod, guild, role, duration, reaso
         await ctx.bot.db.execute("INSERT INTO modactions(time, user_id, action, guild_id, mod_id, role_id, reason) VALUES($1, $2, $3, $4, $5, $6, $7)", None if duration is None else duration, user.id, action, guild.id, mod.id, role.id, reason)
         if not duration:
             return
-        ctx.bot.temp_mutes[f"{user.id}, {guild.id}"] = {'time': duration, 'reason': reason, 'role': role.id, 'moderator': mod.id}
+        ctx.bot.temp_mutes[(user.id, guild.id)] = {'time': duration, 'reason': reason, 'role': role.id, 'moderator': mod.id}
+        ctx.bot.timers.schedule('temp_mute', (user.id, guild.id), duration)
     elif action == 2:
         await ctx.bot.db.execute("INSERT INTO modactions(time, user_id, action, guild_id, mod_id, role_id, reason) VALUES($1, $2, $3, $4, $5, $6, $7)", None if duration is None else duration, user.id, action, guild.id, mod.id, None, reason)
         if not duration:
             return
-        ctx.bot.temp_bans[f"{user.id}, {guild.id}"] = {'time': duration, 'reason': reason, 'moderator': mod.id}
+        ctx.bot.temp_bans[(user.id, guild.id)] = {'time': duration, 'reason': reason, 'moderator': mod.id}
+        ctx.bot.timers.schedule('temp_ban', (user.id, guild.id), duration)
 
 
 async def execute_untemporary(ctx, action, user, guild):
     await ctx.bot.db.execute("DELETE FROM modactions WHERE user_id = $1 AND guild_id = $2", user.id, guild.id)
     if action == 1:
-        ctx.bot.temp_mutes.pop(f"{user.id}, {guild.id}", None)
+        ctx.bot.temp_mutes.pop((user.id, guild.id), None)
     elif action == 2:
-        ctx.bot.temp_bans.pop(f"{user.id}, {guild.id}", None)
+        ctx.bot.temp_bans.pop((user.id, guild.id), None)
 
 
 async def get_muterole(ctx, guild, error=False):
@@ -448,8 +450,7 @@ async def change_theme(ctx, color: int, avatar: str, emoji: str):
         embed.set_thumbnail(url=url)
         with open('db/settings.json', 'w') as f:
             data = json.dump(data, f, indent=4)
-        LC = db.cache.LoadCache
-        await LC.reloadall(ctx.bot)
+        await ctx.bot.reloadall()
         await ctx.send(embed=embed)
     except Exception as e:
         return await ctx.send(f"{ctx.bot.settings['emojis']['misc']['warn']} | **Error occured:** {e}")
@@ -0,0 +1,238 @@
+"""
+Dredd, discord bot
+Copyright (C) 2021 Moksej
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from collections.abc import MutableMapping
+
+
+class Record:
+    """A small settings record that reads like the dict it replaces.
+
+    Only the keys in ``__slots__`` can be stored, a key that was never set is
+    missing just like it would be from a dict.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, data):
+        """Returns the record holding ``data``, or None if ``data`` has keys the record can't hold."""
+        if not data.keys() <= set(cls.__slots__):
+            return None
+        record = cls()
+        for key, value in data.items():
+            setattr(record, key, value)
+        return record
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        setattr(self, key, value)
+
+    def __delitem__(self, key):
+        try:
+            delattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key):
+        return isinstance(key, str) and hasattr(self, key)
+
+    def __iter__(self):
+        return (key for key in self.__slots__ if hasattr(self, key))
+
+    def __len__(self):
+        return sum(1 for key in self)
+
+    def __eq__(self, other):
+        if isinstance(other, (Record, dict)):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    def __repr__(self):
+        return f'{type(self).__name__}({dict(self.items())!r})'
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if isinstance(key, str) else default
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [getattr(self, key) for key in self]
+
+    def items(self):
+        return [(key, getattr(self, key)) for key in self]
+
+    def pop(self, key, *default):
+        value = self.get(key, *default) if default else self[key]
+        if key in self:
+            delattr(self, key)
+        return value
+
+    def copy(self):
+        return dict(self.items())
+
+
+class AutomodRule(Record):
+    __slots__ = ('level', 'time', 'limit', 'percentage')
+
+
+class AutomodSettings(Record):
+    __slots__ = ('channel', 'ignore_admins', 'delete_messages')
+
+
+class RaidModeSettings(Record):
+    __slots__ = ('channel', 'dm', 'action')
+
+
+class AntiHoistSettings(Record):
+    __slots__ = ('channel', 'nickname')
+
+
+class WelcomeSettings(Record):
+    __slots__ = ('channel', 'message', 'embedded', 'log_bots')
+
+
+class JoinRoleSettings(Record):
+    __slots__ = ('people', 'bots')
+
+
+class GuildConfig:
+    """Every cached setting of a single guild, an unset field means the setting is disabled."""
+
+    __slots__ = (
+        'prefix', 'translations', 'case_num',
+        'moderation', 'memberlog', 'joinlog', 'leavelog', 'guildlog', 'messageedits', 'messagedeletes', 'modlog',
+        'joinrole', 'joinmessage', 'leavemessage', 'antihoist',
+        'automod', 'spam', 'masscaps', 'massmention', 'invites', 'links', 'raidmode',
+        'mute_role', 'mod_role', 'admin_role', 'channels_whitelist', 'roles_whitelist'
+    )
+
+    # fields holding a dict, stored as the record instead
+    RECORDS = {
+        'automod': AutomodSettings,
+        'spam': AutomodRule,
+        'masscaps': AutomodRule,
+        'massmention': AutomodRule,
+        'invites': AutomodRule,
+        'links': AutomodRule,
+        'raidmode': RaidModeSettings,
+        'antihoist': AntiHoistSettings,
+        'joinmessage': WelcomeSettings,
+        'leavemessage': WelcomeSettings,
+        'joinrole': JoinRoleSettings,
+    }
+
+    def __repr__(self):
+        return f'<GuildConfig {" ".join(f"{key}={getattr(self, key)!r}" for key in self.__slots__ if hasattr(self, key))}>'
+
+
+class GuildField(MutableMapping):
+    """One field of every :class:`GuildConfig`, readable and writable like the per guild dict it replaces.
+
+    This is what ``bot.memberlog``, ``bot.automod``... are, so ``CacheManager.get`` and
+    every ``bot.<setting>[guild_id] = ...`` keep working unchanged.
+    """
+
+    __slots__ = ('configs', 'name')
+
+    def __init__(self, configs, name):
+        self.configs = configs
+        self.name = name
+
+    def __getitem__(self, guild_id):
+        config = self.configs.get(guild_id)
+        try:
+            return getattr(config, self.name)
+        except AttributeError:
+            raise KeyError(guild_id) from None
+
+    def get(self, guild_id, default=None):
+        return getattr(self.configs.get(guild_id), self.name, default)
+
+    def __contains__(self, guild_id):
+        return hasattr(self.configs.get(guild_id), self.name)
+
+    def __setitem__(self, guild_id, value):
+        self.configs.set(guild_id, self.name, value)
+
+    def __delitem__(self, guild_id):
+        if not self.configs.unset(guild_id, self.name):
+            raise KeyError(guild_id)
+
+    def __iter__(self):
+        return (guild_id for guild_id, config in list(self.configs.items()) if hasattr(config, self.name))
+
+    def __len__(self):
+        return self.configs.counts.get(self.name, 0)
+
+    def clear(self):
+        for guild_id in list(self):
+            self.configs.unset(guild_id, self.name)
+
+    def __repr__(self):
+        return f'<GuildField {self.name} ({len(self)} guilds)>'
+
+
+class GuildConfigs(dict):
+    """guild id: :class:`GuildConfig`, the settings of a guild are a single lookup away."""
+
+    def __init__(self):
+        super().__init__()
+        self.counts = {}  # field: amount of guilds that have it set
+
+    def field(self, name):
+        return GuildField(self, name)
+
+    def set(self, guild_id, name, value):
+        config = self.get(guild_id)
+        if config is None:
+            config = self[guild_id] = GuildConfig()
+
+        if isinstance(value, dict) and name in GuildConfig.RECORDS:
+            value = GuildConfig.RECORDS[name].from_dict(value) or value
+
+        if not hasattr(config, name):
+            self.counts[name] = self.counts.get(name, 0) + 1
+        setattr(config, name, value)
+
+    def restore(self, configs):
+        self.clear()
+        self.update(configs)
+        self.counts = {}
+        for config in configs.values():
+            for name in GuildConfig.__slots__:
+                if hasattr(config, name):
+                    self.counts[name] = self.counts.get(name, 0) + 1
+
+    def forget(self, guild_id):
+        config = self.pop(guild_id, None)
+        for name in GuildConfig.__slots__:
+            if hasattr(config, name):
+                self.counts[name] -= 1
+
+    def unset(self, guild_id, name):
+        config = self.get(guild_id)
+        if not hasattr(config, name):
+            return False
+        delattr(config, name)
+        self.counts[name] -= 1
+        if not any(hasattr(config, field) for field in GuildConfig.__slots__):
+            del self[guild_id]
+        return True
@@ -0,0 +1,85 @@
+"""
+Dredd, discord bot
+Copyright (C) 2021 Moksej
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+
+
+class GuildSettings:
+    """Settings of every guild, stored as one JSONB document per guild.
+
+    All the documents are read with a single query when the bot starts and a change
+    to any amount of settings is written with a single upsert. Every setting is
+    mirrored into the bot attribute of the same name (``bot.memberlog``, ``bot.joinlog``...)
+    which is what the events read. The table is created by migrations/guild_settings.sql.
+    """
+
+    LOGS = ('moderation', 'memberlog', 'joinlog', 'leavelog', 'guildlog', 'messageedits', 'messagedeletes')
+    SETTINGS = LOGS
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._documents = {}  # guild id: settings document
+
+    def get(self, guild_id, name, default=None):
+        return self._documents.get(guild_id, {}).get(name, default)
+
+    def forget(self, guild_id):
+        self._documents.pop(guild_id, None)
+        for name in self.SETTINGS:
+            getattr(self.bot, name).pop(guild_id, None)
+
+    def cache(self, guild_id, document, target=None):
+        target = target or self.bot
+        self._documents[guild_id] = document
+        for name in self.SETTINGS:
+            value = document.get(name)
+            if value is None:
+                getattr(target, name).pop(guild_id, None)
+            else:
+                getattr(target, name)[guild_id] = value
+
+    async def fetch(self):
+        documents = {}
+        async for rows in self.bot.warmup.stream("SELECT guild_id, settings FROM guild_settings"):
+            for row in rows:
+                documents[row['guild_id']] = json.loads(row['settings'])
+        return documents
+
+    def apply(self, documents, target=None):
+        """Replaces the settings of ``target`` (the bot by default) without awaiting anything in between."""
+        target = target or self.bot
+        self._documents = {}
+        for name in self.SETTINGS:  # the documents are the source of truth, not the old tables
+            getattr(target, name).clear()
+        for guild_id, document in documents.items():
+            self.cache(guild_id, document, target)
+
+    async def load(self):
+        self.apply(await self.fetch())
+
+    async def update(self, guild_id, **values):
+        """Sets the given settings of the guild, settings set to None are removed."""
+        unknown = set(values) - set(self.SETTINGS)
+        if unknown:
+            raise ValueError(f"Unknown guild settings: {', '.join(unknown)}")
+
+        changed = {name: value for name, value in values.items() if value is not None}
+        removed = [name for name, value in values.items() if value is None]
+        query = """INSERT INTO guild_settings(guild_id, settings) VALUES($1, $2::jsonb)
+                    ON CONFLICT (guild_id) DO UPDATE
+                    SET settings = (guild_settings.settings - $3::text[]) || $2::jsonb
+                    RETURNING settings"""
+        settings = await self.bot.db.fetchval(query, guild_id, json.dumps(changed), removed)
+        self.cache(guild_id, json.loads(settings))
@@ -0,0 +1,181 @@
+"""
+Dredd, discord bot
+Copyright (C) 2021 Moksej
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import discord
+import asyncio
+import time
+
+from datetime import datetime, timezone
+from utils import default
+
+
+class LogQueue:
+    """Outgoing log embeds of a single channel.
+
+    Embeds are sent ``MAX_EMBEDS`` at a time, a batch goes out once it's full or
+    ``delay`` seconds after its first embed was queued. When more than ``maxsize``
+    embeds are waiting new ones are dropped and the next batch says how many were lost.
+    """
+
+    MAX_EMBEDS = 10  # most embeds discord accepts in a single message
+
+    def __init__(self, delivery, channel, *, delay=1.0, maxsize=200):
+        self.delivery = delivery
+        self.channel = channel
+        self.delay = delay
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._pending = []  # (embed, future)
+        self._full = asyncio.Event()
+        self._task = None
+
+    def __len__(self):
+        return len(self._pending)
+
+    def put(self, embed):
+        future = self.delivery.bot.loop.create_future()
+        if len(self._pending) >= self.maxsize:
+            self.dropped += 1
+            future.set_result(None)
+            return future
+
+        self._pending.append((embed, future))
+        if len(self._pending) >= self.MAX_EMBEDS:
+            self._full.set()
+        if self._task is None:
+            self._task = self.delivery.bot.loop.create_task(self.run())
+        return future
+
+    async def run(self):
+        try:
+            while self._pending:
+                if len(self._pending) < self.MAX_EMBEDS:
+                    self._full.clear()
+                    try:
+                        await asyncio.wait_for(self._full.wait(), timeout=self.delay)
+                    except asyncio.TimeoutError:
+                        pass
+                await self.flush()
+        finally:
+            self._task = None
+
+    async def flush(self):
+        size = self.MAX_EMBEDS - 1 if self.dropped else self.MAX_EMBEDS
+        batch, self._pending = self._pending[:size], self._pending[size:]
+        embeds = [embed for embed, future in batch]
+        if self.dropped:
+            embeds.append(self.dropped_embed())
+            self.dropped = 0
+
+        try:
+            message = await self.delivery.deliver(self.channel, embeds)
+        except Exception as e:
+            message = None
+            await self.delivery.report(self.channel, e)
+
+        for embed, future in batch:
+            if not future.done():
+                future.set_result(message)
+
+    def dropped_embed(self):
+        embed = discord.Embed(color=self.delivery.bot.settings['colors']['deny_color'], timestamp=datetime.now(timezone.utc))
+        embed.description = _("{0} {1} log entries were skipped because too many events happened at once.").format(
+            self.delivery.bot.settings['emojis']['misc']['warn'], self.dropped
+        )
+        return embed
+
+
+class LogDelivery:
+    """Sends the log embeds of every log channel through a webhook owned by the bot.
+
+    Every log channel gets its own :class:`LogQueue`. Channels where the webhook can't
+    be used (missing permissions, too many webhooks) fall back to sending the embeds
+    one by one as the bot, the webhook lookup is then retried after ``retry_after`` seconds.
+    Modlog cases skip the queue, see :meth:`send_case`.
+    """
+
+    def __init__(self, bot, *, retry_after=600):
+        self.bot = bot
+        self.retry_after = retry_after
+        self._queues = {}  # channel id: LogQueue
+        self._webhooks = {}  # channel id: (webhook or None, looked up at)
+
+    def send(self, channel, embed):
+        """Queues the embed, the returned future resolves to the message it was sent in, or None."""
+        if channel is None:
+            future = self.bot.loop.create_future()
+            future.set_result(None)
+            return future
+
+        queue = self._queues.get(channel.id)
+        if queue is None:
+            queue = self._queues[channel.id] = LogQueue(self, channel)
+        return queue.put(embed)
+
+    async def send_case(self, channel, embed):
+        """Sends a modlog case on its own message as the bot, so the case can be looked up and edited later."""
+        if channel is None:
+            return None
+        try:
+            return await channel.send(embed=embed)
+        except discord.HTTPException as e:
+            await self.report(channel, e)
+            return None
+
+    def forget(self, channel_id):
+        self._queues.pop(channel_id, None)
+        self._webhooks.pop(channel_id, None)
+
+    async def webhook(self, channel):
+        cached = self._webhooks.get(channel.id)
+        if cached and (cached[0] or time.monotonic() - cached[1] < self.retry_after):
+            return cached[0]
+
+        webhook = None
+        if channel.permissions_for(channel.guild.me).manage_webhooks:
+            try:
+                webhook = discord.utils.find(lambda w: w.user == self.bot.user, await channel.webhooks())
+                if webhook is None:
+                    webhook = await channel.create_webhook(name=f'{self.bot.user.name} Logging', reason='Sending logs')
+            except discord.HTTPException:
+                webhook = None
+        self._webhooks[channel.id] = (webhook, time.monotonic())
+        return webhook
+
+    async def deliver(self, channel, embeds):
+        webhook = await self.webhook(channel)
+        if webhook is not None:
+            try:
+                return await webhook.send(embeds=embeds, username=self.bot.user.name, avatar_url=self.bot.user.avatar_url, wait=True)
+            except discord.NotFound:  # webhook got deleted, look it up again next time
+                self._webhooks.pop(channel.id, None)
+
+        message = None
+        for embed in embeds:
+            sent = await channel.send(embed=embed)
+            message = message or sent
+        return message
+
+    async def report(self, channel, error):
+        try:
+            await default.background_error(self, '`log delivery`', error, channel.guild, channel)
+        except Exception:
+            pass
+
+    async def close(self):
+        """Sends whatever is still queued, used when the bot shuts down."""
+        for queue in list(self._queues.values()):
+            while len(queue):
+                await queue.flush()
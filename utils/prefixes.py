@@ -0,0 +1,105 @@
+"""
+Dredd, discord bot
+Copyright (C) 2021 Moksej
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+class CompiledPrefix:
+    __slots__ = ('source', 'prefixes')
+
+    def __init__(self, source, prefixes):
+        self.source = source
+        self.prefixes = prefixes
+
+
+class PrefixResolver:
+    """Resolves the prefixes for a message without rebuilding them every time.
+
+    Every guild prefix is compiled once into a tuple together with the mention
+    prefixes and recompiled only when ``bot.prefix`` changes. Booster and admin
+    prefixes are only looked up when the message doesn't start with the guild
+    prefix but does start with a character one of the rank prefixes starts with,
+    which skips the rank lookups for almost every message that isn't a command.
+    """
+
+    DM_PREFIX = '!'
+    ADMIN_PREFIX = 'd '
+    BOOSTER_PREFIX = 'dredd '
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._compiled = {}
+        self._rank_chars = None
+        self._rank_signature = None
+
+    def invalidate(self, guild_id=None):
+        if guild_id is None:
+            self._compiled.clear()
+        else:
+            self._compiled.pop(guild_id, None)
+
+    def invalidate_ranks(self):
+        self._rank_chars = None
+
+    def compile(self, key, prefix):
+        user_id = self.bot.user.id
+        compiled = CompiledPrefix(prefix, (f'<@{user_id}> ', f'<@!{user_id}> ', prefix))
+        self._compiled[key] = compiled
+        return compiled
+
+    def rank_chars(self):
+        boosters = self.bot.boosters
+        signature = (id(boosters), len(boosters))
+        if self._rank_chars is None or signature != self._rank_signature:
+            chars = {self.ADMIN_PREFIX[0], self.BOOSTER_PREFIX[0]}
+            chars.update(prefix[0] for prefix in boosters.values() if isinstance(prefix, str) and prefix)
+            self._rank_chars = frozenset(chars)
+            self._rank_signature = signature
+        return self._rank_chars
+
+    def rank_prefixes(self, user):
+        cache = self.bot.cache
+        is_dev = cache.get(self.bot, 'devs', user.id)
+        booster = cache.get(self.bot, 'boosters', user.id)
+
+        prefixes = ()
+        if is_dev or booster:
+            prefixes += (booster or self.BOOSTER_PREFIX,)
+        if is_dev or cache.get(self.bot, 'admins', user.id):
+            prefixes += (self.ADMIN_PREFIX,)
+        return prefixes
+
+    async def guild_prefix(self, guild_id):
+        prefix = await self.bot.db.fetchval("SELECT prefix FROM guilds WHERE guild_id = $1", guild_id)
+        prefix = prefix or self.bot.settings['default']['prefix']
+        self.bot.prefix[guild_id] = prefix
+        return prefix
+
+    async def resolve(self, message):
+        if message.guild:
+            key = message.guild.id
+            prefix = self.bot.prefix.get(key)
+            if prefix is None:  # guild is not cached yet, fall back to the database
+                prefix = await self.guild_prefix(key)
+        else:
+            key, prefix = None, self.DM_PREFIX
+
+        compiled = self._compiled.get(key)
+        if compiled is None or compiled.source != prefix:
+            compiled = self.compile(key, prefix)
+
+        content = message.content
+        if not content or content.startswith(compiled.prefixes) or content[0] not in self.rank_chars():
+            return compiled.prefixes
+
+        return compiled.prefixes + self.rank_prefixes(message.author)
@@ -0,0 +1,210 @@
+"""
+Dredd, discord bot
+Copyright (C) 2021 Moksej
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import mmap
+import os
+import pickle
+import struct
+import time
+import zlib
+
+from utils.guildconfig import GuildConfig, GuildConfigs, GuildField
+
+
+class Snapshot:
+    __slots__ = ('created', 'clean', 'state')
+
+    def __init__(self, created, clean, state):
+        self.created = created
+        self.clean = clean  # written when the bot shut down, nothing changed after it
+        self.state = state
+
+    @property
+    def age(self):
+        return time.time() - self.created
+
+
+class CacheShadow:
+    """Stands in for the bot while the cache loads from the database in the background.
+
+    Has empty caches of its own, so the bot keeps using the restored snapshot until
+    the fresh cache is complete. Only the read only attributes in ``PASSTHROUGH``
+    come from the bot, a loader touching anything else fails instead of changing
+    the running bot halfway through the load.
+    """
+
+    PASSTHROUGH = ('db', 'loop', 'config', 'user', 'guilds', 'get_guild', 'get_user', 'get_channel')
+
+    def __init__(self, bot):
+        self._bot = bot
+        self.guild_configs = GuildConfigs()
+        for name in CacheSnapshot.CACHES:
+            setattr(self, name, {})
+        for name in GuildConfig.__slots__:
+            setattr(self, name, self.guild_configs.field(name))
+
+    def __getattr__(self, name):
+        if name in self.PASSTHROUGH:
+            return getattr(self._bot, name)
+        raise AttributeError(f"the cache shadow doesn't have {name!r}")
+
+
+class CacheSnapshot:
+    """Saves the cache to a file so a restart doesn't have to load it from the database.
+
+    The snapshot is pickled with protocol 5 behind a header holding the format version,
+    a fingerprint of the cached attributes, when it was written and a checksum of the
+    pickle. It's written when the bot shuts down and every ``interval`` seconds, and only
+    read once on boot. Anything unexpected (a different version or fingerprint, a bad
+    checksum, a snapshot older than ``max_age``) means a full load from the database.
+    """
+
+    VERSION = 1
+    MAGIC = b'DREDDCCH'
+    HEADER = struct.Struct('!8sIIId?')  # magic, version, fingerprint, checksum, created, clean
+
+    # bot attributes the cache loader fills, besides every GuildConfig field
+    CACHES = ('settings', 'devs', 'admins', 'boosters', 'blacklist', 'check_duration', 'guilds_data',
+              'temp_bans', 'temp_mutes', 'guild_disabled', 'cog_disabled', 'rr',
+              'afk', 'status_op', 'snipes_op', 'nicks_op', 'badges', 'disabled_commands', 'reminders')
+
+    FINGERPRINT = zlib.crc32(repr((CACHES, GuildConfig.__slots__)).encode())
+
+    def __init__(self, bot, path, *, interval=600, max_age=3600):
+        self.bot = bot
+        self.path = path
+        self.interval = interval
+        self.max_age = max_age
+        self.stale = False  # restored from a snapshot that's missing changes and not reloaded yet
+        self._task = None
+
+    def read(self):
+        """Returns the snapshot if it can be used, the file is removed either way."""
+        if not self.path:
+            return None
+        try:
+            with open(self.path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                magic, version, fingerprint, checksum, created, clean = self.HEADER.unpack_from(data)
+                if magic != self.MAGIC or version != self.VERSION or fingerprint != self.FINGERPRINT:
+                    return None
+                if time.time() - created > self.max_age:
+                    return None
+                with memoryview(data) as view, view[self.HEADER.size:] as body:
+                    if zlib.crc32(body) != checksum:
+                        return None
+                    state = pickle.loads(body)
+            return Snapshot(created, clean, state)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"[SNAPSHOT] Couldn't read the cache snapshot, loading the cache from the database: {e}")
+            return None
+        finally:
+            # a snapshot is only good once, the cache changes as soon as the bot runs
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def restore(self, state):
+        """Replaces the cache of the bot, nothing is awaited so nobody sees it half replaced."""
+        for name in self.CACHES:
+            cache = getattr(self.bot, name)
+            cache.clear()
+            cache.update(state['caches'][name])
+        self.bot.guild_configs.restore(state['guild_configs'])
+
+    def copy(self):
+        """A copy of the bot's cache state that doesn't change with the cache."""
+        return pickle.loads(self.dump())
+
+    @staticmethod
+    def replay(base, live, fresh):
+        """Applies to ``fresh`` what changed from ``base`` to ``live``."""
+        for key, value in live.items():
+            if key not in base or base[key] != value:
+                fresh[key] = value
+        for key in base.keys() - live.keys():
+            fresh.pop(key, None)
+
+    def merge(self, base, fresh):
+        """Carries the changes made to the bot's cache since ``base`` was copied over to ``fresh``.
+
+        Used when a cache loaded in the background is swapped in, so the mutes, afk
+        statuses or settings changed by commands while it loaded aren't lost.
+        """
+        live = self.capture(self.bot)
+        for name in self.CACHES:
+            self.replay(base['caches'][name], live['caches'][name], fresh['caches'][name])
+
+        configs = GuildConfigs()
+        configs.restore(fresh['guild_configs'])
+        for name in GuildConfig.__slots__:
+            old, new = ({guild_id: getattr(config, name) for guild_id, config in state['guild_configs'].items() if hasattr(config, name)}
+                        for state in (base, live))
+            self.replay(old, new, configs.field(name))
+        fresh['guild_configs'] = dict(configs)
+        return fresh
+
+    def capture(self, source):
+        """The cache state of the bot or a :class:`CacheShadow`."""
+        configs = getattr(source, 'guild_configs', None)
+        fields = [getattr(source, name) for name in GuildConfig.__slots__]
+        if all(isinstance(field, GuildField) and field.configs is configs for field in fields):
+            configs = dict(configs)
+        else:
+            configs = GuildConfigs()
+            for name in GuildConfig.__slots__:
+                for guild_id, value in getattr(source, name).items():
+                    configs.set(guild_id, name, value)
+        return {'caches': {name: getattr(source, name) for name in self.CACHES}, 'guild_configs': dict(configs)}
+
+    def dump(self):
+        return pickle.dumps(self.capture(self.bot), protocol=5)
+
+    def save(self, body, clean):
+        header = self.HEADER.pack(self.MAGIC, self.VERSION, self.FINGERPRINT, zlib.crc32(body), time.time(), clean)
+        temp = f'{self.path}.tmp'
+        with open(temp, 'wb') as file:
+            file.write(header)
+            file.write(body)
+        os.replace(temp, self.path)
+
+    async def write(self, clean=False):
+        if not self.path:
+            return
+        try:
+            body = self.dump()  # on the loop so nothing changes while it's pickled
+            await self.bot.loop.run_in_executor(None, self.save, body, clean)
+        except Exception as e:
+            print(f"[SNAPSHOT] Couldn't write the cache snapshot: {e}")
+
+    def start(self):
+        if self._task is None:
+            self._task = self.bot.loop.create_task(self.run())
+
+    async def run(self):
+        await self.bot.warmup.wait()
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.write()
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self.bot.warmup.is_ready() and not self.bot.warmup.failed:  # never save a half loaded cache
+            await self.write(clean=not self.stale)
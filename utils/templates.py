@@ -0,0 +1,126 @@
+"""
+Dredd, discord bot
+Copyright (C) 2021 Moksej
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import discord
+import json
+import re
+
+PLACEHOLDERS = re.compile(r'{{(?:member\.(?:name|id|tag|mention)|server\.(?:name|members))}}')
+# plain text welcome messages also accept {0} for the display name and {1} for the member count
+JOIN_PLACEHOLDERS = re.compile(PLACEHOLDERS.pattern + r'|\{0\}|\{1\}')
+
+
+class Template:
+    """A string split into its static parts and placeholders, odd indexes are the placeholders."""
+
+    __slots__ = ('parts',)
+
+    def __init__(self, source, pattern):
+        parts, last = [], 0
+        for match in pattern.finditer(source):
+            parts.extend((source[last:match.start()], match.group(0)))
+            last = match.end()
+        parts.append(source[last:])
+        self.parts = tuple(parts)
+
+    def render(self, values):
+        parts = list(self.parts)
+        parts[1::2] = [values[placeholder] for placeholder in self.parts[1::2]]
+        return ''.join(parts)
+
+
+def compile_value(value, pattern):
+    if isinstance(value, str):
+        return Template(value, pattern) if pattern.search(value) else value
+    if isinstance(value, dict):
+        return {key: compile_value(item, pattern) for key, item in value.items()}
+    if isinstance(value, list):
+        return [compile_value(item, pattern) for item in value]
+    return value
+
+
+def render_value(value, values):
+    if isinstance(value, Template):
+        return value.render(values)
+    if isinstance(value, dict):
+        return {key: render_value(item, values) for key, item in value.items()}
+    if isinstance(value, list):
+        return [render_value(item, values) for item in value]
+    return value
+
+
+class WelcomeMessage:
+    """ A compiled welcome or leave message """
+
+    __slots__ = ('source', 'kind', 'embedded', 'body')
+
+    def __init__(self, source, kind, embedded, body):
+        self.source = source
+        self.kind = kind
+        self.embedded = embedded
+        self.body = body  # compiled embed dict, Template, or a str.format template for the default text
+
+    def render(self, member):
+        """ Returns the embed dict or the text to send for the member """
+        if not self.embedded and isinstance(self.body, str):
+            return self.body.format(member, str(member.guild.member_count))
+
+        values = {
+            '{{member.mention}}': member.mention,
+            '{{member.tag}}': str(member),
+            '{{member.id}}': str(member.id),
+            '{{member.name}}': member.name if self.embedded else discord.utils.escape_markdown(member.name, as_needed=True),
+            '{{server.name}}': member.guild.name,
+            '{{server.members}}': str(member.guild.member_count),
+            '{0}': member.display_name,
+            '{1}': str(member.guild.member_count)
+        }
+        return render_value(self.body, values)
+
+
+class WelcomeTemplates:
+    """Join and leave messages of every guild, compiled once per message.
+
+    The compiled message is keyed on the message it was compiled from, so a
+    changed message gets recompiled even if nobody invalidated it.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._compiled = {}  # (kind, guild id): WelcomeMessage
+
+    def invalidate(self, guild_id, kind=None):
+        for key in ('join', 'leave') if kind is None else (kind,):
+            self._compiled.pop((key, guild_id), None)
+
+    def get(self, kind, guild_id, config):
+        """ kind is either 'join' or 'leave', config is the joinmessage/leavemessage cache """
+        source = (config['embedded'], config['message'])
+        compiled = self._compiled.get((kind, guild_id))
+        if compiled is None or compiled.source != source:
+            compiled = self._compiled[(kind, guild_id)] = self.compile(kind, source)
+        return compiled
+
+    def compile(self, kind, source):
+        embedded, message = source
+        defaults = self.bot.settings['default']
+        if embedded:
+            data = json.loads(message) if message else defaults[f'{kind}_message_embed']
+            body = compile_value(data, PLACEHOLDERS)
+        elif message:
+            body = Template(str(message), JOIN_PLACEHOLDERS if kind == 'join' else PLACEHOLDERS)
+        else:
+            body = defaults[f'{kind}_message_text']
+        return WelcomeMessage(source, kind, embedded, body)
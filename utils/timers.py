@@ -0,0 +1,115 @@
+"""
+Dredd, discord bot
+Copyright (C) 2021 Moksej
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import heapq
+import itertools
+
+from datetime import datetime
+
+
+class TimerScheduler:
+    """A min-heap of deadlines shared by every timed task of the bot.
+
+    The bot starts and cancels the runner, cogs only register handlers for
+    their own kinds and schedule entries of those kinds.
+
+    Entries are ``(when, seq, kind, key)``, ``seq`` keeps entries that are due
+    at the same time in the order they were scheduled. When an entry comes due
+    the handler registered for ``kind`` is awaited with ``key`` and ``when``.
+    Entries are only removed from the heap when they come due or their kind is
+    cleared, handlers are expected to look the key up in the cache and ignore
+    it if it was removed or moved to a later time.
+    All the times are naive UTC datetimes, same as the rest of the cache.
+    """
+
+    # upper bound for a single sleep, keeps us from drifting if the clock jumps
+    MAX_SLEEP = 3600
+
+    def __init__(self):
+        self._heap = []
+        self._handlers = {}
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    def __len__(self):
+        return len(self._heap)
+
+    def register(self, kind, handler):
+        self._handlers[kind] = handler
+
+    def unregister(self, kind):
+        self._handlers.pop(kind, None)
+        self.clear(kind)
+
+    def schedule(self, kind, key, when):
+        if when is None:
+            return
+
+        entry = (when, next(self._counter), kind, key)
+        heapq.heappush(self._heap, entry)
+        if self._heap[0] is entry:  # new earliest deadline, wake the runner up
+            self._wakeup.set()
+
+    def clear(self, *kinds):
+        """ Drops the pending entries of the given kinds, or every entry if no kind is given """
+        if kinds:
+            self._heap[:] = [entry for entry in self._heap if entry[2] not in kinds]
+            heapq.heapify(self._heap)
+        else:
+            self._heap.clear()
+        self._wakeup.set()
+
+    def next_deadline(self):
+        return self._heap[0][0] if self._heap else None
+
+    def start(self, loop=None):
+        if self._task is None or self._task.done():
+            loop = loop or asyncio.get_event_loop()
+            self._task = loop.create_task(self.run())
+        return self._task
+
+    def cancel(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def run(self):
+        while True:
+            if not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            seconds = (self._heap[0][0] - datetime.utcnow()).total_seconds()
+            if seconds > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=min(seconds, self.MAX_SLEEP))
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            when, seq, kind, key = heapq.heappop(self._heap)
+            handler = self._handlers.get(kind)
+            if handler is None:
+                continue
+            try:
+                await handler(key, when)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f'[TIMERS] {kind} timer for {key} failed: {e}')
@@ -0,0 +1,100 @@
+"""
+Dredd, discord bot
+Copyright (C) 2021 Moksej
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import functools
+import time
+
+
+def needs_cache(*names):
+    """ Makes a cog listener wait for the given loaders (every loader by default) before it runs """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            warmup = self.bot.warmup
+            if not warmup.is_ready(*names):
+                await warmup.wait(*names)
+            return await func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class CacheWarmup:
+    """Loads the cache in the background while the bot connects.
+
+    Loaders are added to numbered stages, the stages run one after another and the
+    loaders of a stage run at the same time over the pool. Every loader has its own
+    readiness flag, ``wait`` blocks until the given loaders are done. A loader that
+    fails is retried with a growing delay and stays not ready until it succeeds, the
+    bot never runs on a cache that didn't load.
+    """
+
+    MAX_DELAY = 60
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.timings = {}  # loader name: seconds it took
+        self.failed = {}  # loader name: the last error, while it's being retried
+        self._stages = {}  # stage: [(name, loader)]
+        self._ready = {}  # loader name: asyncio.Event
+        self._task = None
+
+    def add(self, stage, name, loader):
+        self._stages.setdefault(stage, []).append((name, loader))
+        self._ready[name] = asyncio.Event()
+
+    def is_ready(self, *names):
+        return all(self._ready[name].is_set() for name in names or self._ready)
+
+    async def wait(self, *names):
+        for name in names or list(self._ready):
+            await self._ready[name].wait()
+
+    def start(self):
+        if self._task is None:
+            self._task = self.bot.loop.create_task(self.run())
+
+    async def run(self):
+        for stage in sorted(self._stages):
+            await asyncio.gather(*(self.load(name, loader) for name, loader in self._stages[stage]))
+        self.bot.dispatch('cache_ready')
+        print(f"[WARMUP] Cache loaded ({', '.join(f'{name}: {took:.2f}s' for name, took in self.timings.items())})")
+
+    async def load(self, name, loader):
+        started, delay = time.monotonic(), 1
+        while True:
+            try:
+                await loader()
+            except Exception as e:
+                self.failed[name] = e
+                print(f"[WARMUP] Failed to load {name}, retrying in {delay}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.MAX_DELAY)
+            else:
+                break
+        self.failed.pop(name, None)
+        self.timings[name] = time.monotonic() - started
+        self._ready[name].set()
+
+    async def stream(self, query, *args, chunk=1000):
+        """Yields the rows of ``query`` ``chunk`` rows at a time through a server side cursor."""
+        async with self.bot.db.acquire() as conn:
+            async with conn.transaction():
+                cursor = await conn.cursor(query, *args)
+                while True:
+                    rows = await cursor.fetch(chunk)
+                    if not rows:
+                        break
+                    yield rows